@@ -1,47 +1,159 @@
 """Analytics Agent - Provides insights and metrics"""
 
-import json
+import time
 from agents.base_agent import BaseAgent
-from typing import Dict, Any
-from datetime import datetime, timedelta
-import random
+from typing import Dict, Any, List, Optional, Tuple
+from utils.events import EventAggregator, Rollup
+from utils.faq_index import TOKEN_PATTERN
+from utils.reviews import ReviewSummary, row_summary
+
+# Rollup ring, display label and the words or phrases that ask for it, checked in order
+WINDOWS = [
+    ('all', 'All time', ['all time', 'all-time', 'ever', 'lifetime']),
+    ('minute', 'Last hour', ['minute', 'minutes', 'hour', 'hours', 'hourly', 'now', 'live', 'real-time']),
+    ('day', 'Last 30 days', ['week', 'weeks', 'weekly', 'month', 'months', 'monthly', '30 days']),
+]
+# The same, split into single words (matched by set intersection) and multi-word phrases
+_WINDOW_TERMS = [
+    (window, label,
+     frozenset(phrase for phrase in phrases if len(TOKEN_PATTERN.findall(phrase)) == 1),
+     [f" {' '.join(TOKEN_PATTERN.findall(phrase))} " for phrase in phrases if len(TOKEN_PATTERN.findall(phrase)) > 1])
+    for window, label, phrases in WINDOWS
+]
 
 class AnalyticsAgent(BaseAgent):
     """Analytics and Reporting Agent"""
     
-    def __init__(self):
+    # Metrics move quickly, so reports are only reused briefly
+    cache_ttl = 5.0
+    
+    intent_keywords = (
+        'analytics', 'metrics', 'stats', 'statistics', 'dashboard', 'report', 'reports', 'insights',
+        'performance', 'kpi', 'rates', 'resolution rate', 'escalation rate', 'response time',
+        'how many', 'overall', 'trends', 'agent performance', 'recommendation stats',
+        'review sentiment', 'review analytics'
+    )
+    
+    def __init__(self, aggregator: Optional[EventAggregator] = None, store=None,
+                 reviews_path: str = 'data/review_summary.json'):
         super().__init__("AnalyticsAgent")
-        self.metrics = self._generate_sample_metrics()
+        # Fed by the other agents' QueryEvents (see build_default_agents)
+        self.aggregator = aggregator if aggregator is not None else EventAggregator()
+        # Optional persistent EventStore; when set, reports span restarts and sessions
+        self.store = store
+        # Review sentiment summary written by utils.reviews, hot-reloaded when it is rewritten
+        self.reviews_path = reviews_path
+        self.reviews = self._load_data()
+    
+    @property
+    def data_files(self) -> List[str]:
+        """The review summary"""
+        return [self.reviews_path] if self.reviews_path else []
     
-    def _generate_sample_metrics(self) -> Dict:
-        """Generate sample analytics data"""
+    def _load_data(self, strict: bool = False) -> Optional[ReviewSummary]:
+        """Fresh review summary snapshot, or None if there is none"""
+        try:
+            return ReviewSummary.load_if_exists(self.reviews_path)
+        except (OSError, ValueError) as e:
+            if strict:
+                raise
+            self.logger.warning(f"Could not load review summary from {self.reviews_path}: {e}")
+            return None
+    
+    def _install_data(self, data: Optional[ReviewSummary]):
+        """Swap in a reloaded review summary"""
+        self.reviews = data
+    
+    @staticmethod
+    def _window(query_lower: str) -> Tuple[str, str]:
+        """Pick the rollup ring a query asks about, with a display label (whole words only)"""
+        tokens = TOKEN_PATTERN.findall(query_lower)
+        padded = f" {' '.join(tokens)} "
+        for window, label, words, phrases in _WINDOW_TERMS:
+            if not words.isdisjoint(tokens) or any(phrase in padded for phrase in phrases):
+                return window, label
+        return 'hour', 'Last 24 hours'
+    
+    def collect_metrics(self, window: str = 'hour') -> Dict[str, Any]:
+        """Dashboard metrics for one window, from the event store if there is one, else the rollups"""
+        totals = self._totals(window)
+        empty = Rollup().summary()
+        support = totals.get('SupportAgent', empty)
+        products = totals.get('ProductAgent', empty)
+        social = totals.get('SocialAgent', empty)
+        overall = totals['all']
+        positive = social['sentiments'].get('Positive', 0)
+        rated = sum(social['sentiments'].values())
         return {
             'support': {
-                'total_queries': random.randint(450, 550),
-                'resolved': random.randint(400, 450),
-                'avg_response_time': round(random.uniform(1.5, 3.5), 1),
-                'satisfaction_rate': round(random.uniform(85, 95), 1),
-                'escalation_rate': round(random.uniform(8, 15), 1)
+                'total_queries': support['count'],
+                'resolved': support['resolved'],
+                'resolution_rate': support['resolution_rate'],
+                'escalation_rate': support['escalation_rate'],
+                'avg_response_time_ms': support['avg_latency_ms']
             },
             'products': {
-                'recommendations_made': random.randint(200, 300),
-                'conversion_rate': round(random.uniform(12, 18), 1),
-                'avg_order_value': round(random.uniform(150, 250), 2),
-                'top_category': 'Electronics'
+                'queries': products['count'],
+                'recommendations_made': products['products'],
+                'top_category': (products['top_category'] or 'N/A').title(),
+                'avg_response_time_ms': products['avg_latency_ms']
             },
             'social': {
-                'posts_generated': random.randint(80, 120),
-                'engagement_rate': round(random.uniform(4.5, 7.5), 1),
-                'reach': random.randint(15000, 25000),
-                'best_performing': 'Product Launch'
-            }
+                'content_requests': social['count'],
+                'positive_rate': round(100 * positive / rated, 1) if rated else 0.0,
+                'best_performing': (social['top_category'] or 'N/A').title(),
+                'avg_response_time_ms': social['avg_latency_ms']
+            },
+            'overall': {
+                'total_queries': overall['count'],
+                'errors': overall['errors'],
+                'resolution_rate': overall['resolution_rate'],
+                'avg_response_time_ms': overall['avg_latency_ms']
+            },
+            'reviews': self.review_metrics()
+        }
+    
+    def review_metrics(self) -> Dict[str, Any]:
+        """Corpus-wide review sentiment from the summary file (empty until a corpus is scored)"""
+        reviews = self.reviews
+        if reviews is None:
+            return {}
+        overall = row_summary(reviews.overall)
+        best, worst = reviews.category_extremes()
+        return {
+            'reviews': overall['reviews'],
+            'products': len(reviews),
+            'positive_rate': overall['positive_rate'],
+            'negative_rate': overall['negative_rate'],
+            'avg_polarity': overall['avg_polarity'],
+            'best_category': (best or 'N/A').title(),
+            'worst_category': (worst or 'N/A').title(),
+            'generated_at': reviews.generated_at
         }
     
+    def _totals(self, window: str) -> Dict[str, Dict[str, Any]]:
+        """Per-agent summaries for a window; 'all' time needs the store"""
+        if self.store is None:
+            return self.aggregator.totals('day' if window == 'all' else window)
+        if window == 'all':
+            return self.store.totals()
+        width, size = EventAggregator.WINDOWS[window]
+        now = time.time()
+        return self.store.totals(start=(now // width - size + 1) * width, end=now + 1)
+    
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Metrics for the default (last 24 hours) window"""
+        return self.collect_metrics()
+    
     def process_query(self, query: str) -> Dict[str, Any]:
         """Generate analytics report"""
         query_lower = query.lower()
         
-        if 'support' in query_lower:
+        if 'review' in query_lower:
+            agent_type = 'reviews'
+            title = '📊 Review Sentiment'
+        elif 'support' in query_lower:
             agent_type = 'support'
             title = '📊 Support Analytics'
         elif 'product' in query_lower or 'sales' in query_lower:
@@ -54,9 +166,17 @@ class AnalyticsAgent(BaseAgent):
             agent_type = 'all'
             title = '📊 Overall Analytics Dashboard'
         
+        window, period = self._window(query_lower)
+        note = ''
+        if window == 'all' and self.store is None:
+            # Without the store only the 30-day ring is kept, so that is what the report covers
+            period = 'Last 30 days'
+            note = " (all-time totals need the event store)"
+        
         return {
             'type': 'analytics',
-            'response': title,
+            'response': f"{title} · {period}{note}",
             'agent_type': agent_type,
-            'metrics': self.metrics
+            'period': period,
+            'metrics': self.collect_metrics(window)
         }
\ No newline at end of file
@@ -1,32 +1,180 @@
 """Base Agent Class - All agents inherit from this"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple
+import functools
+from contextlib import nullcontext
 import logging
+import threading
+import time
 from datetime import datetime
+from utils.history import DEFAULT_SESSION, Message, SessionHistory, current_session
+from utils.events import QueryEvent
+from utils.metrics import AgentMetrics
+from utils.response_cache import ResponseCache, normalize_query
+
+def _instrumented(process_query):
+    """Time every call (cache hits included) and publish a QueryEvent to listeners"""
+    @functools.wraps(process_query)
+    def wrapper(self, query: str) -> Dict[str, Any]:
+        telemetry = self.telemetry
+        listeners = self.listeners
+        if telemetry is None and not listeners:
+            return process_query(self, query)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = process_query(self, query)
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if telemetry is not None:
+                telemetry.record_call(elapsed_ms, response is None)
+            if listeners:
+                self._emit(QueryEvent.from_response(self.agent_name, response, elapsed_ms))
+    return wrapper
+
+def _cached(process_query):
+    """Serve repeat queries from the agent's response cache"""
+    @functools.wraps(process_query)
+    def wrapper(self, query: str) -> Dict[str, Any]:
+        cache = self.response_cache
+        if cache is None:
+            return process_query(self, query)
+        key = (self.agent_name, normalize_query(query), self.cache_version())
+        cached = cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        response = process_query(self, query)
+        if self._is_cacheable(response):
+            cache.put(key, response)
+        return dict(response)
+    return wrapper
 
 class BaseAgent(ABC):
     """Abstract base class for all agents"""
     
+    # Response cache settings; cache_ttl of None or 0 opts an agent out
+    cache_size = 256
+    cache_ttl: Optional[float] = 300.0
+    
+    # Per-stage latency histograms and call counters; False turns them off
+    instrument = True
+    
+    # Conversation history bounds: messages per session, sessions per agent
+    history_capacity = 100
+    history_sessions = 1000
+    
+    # Words and phrases that suggest a query is meant for this agent (see agents/router.py)
+    intent_keywords: Tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'process_query' in cls.__dict__:
+            cls.process_query = _instrumented(_cached(cls.__dict__['process_query']))
+    
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
         self.created_at = datetime.now()
-        self.conversation_history = []
+        self.history = SessionHistory(self.history_capacity, self.history_sessions)
         self.logger = logging.getLogger(agent_name)
+        self.data_version = 0
+        self._reload_lock = threading.Lock()
+        self.response_cache = ResponseCache(self.cache_size, self.cache_ttl) if self.cache_ttl else None
+        self.telemetry = AgentMetrics(agent_name) if self.instrument else None
+        self.listeners: List[Callable[[QueryEvent], None]] = []
     
     @abstractmethod
     def process_query(self, query: str) -> Dict[str, Any]:
         """Process query - must be implemented by child classes"""
         pass
     
-    def add_to_history(self, role: str, content: str):
-        """Add to conversation history"""
-        self.conversation_history.append({
-            'role': role,
-            'content': content,
-            'timestamp': datetime.now().isoformat()
-        })
-    
-    def clear_history(self):
-        """Clear conversation history"""
-        self.conversation_history = []
\ No newline at end of file
+    def _is_cacheable(self, response: Dict[str, Any]) -> bool:
+        """Whether a response may be replayed for the same query - override for side effects"""
+        return True
+    
+    def cache_version(self) -> Hashable:
+        """Version of everything a cached response depends on - override to add other agents' data"""
+        return self.data_version
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Response cache counters (empty if caching is disabled)"""
+        return self.response_cache.stats() if self.response_cache is not None else {}
+    
+    def timed(self, stage: str):
+        """Time one stage of process_query: `with self.timed('matching'): ...`"""
+        return self.telemetry.timed(stage) if self.telemetry is not None else nullcontext()
+    
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Call counts and per-stage latency percentiles (empty if instrumentation is off)"""
+        return self.telemetry.snapshot() if self.telemetry is not None else {}
+    
+    def subscribe(self, listener: Callable[[QueryEvent], None]):
+        """Call listener with a QueryEvent after every process_query"""
+        self.listeners = self.listeners + [listener]
+    
+    def _emit(self, event: QueryEvent):
+        """Deliver an event; a failing listener is logged and never fails the query"""
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception:
+                self.logger.exception(f"Event listener {listener!r} failed")
+    
+    @property
+    def session_id(self) -> Hashable:
+        """Session of the query being processed in this thread (see utils.history.session_scope)"""
+        return current_session()
+    
+    def intent_vocabulary(self) -> List[str]:
+        """Routing keywords for this agent - override to add terms from loaded data"""
+        return list(self.intent_keywords)
+    
+    @property
+    def data_files(self) -> List[str]:
+        """Files this agent's data is built from (watched for hot reload)"""
+        path = getattr(self, 'data_path', None)
+        return [path] if path else []
+    
+    def _load_data(self, strict: bool = False) -> Any:
+        """Build a fresh data snapshot - agents backed by data files override this"""
+        return None
+    
+    def _install_data(self, data: Any):
+        """Publish a snapshot with a single reference assignment"""
+        pass
+    
+    def reload(self) -> float:
+        """Rebuild data and indexes, then swap them in atomically; returns elapsed ms.
+        
+        Loading is strict, so a half-written or invalid file raises and the
+        current snapshot stays in place. Queries already running keep the
+        snapshot they started with.
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            data = self._load_data(strict=True)
+            self._install_data(data)
+            self.data_version += 1
+            if self.response_cache is not None:
+                self.response_cache.clear()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        self.logger.info(f"Reloaded {self.agent_name} data (v{self.data_version}) in {elapsed_ms:.1f}ms")
+        return elapsed_ms
+    
+    def add_to_history(self, role: str, content: str, session_id: Hashable = DEFAULT_SESSION):
+        """Add to a session's conversation history (oldest messages are evicted at capacity)"""
+        self.history.append(role, content, session_id)
+    
+    def get_history(self, session_id: Hashable = DEFAULT_SESSION, last: Optional[int] = None) -> List[Message]:
+        """A session's messages, oldest first"""
+        return self.history.get(session_id, last)
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Default session history as dicts with ISO timestamps"""
+        return [message.as_dict() for message in self.history.get(DEFAULT_SESSION)]
+    
+    def clear_history(self, session_id: Optional[Hashable] = None):
+        """Clear one session's history, or all of it"""
+        self.history.clear(session_id)
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""Agent Hub - Headless asyncio orchestrator for all agents"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from agents.base_agent import BaseAgent
+from agents.router import IntentRouter
+from utils.history import session_scope
+from utils.metrics import to_prometheus
+
+
+class LazyAgents(Mapping):
+    """Agents keyed by name, each constructed by its factory on first lookup.
+
+    Startup then pays only for the agents actually used: the UI opens on one
+    agent and the rest (with their data files and imports) load when first
+    selected. Iterating the keys builds nothing; values() and items() build
+    every agent. Hooks added with on_build() run on each agent once it
+    exists. Construction is serialized by a re-entrant lock, so a factory may
+    look up another agent it depends on. keywords gives, per name, a callable
+    returning the agent's static routing keywords, so routing does not have
+    to build an agent to learn its vocabulary.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], BaseAgent]],
+                 keywords: Optional[Dict[str, Callable[[], Iterable[str]]]] = None):
+        self._factories = dict(factories)
+        self._keywords = dict(keywords or {})
+        self._built: Dict[str, BaseAgent] = {}
+        self._hooks: List[Callable[[BaseAgent], Any]] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_agents(cls, agents: Mapping[str, BaseAgent]) -> 'LazyAgents':
+        """Wrap agents that are already constructed"""
+        lazy = cls({name: (lambda agent=agent: agent) for name, agent in agents.items()})
+        lazy._built.update(agents)
+        return lazy
+
+    def __getitem__(self, name: str) -> BaseAgent:
+        agent = self._built.get(name)
+        if agent is not None:
+            return agent
+        factory = self._factories[name]
+        with self._lock:
+            agent = self._built.get(name)
+            if agent is None:
+                agent = factory()
+                for hook in self._hooks:
+                    hook(agent)
+                self._built[name] = agent
+            return agent
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def built(self) -> Dict[str, BaseAgent]:
+        """The agents constructed so far, in key order"""
+        return {name: self._built[name] for name in self._factories if name in self._built}
+
+    def intent_vocabularies(self) -> Dict[str, List[str]]:
+        """Routing vocabulary per agent: built agents' own, static keywords for the rest"""
+        vocabularies = {}
+        for name in self._factories:
+            agent = self._built.get(name)
+            if agent is None and name in self._keywords:
+                vocabularies[name] = list(self._keywords[name]())
+            else:
+                vocabularies[name] = (agent or self[name]).intent_vocabulary()
+        return vocabularies
+
+    def on_build(self, hook: Callable[[BaseAgent], Any]):
+        """Call hook(agent) for every agent built so far and every one built later"""
+        with self._lock:
+            self._hooks.append(hook)
+            for agent in self.built().values():
+                hook(agent)
+
+
+def build_default_agents(store=None) -> LazyAgents:
+    """The four standard agents, keyed as in the UI, publishing events to the analytics agent.
+
+    Each agent is constructed on first lookup. With an EventStore, events are
+    also persisted and analytics reads from it.
+    """
+    from utils.events import EventAggregator
+    aggregator = EventAggregator()
+
+    def support():
+        from agents.support_agent import SupportAgent
+        return SupportAgent()
+
+    def product():
+        from agents.product_agent import ProductAgent
+        return ProductAgent()
+
+    def social():
+        from agents.social_agent import SocialAgent
+        return SocialAgent(product_agent=agents['product'])
+
+    def analytics():
+        from agents.analytics_agent import AnalyticsAgent
+        return AnalyticsAgent(aggregator=aggregator, store=store)
+
+    def subscribe(agent: BaseAgent):
+        agent.subscribe(aggregator.record)
+        if store is not None:
+            agent.subscribe(store.record)
+
+    def keywords(module: str, cls: str) -> Callable[[], Iterable[str]]:
+        return lambda: getattr(importlib.import_module(module), cls).intent_keywords
+
+    agents = LazyAgents({'support': support, 'product': product, 'social': social, 'analytics': analytics},
+                        keywords={'support': keywords('agents.support_agent', 'SupportAgent'),
+                                  'product': keywords('agents.product_agent', 'ProductAgent'),
+                                  'social': keywords('agents.social_agent', 'SocialAgent'),
+                                  'analytics': keywords('agents.analytics_agent', 'AnalyticsAgent')})
+    agents.on_build(subscribe)
+    return agents
+
+
+def _wake(waiter: asyncio.Future):
+    """Resolve a slot waiter unless it already gave up (runs on the waiter's loop)"""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AgentHub:
+    """Route queries to agents, independent of any UI.
+
+    Agents run on an executor so the event loop never blocks on
+    process_query. Every request is bounded by a timeout (queueing included)
+    and by a concurrency limit shared by every caller and event loop,
+    handle_sync() included. A timed-out call is abandoned, but its worker
+    thread finishes in the background and keeps its slot until it does.
+    handle() always returns a result dict and never raises for agent errors.
+    """
+
+    def __init__(self, agents: Optional[Mapping[str, BaseAgent]] = None, default_agent: str = 'support',
+                 executor: Optional[Executor] = None, max_workers: int = 8,
+                 timeout: float = 5.0, max_concurrency: int = 32, min_confidence: float = 0.0):
+        if agents is None:
+            agents = build_default_agents()
+        elif not isinstance(agents, LazyAgents):
+            agents = LazyAgents.from_agents(agents)
+        self.agents = agents
+        self.default_agent = default_agent
+        self.min_confidence = min_confidence
+        self._router: Optional[IntentRouter] = None
+        self._router_versions: Optional[tuple] = None
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AgentHub")
+        # Threads, not event loops, hold the slots: handle_sync() runs a new loop per call
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._waiters_lock = threading.Lock()
+        self.logger = logging.getLogger("AgentHub")
+
+    async def _acquire(self, timeout: float) -> bool:
+        """Wait up to timeout for a concurrency slot without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self._slots.acquire(blocking=False):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            waiter = loop.create_future()
+            with self._waiters_lock:
+                self._waiters.append((loop, waiter))
+            # A slot freed between the failed acquire and queueing would wake nobody
+            if self._slots.acquire(blocking=False):
+                self._forget(waiter)
+                return True
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                self._forget(waiter)
+                return False
+            except asyncio.CancelledError:
+                self._forget(waiter)
+                raise
+        return True
+
+    def _forget(self, waiter: asyncio.Future):
+        """Drop a caller that stopped waiting, passing on a wake-up already sent to it"""
+        with self._waiters_lock:
+            for i, (_, queued) in enumerate(self._waiters):
+                if queued is waiter:
+                    del self._waiters[i]
+                    return
+        self._wake_next()
+
+    def _wake_next(self):
+        """Wake the longest-waiting caller, on its own loop, to retry for a slot"""
+        with self._waiters_lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(_wake, waiter)
+                    return
+                except RuntimeError:  # its loop has closed
+                    continue
+
+    def _release(self, _future=None):
+        """Free a slot once a worker thread is done with it"""
+        self._slots.release()
+        self._wake_next()
+
+    @property
+    def router(self) -> IntentRouter:
+        """Intent router over the agents' vocabularies, recompiled when an agent is built or reloads its data"""
+        # Only agents already built are consulted: the rest route by their static keywords
+        versions = tuple((name, agent.data_version) for name, agent in self.agents.built().items())
+        if self._router is None or versions != self._router_versions:
+            self._router = IntentRouter(self.agents.intent_vocabularies(), self.default_agent)
+            self._router_versions = versions
+        return self._router
+
+    def route(self, query: str) -> Tuple[str, float]:
+        """(agent name, confidence) for a query; the default agent below min_confidence"""
+        name, confidence = self.router.route(query)
+        if not confidence or confidence < self.min_confidence:
+            return self.default_agent, confidence
+        return name, confidence
+
+    @staticmethod
+    def _call(agent: BaseAgent, query: str, session_id: Optional[str]) -> Dict[str, Any]:
+        """Run one query on a worker thread with its session as the request context"""
+        with session_scope(session_id):
+            return agent.process_query(query)
+
+    async def _run(self, agent: BaseAgent, query: str, session_id: Optional[str], timeout: float) -> Dict[str, Any]:
+        """Run a query within timeout, waiting for a slot included; the slot is freed when its thread is done"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if not await self._acquire(timeout):
+            raise asyncio.TimeoutError
+        try:
+            future = self.executor.submit(self._call, agent, query, session_id)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.wrap_future(future), max(deadline - loop.time(), 0))
+
+    async def handle(self, query: str, agent: Optional[str] = None,
+                     timeout: Optional[float] = None, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Process one query and return a structured result.
+
+        Result keys: agent, query, ok, response (the agent's reply or None),
+        error (None on success), latency_ms and confidence. Without an
+        agent, the query is routed by intent and confidence is the router's;
+        it is None when the caller picked the agent. With a session_id, the
+        exchange is added to that session's history on the agent.
+        """
+        confidence = None
+        if agent is None:
+            agent, confidence = self.route(query)
+        name = agent
+        result = {'agent': name, 'query': query, 'ok': False, 'response': None, 'error': None, 'latency_ms': 0.0,
+                  'confidence': confidence}
+        target = self.agents.get(name)
+        if target is None:
+            result['error'] = f"Unknown agent: {name}"
+            return result
+
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            result['response'] = await self._run(target, query, session_id, timeout)
+            result['ok'] = True
+            if session_id is not None:
+                target.add_to_history('user', query, session_id)
+                target.add_to_history('assistant', result['response'].get('response', ''), session_id)
+        except asyncio.TimeoutError:
+            result['error'] = f"Timed out after {timeout}s"
+            self.logger.warning(f"{name} timed out on query: {query[:80]!r}")
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            self.logger.exception(f"{name} failed on query: {query[:80]!r}")
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    def handle_sync(self, query: str, agent: Optional[str] = None,
+                    timeout: Optional[float] = None, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Blocking wrapper around handle() for callers without an event loop"""
+        return asyncio.run(self.handle(query, agent, timeout, session_id))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent call counts and stage latency percentiles of the agents built so far, keyed like self.agents"""
+        return {name: agent.metrics_snapshot() for name, agent in self.agents.built().items()}
+
+    def prometheus(self) -> str:
+        """All agent metrics in the Prometheus text exposition format"""
+        return to_prometheus(snapshot for snapshot in self.metrics().values() if snapshot)
+
+    def close(self):
+        """Shut down the executor if the hub created it"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
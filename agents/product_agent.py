@@ -1,48 +1,353 @@
 """Product Agent - Recommends products"""
 
-import json
+import re
+import threading
 from agents.base_agent import BaseAgent
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from utils.catalog_index import CatalogIndex
+from utils.data_loader import iter_records
+from utils.faq_index import STOPWORDS, TOKEN_PATTERN
+from utils.fuzzy_index import FuzzyIndex
+from utils.reviews import ReviewSummary
+
+def _columnar_catalog():
+    """ColumnarCatalog, imported on first use (it pulls in NumPy), or None without NumPy"""
+    try:
+        from utils.columnar_catalog import ColumnarCatalog
+    except ImportError:  # numpy is optional (see requirements_minimal.txt)
+        return None
+    return ColumnarCatalog
+
+def _product_vectors():
+    """ProductVectors, imported on first use, or None without NumPy"""
+    try:
+        from utils.vector_index import ProductVectors
+    except ImportError:  # without numpy there is no similarity search
+        return None
+    return ProductVectors
+
+MAX_PRICE_PATTERN = re.compile(r"(?:under|below|less than|max|up to)\s*\$?\s*(\d+(?:\.\d+)?)")
+MIN_PRICE_PATTERN = re.compile(r"(?:over|above|more than|min|at least)\s*\$?\s*(\d+(?:\.\d+)?)")
+MIN_RATING_PATTERN = re.compile(r"(?:rating|rated)\s*(?:>=|≥|of|above|over|at least)?\s*(\d(?:\.\d+)?)|(\d(?:\.\d+)?)\s*\+?\s*stars?")
+SIMILAR_PATTERN = re.compile(r"\b(?:more like|similar to|something like|alternatives? to|like (?:the|my))\s+(.+)")
+REVIEWED_PATTERN = re.compile(r"\b(?:best|well|top|highest|most positively)[ -]reviewed\b|\bcustomers? love\b|\bbest reviews\b")
 
 class ProductAgent(BaseAgent):
     """Product Recommender Agent"""
     
-    def __init__(self):
+    intent_keywords = (
+        'recommend', 'recommendation', 'recommendations', 'suggest', 'buy', 'shop', 'products', 'items',
+        'category', 'categories', 'budget', 'cheap', 'affordable', 'premium', 'luxury', 'expensive',
+        'price', 'rated', 'rating', 'stars', 'best', 'top rated', 'in stock', 'show me', 'looking for',
+        'gift ideas', 'best reviewed', 'well reviewed', 'customers love', 'similar to', 'more like'
+    )
+    
+    # Fewest reviews a product needs to be ranked by review sentiment
+    min_reviews = 3
+    
+    # Catalog size from which similarity search only reads each term's strongest postings
+    approximate_above = 500_000
+    
+    def __init__(self, storage: str = 'auto', data_path: str = 'data/products.json',
+                 reviews_path: str = 'data/review_summary.json'):
         super().__init__("ProductAgent")
-        self.products = self._load_products()
+        self.storage = storage
+        self.data_path = data_path
+        self.reviews_path = reviews_path
+        self.catalog = self._load_products()
+        self.reviews = self._load_reviews()
+        # Indexes derived from a catalog snapshot, built once per snapshot: {name: (catalog, index)}
+        self._derived: Dict[str, Tuple[Any, Any]] = {}
+        self._derived_lock = threading.Lock()
+        self._plain_words = STOPWORDS | frozenset(
+            word for keyword in self.intent_keywords for word in TOKEN_PATTERN.findall(keyword))
+        self._build_indexes(self.catalog)
+    
+    def _load_products(self, strict: bool = False):
+        """Stream the product database (JSON or NDJSON) item by item into the catalog backend"""
+        try:
+            return self._build_catalog(iter_records(self.data_path, nested=True))
+        except (OSError, ValueError) as e:
+            if strict:
+                raise
+            self.logger.warning(f"Could not load products from {self.data_path}: {e}")
+            return self._build_catalog(())
     
-    def _load_products(self) -> Dict:
-        """Load product database"""
+    def _load_reviews(self, strict: bool = False) -> Optional[ReviewSummary]:
+        """Review sentiment summary written by utils.reviews, if there is one"""
         try:
-            with open('data/products.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
+            return ReviewSummary.load_if_exists(self.reviews_path)
+        except (OSError, ValueError) as e:
+            if strict:
+                raise
+            self.logger.warning(f"Could not load review summary from {self.reviews_path}: {e}")
+            return None
+    
+    @property
+    def data_files(self) -> List[str]:
+        """The catalog and the review summary"""
+        return [path for path in (self.data_path, self.reviews_path) if path]
+    
+    def _load_data(self, strict: bool = False):
+        """Fresh catalog and review snapshots for hot reload"""
+        return self._load_products(strict), self._load_reviews(strict)
+    
+    def _install_data(self, data):
+        """Swap in a reloaded catalog and review summary, with its indexes already built"""
+        catalog, reviews = data
+        self._build_indexes(catalog)
+        self.catalog, self.reviews = catalog, reviews
+    
+    def _build_indexes(self, catalog):
+        """Build the typo and similarity indexes of a catalog at load time, not inside the first query"""
+        self.fuzzy_index(catalog)
+        self.vector_index(catalog)
+    
+    def _build_catalog(self, records: Iterable[Tuple[str, Dict]]):
+        """Build the storage backend: 'columnar' (NumPy), 'index' (dicts) or 'auto'"""
+        ColumnarCatalog = _columnar_catalog() if self.storage in ('columnar', 'auto') else None
+        if self.storage == 'columnar' or (self.storage == 'auto' and ColumnarCatalog is not None):
+            if ColumnarCatalog is None:
+                raise ImportError("numpy is required for columnar product storage")
+            return ColumnarCatalog.from_records(records)
+        return CatalogIndex.from_records(records)
+    
+    def intent_vocabulary(self) -> List[str]:
+        """Built-in routing words plus the catalog's category names"""
+        return list(self.intent_keywords) + list(self.catalog.categories)
+    
+    @property
+    def products(self) -> Dict:
+        """Catalog as a {category: [items]} dict, materialized from the backend"""
+        catalog = self.catalog
+        products = {category: [] for category in catalog.categories}
+        for category, item in catalog.iter_records():
+            products[category].append(item)
+        return products
+    
+    def filter_products(self, **criteria) -> List[Dict]:
+        """Range-filter the catalog, e.g. category='electronics', max_price=100, min_rating=4.5, in_stock=True"""
+        return self.catalog.filter(**criteria)
+    
+    def _parse_filters(self, query_lower: str) -> Dict[str, Any]:
+        """Extract price, rating and stock constraints from a query"""
+        filters = {}
+        rating = MIN_RATING_PATTERN.search(query_lower)
+        if rating:
+            filters['min_rating'] = float(rating.group(1) or rating.group(2))
+        for key, pattern in (('max_price', MAX_PRICE_PATTERN), ('min_price', MIN_PRICE_PATTERN)):
+            match = pattern.search(query_lower)
+            # "$" is optional, so "rated over 4" and "over 4 stars" are ratings, not prices
+            if match and not (rating and match.start() < rating.end() and rating.start() < match.end()):
+                filters[key] = float(match.group(1))
+        if 'in stock' in query_lower or 'available' in query_lower:
+            filters['in_stock'] = True
+        return filters
+    
+    @staticmethod
+    def _describe(category: Optional[str], filters: Dict[str, Any]) -> str:
+        """The constraints of a query in words, e.g. "in fashion under $100" """
+        parts = [f"in {category}" if category else "in the catalog"]
+        if filters.get('min_price') is not None:
+            parts.append(f"over ${filters['min_price']:g}")
+        if filters.get('max_price') is not None:
+            parts.append(f"under ${filters['max_price']:g}")
+        if filters.get('min_rating') is not None:
+            parts.append(f"rated {filters['min_rating']:g}+")
+        if filters.get('in_stock'):
+            parts.append("in stock")
+        return ' '.join(parts) + " matches"
+    
+    @staticmethod
+    def _passes(item: Dict, filters: Dict[str, Any]) -> bool:
+        """Whether one item meets parsed price, rating and stock filters"""
+        return ((filters.get('min_price') is None or item['price'] >= filters['min_price'])
+                and (filters.get('max_price') is None or item['price'] <= filters['max_price'])
+                and (filters.get('min_rating') is None or item.get('rating', 0) >= filters['min_rating'])
+                and (not filters.get('in_stock') or item.get('stock', 0) > 0))
+    
+    def best_reviewed(self, category: Optional[str] = None, k: int = 3, **filters) -> List[Dict]:
+        """Top-k catalog items by review sentiment, e.g. best_reviewed('electronics', max_price=100)"""
+        return self._best_reviewed(self.catalog, self.reviews, category, filters, k)
+    
+    def _best_reviewed(self, catalog, reviews: Optional[ReviewSummary], category: Optional[str],
+                       filters: Dict[str, Any], k: int = 3) -> List[Dict]:
+        """Walk the summary's precomputed ranking until k catalog items pass the filters"""
+        if reviews is None:
+            return []
+        return self._collect(catalog, reviews.best_reviewed(category, self.min_reviews), filters, k)
+    
+    def _derived_index(self, name: str, catalog, build):
+        """The named index of this catalog snapshot, built once by build(catalog)"""
+        built_for, index = self._derived.get(name, (None, None))
+        if built_for is catalog:
+            return index
+        with self._derived_lock:
+            built_for, index = self._derived.get(name, (None, None))
+            if built_for is not catalog:
+                index = build(catalog)
+                self._derived[name] = (catalog, index)
+            return index
+    
+    def fuzzy_index(self, catalog=None) -> FuzzyIndex:
+        """Typo-tolerant index of category names, labelled (category,), and product names, (category, id)"""
+        def build(catalog) -> FuzzyIndex:
+            terms = [(category, (category,)) for category in catalog.categories]
+            terms += [(item.get('name', ''), (category, item['id'])) for category, item in catalog.iter_records()]
+            return FuzzyIndex(terms)
+        return self._derived_index('fuzzy', catalog if catalog is not None else self.catalog, build)
+    
+    def vector_index(self, catalog=None):
+        """TF-IDF vectors of every product for similarity search, or None without NumPy"""
+        ProductVectors = _product_vectors()
+        if ProductVectors is None:
+            return None
+        return self._derived_index('vectors', catalog if catalog is not None else self.catalog,
+                                   lambda catalog: ProductVectors.from_records(catalog.iter_records()))
+    
+    def similar_products(self, item_id: str, k: int = 3, **filters) -> List[Dict]:
+        """Up to k products most like the given one, e.g. similar_products('ELEC001', max_price=200)"""
+        catalog = self.catalog
+        vectors = self.vector_index(catalog)
+        item = catalog.get(item_id)
+        if vectors is None or item is None:
+            return []
+        return self._similar(catalog, vectors, vectors.category_of(item_id), item, filters, k)
+    
+    def _similar(self, catalog, vectors, category: str, item: Dict, filters: Dict[str, Any],
+                 k: int = 3) -> List[Dict]:
+        """Nearest products to item by TF-IDF cosine similarity that pass the filters"""
+        # Over-fetch so that neighbours dropped by the filters still leave k
+        found = vectors.similar(category, item, k * 4 if filters else k, len(catalog) >= self.approximate_above)
+        return self._collect(catalog, (product_id for product_id, _ in found), filters, k)
+    
+    def _text_matches(self, catalog, vectors, text: str, category: Optional[str], filters: Dict[str, Any],
+                      k: int = 3) -> List[Dict]:
+        """Products whose names, categories and features best match free text"""
+        found = vectors.search(text, k * 4 if filters else k, category, len(catalog) >= self.approximate_above)
+        return self._collect(catalog, (product_id for product_id, _ in found), filters, k)
+    
+    def _collect(self, catalog, product_ids: Iterable[str], filters: Dict[str, Any], k: int) -> List[Dict]:
+        """The first k of product_ids that are in the catalog and pass the filters, as items"""
+        items = []
+        for product_id in product_ids:
+            item = catalog.get(product_id)
+            if item is not None and self._passes(item, filters):
+                items.append(item)
+                if len(items) == k:
+                    break
+        return items
+    
+    def _named(self, index: FuzzyIndex, words: List[str], category: Optional[str]) -> List[Tuple[str, str]]:
+        """(category, id) of the products whose names contain every given word, in catalog order"""
+        if not words:
+            return []
+        labels = [label for label in index.labels(words[0])
+                  if len(label) == 2 and (category is None or label[0] == category)]
+        for word in words[1:]:
+            named = set(index.labels(word))
+            labels = [label for label in labels if label in named]
+        return labels
+    
+    def _name_matches(self, catalog, index: FuzzyIndex, words: List[str], category: Optional[str],
+                      filters: Dict[str, Any], k: int = 3) -> List[Dict]:
+        """Items whose names contain every given word, in catalog order"""
+        return self._collect(catalog, (product_id for _, product_id in self._named(index, words, category)),
+                             filters, k)
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """Get product recommendations based on query"""
         query_lower = query.lower()
+        catalog = self.catalog  # one snapshot for the whole query, even across a reload
+        reviews = self.reviews
         recommendations = []
         
         # Check category match
-        for category, items in self.products.items():
-            if category in query_lower:
-                recommendations = items[:3]
-                break
+        with self.timed('matching'):
+            matched_category = None
+            for category in catalog.categories:
+                if category in query_lower:
+                    matched_category = category
+                    break
+            filters = self._parse_filters(query_lower)
+            index = self.fuzzy_index(catalog)
+            tokens = [word for word in TOKEN_PATTERN.findall(query_lower) if word not in self._plain_words]
+            words = [word for word in tokens if word in index]
+            
+            # Misspelled category and product names, only when nothing in the query matched as typed
+            corrected, corrections = query_lower, {}
+            if matched_category is None and tokens and not words:
+                corrected, corrections = index.correct(query_lower, skip=self._plain_words)
+                words = [corrections.get(word, word) for word in tokens if corrections.get(word, word) in index]
         
-        # Price-based filtering if no category
-        if not recommendations:
-            all_items = [item for items in self.products.values() for item in items]
+        categories = [word for word in words if word in catalog.categories]
+        if matched_category is None and categories:
+            matched_category = categories[0]
+        name_words = [word for word in words if word not in categories]
+        # Words that name no product or category, e.g. features ("waterproof")
+        features = [corrections.get(word, word) for word in tokens if corrections.get(word, word) not in index]
+        similar = SIMILAR_PATTERN.search(corrected)
+        similar_to = None
+        
+        with self.timed('ranking'):
+            # "Best reviewed" ranks by the review sentiment summary when there is one
+            if reviews is not None and REVIEWED_PATTERN.search(query_lower):
+                recommendations = self._best_reviewed(catalog, reviews, matched_category, filters)
+            
+            # "More like X" ranks by similarity to the product X names, or to the text if it names none
+            vectors = self.vector_index(catalog) if similar or features else None
+            if vectors is not None:
+                features = [word for word in features if vectors.knows(word)]
+            if not recommendations and similar and vectors is not None:
+                target = similar.group(1)
+                named = self._named(index, [word for word in TOKEN_PATTERN.findall(target)
+                                            if word in index and word not in self._plain_words
+                                            and word not in categories], None)
+                similar_to = catalog.get(named[0][1]) if named else None
+                if similar_to is not None:
+                    recommendations = self._similar(catalog, vectors, named[0][0], similar_to, filters)
+                else:
+                    recommendations = self._text_matches(catalog, vectors, target, None, filters)
             
-            if any(word in query_lower for word in ['budget', 'cheap', 'affordable']):
-                recommendations = sorted(all_items, key=lambda x: x['price'])[:3]
-            elif any(word in query_lower for word in ['premium', 'luxury', 'expensive']):
-                recommendations = sorted(all_items, key=lambda x: x['price'], reverse=True)[:3]
-            else:
-                recommendations = sorted(all_items, key=lambda x: x.get('rating', 0), reverse=True)[:3]
+            # Feature words rank by TF-IDF similarity over names, categories and features
+            if not recommendations and features and vectors is not None:
+                recommendations = self._text_matches(catalog, vectors, ' '.join(name_words + features),
+                                                     matched_category, filters)
+            
+            # Words from product names pick those products
+            if not recommendations and name_words:
+                recommendations = self._name_matches(catalog, index, name_words, matched_category, filters)
+            
+            # Explicit price/rating/stock constraints go through the vectorized filter
+            if not recommendations and filters:
+                recommendations = catalog.filter(category=matched_category, **filters)
+            elif not recommendations and matched_category:
+                recommendations = catalog.in_category(matched_category)
+            
+            # Price-based filtering if no category; a parsed category or limit is never dropped
+            if not recommendations and not matched_category and not filters:
+                if any(word in query_lower for word in ['budget', 'cheap', 'affordable']):
+                    recommendations = catalog.cheapest()
+                elif any(word in query_lower for word in ['premium', 'luxury', 'expensive']):
+                    recommendations = catalog.most_expensive()
+                else:
+                    recommendations = catalog.top_rated()
         
-        return {
+        response = {
             'type': 'recommendations',
             'response': '🎯 **Top Recommendations:**',
-            'products': recommendations
+            'products': recommendations,
+            'category': matched_category
         }
+        if not recommendations:
+            response['response'] = (f"😕 **No Matching Products**\n\nNothing {self._describe(matched_category, filters)}. "
+                                    "Try a wider price range or another category.")
+        if similar_to is not None:
+            response['similar_to'] = similar_to['name']
+        if corrections:
+            response['corrected_query'] = corrected
+            response['corrections'] = corrections
+        if reviews is not None:
+            summaries = {item['id']: reviews.product(item['id']) for item in recommendations}
+            response['reviews'] = {product_id: summary for product_id, summary in summaries.items() if summary}
+        return response
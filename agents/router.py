@@ -0,0 +1,80 @@
+"""Intent Router - Pick the agent for a query from all agents' keyword vocabularies"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from agents.base_agent import BaseAgent
+from utils.faq_index import TOKEN_PATTERN, stem
+
+# A matched two-word phrase is more specific than a single word
+BIGRAM_WEIGHT = 2.0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed word tokens; stopwords are kept, as phrases like 'where is' need them"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+class IntentRouter:
+    """Score every agent in one pass over a query's tokens and bigrams.
+
+    All vocabularies are compiled into a single dict from term (a token or
+    a 'word word' bigram) to the agents it votes for. A term shared by n
+    agents gives each 1/n of its weight, so words every agent uses barely
+    count. Longer phrases are indexed by each of their bigrams. Confidence
+    is the winning agent's share of the total score.
+    """
+
+    def __init__(self, vocabularies: Mapping[str, Iterable[str]], default: Optional[str] = None):
+        self.names = list(vocabularies)
+        self.default = default if default is not None else (self.names[0] if self.names else None)
+        owners: Dict[str, Dict[int, float]] = {}
+        for position, name in enumerate(self.names):
+            for keyword in vocabularies[name]:
+                tokens = tokenize(keyword)
+                if len(tokens) == 1:
+                    terms, weight = tokens, 1.0
+                else:
+                    terms = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+                    weight = BIGRAM_WEIGHT / len(terms)
+                for term in terms:
+                    votes = owners.setdefault(term, {})
+                    votes[position] = max(votes.get(position, 0.0), weight)
+        self.terms: Dict[str, Tuple[Tuple[int, float], ...]] = {
+            term: tuple((position, weight / len(votes)) for position, weight in votes.items())
+            for term, votes in owners.items()
+        }
+
+    @classmethod
+    def from_agents(cls, agents: Mapping[str, BaseAgent], default: Optional[str] = None) -> 'IntentRouter':
+        """Compile the intent vocabularies of agents keyed as in the hub"""
+        return cls({name: agent.intent_vocabulary() for name, agent in agents.items()}, default)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """Intent score per agent for a query"""
+        totals = [0.0] * len(self.names)
+        terms = self.terms
+        previous = None
+        for token in tokenize(query):
+            hits = terms.get(token)
+            if hits:
+                for position, weight in hits:
+                    totals[position] += weight
+            if previous is not None:
+                hits = terms.get(f"{previous} {token}")
+                if hits:
+                    for position, weight in hits:
+                        totals[position] += weight
+            previous = token
+        return dict(zip(self.names, totals))
+
+    def route(self, query: str) -> Tuple[Optional[str], float]:
+        """(best agent, confidence in [0, 1]); the default agent with 0.0 if nothing matched"""
+        scores = self.scores(query)
+        total = sum(scores.values())
+        if not total:
+            return self.default, 0.0
+        name = max(scores, key=scores.get)
+        return name, round(scores[name] / total, 3)
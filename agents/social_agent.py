@@ -1,30 +1,93 @@
 """Social Media Agent - Content Generation"""
 
-import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, Hashable, Iterable, Iterator, List, Optional
 from agents.base_agent import BaseAgent
 from utils.sentiment_analyzer import SentimentAnalyzer
+from utils.data_loader import iter_records
+from utils.templates import KEY_ALIASES, PLATFORMS, TemplateEngine, bulk_generate, product_context
+
+# Content types in priority order, with their titles and trigger keywords
+CONTENT_TYPES = (
+    ('launch', '🚀 Product Launch Ideas', ('launch', 'announce', 'new product', 'introduce', 'release')),
+    ('engagement', '💬 Engagement Content Ideas', ('engagement', 'interact', 'community', 'question', 'engage')),
+    ('promotion', '🔥 Promotional Content Ideas', ('sale', 'promo', 'discount', 'offer', 'deal', 'promotion')),
+    ('contest', '🎁 Contest & Giveaway Ideas', ('contest', 'giveaway', 'competition', 'win', 'prize')),
+)
 
 class SocialAgent(BaseAgent):
     """Social Media Content Generation Agent"""
     
-    def __init__(self):
+    intent_keywords = (
+        'social', 'social media', 'post', 'posts', 'caption', 'captions', 'hashtag', 'hashtags', 'content',
+        'instagram', 'twitter', 'facebook', 'tiktok', 'tweet', 'followers', 'campaign', 'write', 'create',
+        'generate', 'ideas', 'marketing'
+    ) + tuple(keyword for _, _, keywords in CONTENT_TYPES for keyword in keywords)
+    
+    def __init__(self, data_path: str = os.path.join('data', 'social_templates.json'),
+                 product_agent: Optional[BaseAgent] = None, brand: str = 'AIAgentHub'):
         super().__init__("SocialAgent")
-        self.templates = self._load_templates()
+        self.data_path = data_path
+        self.product_agent = product_agent
+        self.brand = brand
+        self.engine = self._load_data()
         self.sentiment_analyzer = SentimentAnalyzer()
     
-    def _load_templates(self) -> Dict:
+    @property
+    def templates(self) -> Dict:
+        """Raw templates as loaded, keyed as in the source file"""
+        return self.engine.source
+    
+    def _load_templates(self, strict: bool = False) -> Dict:
         """Load social media templates"""
         try:
-            template_path = os.path.join('data', 'social_templates.json')
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return self._get_default_templates()
-        except json.JSONDecodeError:
+            return dict(iter_records(self.data_path))
+        except (OSError, ValueError) as e:
+            if strict:
+                raise
+            self.logger.warning(f"Could not load templates from {self.data_path}: {e}")
             return self._get_default_templates()
     
+    def _load_data(self, strict: bool = False) -> TemplateEngine:
+        """Fresh compiled template snapshot for hot reload; built-in templates cover types the file lacks"""
+        templates = self._load_templates(strict)
+        present = {KEY_ALIASES.get(key, key) for key in templates}
+        for content_type, ideas in self._get_default_templates().items():
+            if content_type not in present:
+                templates[content_type] = ideas
+        return TemplateEngine(templates, self.brand)
+    
+    def _install_data(self, data: TemplateEngine):
+        """Swap in recompiled templates"""
+        self.engine = data
+    
+    def cache_version(self) -> Hashable:
+        """Own templates plus the product catalog posts are filled from"""
+        if self.product_agent is None:
+            return self.data_version
+        return self.data_version, self.product_agent.data_version
+    
+    def _featured_product(self, query_lower: str) -> tuple:
+        """(category, item) to fill templates with: a category named in the query, else the top-rated product"""
+        if self.product_agent is None:
+            return None, None
+        catalog = self.product_agent.catalog
+        for category in catalog.categories:
+            if category in query_lower:
+                items = catalog.in_category(category, 1)
+                return category, (items[0] if items else None)
+        items = catalog.top_rated(1)
+        return None, (items[0] if items else None)
+    
+    def generate_posts(self, content_type: str = 'launch', platforms: Iterable[str] = PLATFORMS,
+                       records: Optional[Iterable] = None, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream a post for every catalog product x platform, rendered in parallel"""
+        if records is None:
+            if self.product_agent is None:
+                raise ValueError("SocialAgent needs a product_agent (or explicit records) for bulk posts")
+            records = self.product_agent.catalog.iter_records()
+        return bulk_generate(self.engine, records, content_type, platforms, workers)
+    
     def _get_default_templates(self) -> Dict:
         """Return default templates if file not found"""
         return {
@@ -135,41 +198,39 @@ class SocialAgent(BaseAgent):
         query_lower = query.lower()
         
         # Analyze sentiment
-        sentiment = self.sentiment_analyzer.analyze(query)
+        with self.timed('sentiment'):
+            sentiment = self.sentiment_analyzer.analyze(query)
         
-        # Determine content type with robust fallback
-        if any(word in query_lower for word in ['launch', 'announce', 'new product', 'introduce', 'release']):
-            content_type = 'launch'
-            title = '🚀 Product Launch Ideas'
-        elif any(word in query_lower for word in ['engagement', 'interact', 'community', 'question', 'engage']):
-            content_type = 'engagement'
-            title = '💬 Engagement Content Ideas'
-        elif any(word in query_lower for word in ['sale', 'promo', 'discount', 'offer', 'deal', 'promotion']):
-            content_type = 'promotion'
-            title = '🔥 Promotional Content Ideas'
-        elif any(word in query_lower for word in ['contest', 'giveaway', 'competition', 'win', 'prize']):
-            content_type = 'contest'
-            title = '🎁 Contest & Giveaway Ideas'
-        else:
-            content_type = 'general'
-            title = '✨ Content Ideas'
+        # Determine content type: first type in priority order with a keyword in the query
+        # (substring checks short-circuit, which beats a single-pass matcher at this vocabulary size)
+        with self.timed('matching'):
+            content_type, title = 'general', '✨ Content Ideas'
+            for candidate, candidate_title, keywords in CONTENT_TYPES:
+                if any(word in query_lower for word in keywords):
+                    content_type, title = candidate, candidate_title
+                    break
         
         # Get templates with SAFE fallback chain
         ideas = None
         
-        # Try to get the requested content type
-        if content_type in self.templates:
-            ideas = self.templates[content_type]
-        
-        # Fallback to general if requested type not found
-        if not ideas and 'general' in self.templates:
-            ideas = self.templates['general']
-            title = '✨ General Content Ideas'
-        
-        # Fallback to launch if general not found
-        if not ideas and 'launch' in self.templates:
-            ideas = self.templates['launch']
-            title = '🚀 Product Launch Ideas'
+        engine = self.engine  # one snapshot for the whole query, even across a reload
+        with self.timed('rendering'):
+            category, product = self._featured_product(query_lower)
+            context = product_context(category, product, engine.brand)
+            
+            # Try to get the requested content type
+            if content_type in engine:
+                ideas = engine.ideas(content_type, context)
+            
+            # Fallback to general if requested type not found
+            if not ideas and 'general' in engine:
+                ideas = engine.ideas('general', context)
+                title = '✨ General Content Ideas'
+            
+            # Fallback to launch if general not found
+            if not ideas and 'launch' in engine:
+                ideas = engine.ideas('launch', context)
+                title = '🚀 Product Launch Ideas'
         
         # Ultimate fallback - hardcoded content
         if not ideas:
@@ -202,5 +263,6 @@ class SocialAgent(BaseAgent):
             'response': response,
             'ideas': ideas,
             'content_type': content_type,
-            'sentiment': sentiment
+            'sentiment': sentiment,
+            'product_id': product.get('id') if product else None
         }
\ No newline at end of file
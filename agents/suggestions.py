@@ -0,0 +1,31 @@
+"""Quick-action queries shown in the UI, per agent"""
+
+from types import MappingProxyType
+
+# Shared by every session, so read-only
+SUGGESTIONS = MappingProxyType({
+    'support': (
+        "📦 What's your return policy?",
+        "🚚 How can I track my order?",
+        "⚠️ This product arrived damaged",
+        "💳 What payment methods do you accept?"
+    ),
+    'product': (
+        "💻 Show me budget electronics",
+        "⭐ Recommend premium products",
+        "👔 What's in the fashion category?",
+        "🔥 Show me top-rated items"
+    ),
+    'social': (
+        "🚀 Create a product launch post",
+        "💬 Give me engagement ideas",
+        "💰 Write a sale promotion",
+        "🎁 Generate contest content"
+    ),
+    'analytics': (
+        "📊 Show overall metrics",
+        "💬 Support agent performance",
+        "🛍️ Product recommendation stats",
+        "📱 Social media engagement"
+    )
+})
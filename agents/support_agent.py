@@ -1,50 +1,195 @@
 """Support Agent - Handles FAQs and escalations"""
 
-import json
+import hashlib
+import secrets
+from types import MappingProxyType
 from agents.base_agent import BaseAgent
-from typing import Dict, Any
+from typing import Dict, Any, Hashable, List, Mapping, NamedTuple
+from utils.history import DEFAULT_SESSION
+from utils.metrics import AtomicCounter
+from utils.response_cache import normalize_query
 from utils.sentiment_analyzer import SentimentAnalyzer
+from utils.keyword_matcher import KeywordMatcher
+from utils.faq_index import FAQIndex, STOPWORDS, TOKEN_PATTERN
+from utils.fuzzy_index import FuzzyIndex
+from utils.data_loader import iter_records
+
+# Function words are neither corrected nor correction targets: "there" is not a typo of "where"
+UNCORRECTED = STOPWORDS | frozenset(['where', 'there', 'here', 'who', 'why', 'not', 'no', 'get', 'got'])
+
+class FAQData(NamedTuple):
+    """One consistent snapshot of the FAQ data and its indexes"""
+    index: FAQIndex
+    matcher: KeywordMatcher
+    fuzzy: FuzzyIndex
+    
+    @property
+    def faqs(self) -> Dict:
+        """FAQ entries keyed as in the data file"""
+        return self.index.faqs
+
+def ticket_number(query: str, session_id: Hashable, nonce: str = '') -> str:
+    """Deterministic ticket id for a query within a session.
+    
+    Unlike hash(), blake2b is stable across processes and runs, so every
+    worker issues the same id and a retried escalation reuses its ticket.
+    Callers outside any session all share DEFAULT_SESSION, so they pass a
+    per-issue nonce and keep it for retries. 48 bits keeps collisions
+    unlikely well past millions of tickets.
+    """
+    key = f"{session_id}\x00{normalize_query(query)}" + (f"\x00{nonce}" if nonce else '')
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=6, person=b'support-ticket')
+    return f"TKT-{digest.hexdigest().upper()}"
 
 class SupportAgent(BaseAgent):
     """Support Assistant for handling customer queries"""
     
-    def __init__(self):
+    intent_keywords = (
+        'order', 'orders', 'shipping', 'delivery', 'deliver', 'arrived', 'package', 'return', 'refund',
+        'exchange', 'cancel', 'payment', 'pay', 'invoice', 'account', 'password', 'login', 'help',
+        'support', 'problem', 'issue', 'wrong', 'missing', 'policy', 'policies', 'contact',
+        'customer service', 'payment methods', 'track my', 'my order', 'where is'
+    )
+    
+    def __init__(self, top_k: int = 3, min_score: float = 1.0, min_terms: int = 2,
+                 data_path: str = 'data/faqs.json'):
         super().__init__("SupportAgent")
-        self.faqs = self._load_faqs()
-        self.complex_keywords = [
+        self.top_k = top_k
+        self.min_score = min_score
+        # Without a keyword hit one shared word ("order", "product") is not evidence of the question
+        self.min_terms = min_terms
+        self.data_path = data_path
+        self.complex_keywords = (
             'complaint', 'damaged', 'refund', 'speak to manager',
             'urgent', 'broken', 'defective', 'not working'
-        ]
-        self.escalation_count = 0
+        )
+        self.escalation_matcher = KeywordMatcher((kw, kw) for kw in self.complex_keywords)
+        # Shared by every session's thread, so it is bumped under a lock
+        self.escalations = AtomicCounter()
         self.sentiment_analyzer = SentimentAnalyzer()
+        self.faq_data = self._build_faq_data(self._load_faqs())
     
-    def _load_faqs(self) -> Dict:
-        """Load FAQ database"""
+    def _load_faqs(self, strict: bool = False) -> FAQIndex:
+        """Stream the FAQ database (JSON or NDJSON), indexing entries as they arrive"""
+        index = FAQIndex()
         try:
-            with open('data/faqs.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
+            for key, faq in iter_records(self.data_path):
+                index.add(key, faq)
+        except (OSError, ValueError) as e:
+            if strict:
+                raise
+            self.logger.warning(f"Could not load FAQs from {self.data_path}: {e}")
+            index = FAQIndex()
+        index.finalize()
+        return index
+    
+    def _build_faq_data(self, index: FAQIndex) -> FAQData:
+        """Compile FAQ keywords into a single-pass matcher and a typo-tolerant vocabulary alongside the index"""
+        matcher = KeywordMatcher(
+            (kw, position)
+            for position, key in enumerate(index.keys)
+            for kw in index.faqs[key].get('keywords', [])
+        )
+        # Only distinctive terms: correcting towards question words would invent matches
+        texts = [(text, key) for key in index.keys
+                 for text in [index.faqs[key].get('category', '')] + list(index.faqs[key].get('keywords', []))]
+        texts += [(kw, None) for kw in self.complex_keywords]
+        terms = [(word, label) for text, label in texts
+                 for word in TOKEN_PATTERN.findall(text.lower()) if word not in UNCORRECTED]
+        return FAQData(index, matcher, FuzzyIndex(terms))
+    
+    def _load_data(self, strict: bool = False) -> FAQData:
+        """Fresh FAQ snapshot for hot reload"""
+        return self._build_faq_data(self._load_faqs(strict))
+    
+    def _install_data(self, data: FAQData):
+        """Swap in a reloaded FAQ snapshot"""
+        self.faq_data = data
+    
+    @property
+    def faqs(self) -> Mapping:
+        """FAQ entries from the current snapshot (read-only: the snapshot is shared by all sessions)"""
+        return MappingProxyType(self.faq_data.faqs)
+    
+    @property
+    def escalation_count(self) -> int:
+        """Escalations since startup, across all sessions"""
+        return self.escalations.value
+    
+    @property
+    def faq_index(self) -> FAQIndex:
+        """Ranked FAQ index from the current snapshot"""
+        return self.faq_data.index
+    
+    def intent_vocabulary(self) -> List[str]:
+        """Built-in routing words plus every FAQ and escalation keyword"""
+        faqs = self.faqs
+        return (list(self.intent_keywords) + list(self.complex_keywords)
+                + [kw for faq in faqs.values() for kw in faq.get('keywords', [])])
+    
+    def _is_cacheable(self, response: Dict[str, Any]) -> bool:
+        """Escalations open a ticket each time, so they are never replayed"""
+        return not response.get('escalate')
+    
+    def search_faqs(self, query: str, k: int = None) -> List[Dict[str, Any]]:
+        """Query the FAQ index directly and return ranked matches with scores"""
+        return self.faq_data.index.search(query, k or self.top_k)
+    
+    def _faq_response(self, data: FAQData, key: str, ranked: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the FAQ reply, listing the other ranked FAQs as alternatives"""
+        faq = data.faqs[key]
+        score = next((r['score'] for r in ranked if r['key'] == key), 0.0)
+        return {
+            'type': 'faq',
+            'response': f"💡 **{faq.get('category', 'Info').title()}**\n\n{faq['answer']}",
+            'escalate': False,
+            'category': faq.get('category', 'general'),
+            'faq_key': key,
+            'score': score,
+            'alternatives': [r for r in ranked if r['key'] != key]
+        }
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """Process support query and return appropriate response"""
         query_lower = query.lower()
+        data = self.faq_data  # one snapshot for the whole query, even across a reload
+        response = self._answer(data, query, query_lower)
+        if response['type'] != 'general':
+            return response
+        
+        # Nothing matched as typed: retry once with misspelled words replaced by FAQ vocabulary
+        with self.timed('correction'):
+            corrected, corrections = data.fuzzy.correct(query_lower, skip=UNCORRECTED)
+        if corrections:
+            retry = self._answer(data, query, corrected)
+            if retry['type'] != 'general':
+                retry['corrected_query'] = corrected
+                retry['corrections'] = corrections
+                return retry
+        return response
+    
+    def _answer(self, data: FAQData, query: str, query_lower: str) -> Dict[str, Any]:
+        """FAQ, escalation or general reply for an already lowercased query"""
+        with self.timed('ranking'):
+            ranked = data.index.search(query_lower, self.top_k)
         
-        # Check FAQs
-        for key, faq in self.faqs.items():
-            keywords = faq.get('keywords', [])
-            if any(kw in query_lower for kw in keywords):
-                return {
-                    'type': 'faq',
-                    'response': f"💡 **{faq.get('category', 'Info').title()}**\n\n{faq['answer']}",
-                    'escalate': False,
-                    'category': faq.get('category', 'general')
-                }
+        with self.timed('matching'):
+            matched = data.matcher.labels(query_lower)
+            escalate = not matched and self.escalation_matcher.contains_any(query_lower)
+        
+        # A keyword hit means this is an FAQ question; BM25 decides which one
+        if matched:
+            key = ranked[0]['key'] if ranked else data.index.keys[min(matched)]
+            with self.timed('response'):
+                return self._faq_response(data, key, ranked)
         
         # Check escalation
-        if any(kw in query_lower for kw in self.complex_keywords):
-            self.escalation_count += 1
-            ticket = f"TKT-{hash(query) % 100000:05d}"
+        if escalate:
+            self.escalations.increment()
+            session_id = self.session_id
+            # Without a session two users' identical complaints are only told apart by a nonce
+            nonce = secrets.token_hex(8) if session_id == DEFAULT_SESSION else ''
+            ticket = ticket_number(query, session_id, nonce)
             return {
                 'type': 'escalation',
                 'response': f"⚠️ **Escalating to Support Team**\n\nTicket: {ticket}\n\nYou'll receive an email within 1 hour.",
@@ -52,6 +197,11 @@ class SupportAgent(BaseAgent):
                 'ticket_number': ticket
             }
         
+        # No keyword hit, but the index may still find a confident match
+        if ranked and ranked[0]['score'] >= self.min_score and ranked[0]['terms'] >= self.min_terms:
+            with self.timed('response'):
+                return self._faq_response(data, ranked[0]['key'], ranked)
+        
         # General help
         return {
             'type': 'general',
@@ -3,14 +3,18 @@ AI Agent Hub - Light Theme Version
 """
 
 import streamlit as st
-from agents.support_agent import SupportAgent
-from agents.product_agent import ProductAgent
-from agents.social_agent import SocialAgent
-from agents.analytics_agent import AnalyticsAgent
+from agents.hub import AgentHub, build_default_agents
+from agents.suggestions import SUGGESTIONS
 from datetime import datetime
-import time
-import json
-from utils.summarizer import ConversationSummarizer
+import uuid
+from utils.summarizer import IncrementalSummarizer
+from utils.hot_reload import DataWatcher
+from utils.event_store import EventStore
+from utils.exporter import EXTENSIONS, MIME_TYPES, available_compressions, export_bytes
+
+# Messages rendered in full; older ones are collapsed into a text summary
+RECENT_MESSAGES = 20
+EVENTS_PATH = 'data/events.db'
 
 # Page config
 st.set_page_config(page_title="AI Agent Hub", page_icon="🤖", layout="wide")
@@ -20,18 +24,41 @@ if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'active_agent' not in st.session_state:
     st.session_state.active_agent = 'support'
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'summarizer' not in st.session_state:
+    st.session_state.summarizer = IncrementalSummarizer()
+if 'render_window' not in st.session_state:
+    st.session_state.render_window = RECENT_MESSAGES
+if 'auto_route' not in st.session_state:
+    st.session_state.auto_route = False
 
 # Load agents
 @st.cache_resource
-def load_agents():
-    return {
-        'support': SupportAgent(),
-        'product': ProductAgent(),
-        'social': SocialAgent(),
-        'analytics': AnalyticsAgent()
-    }
+def load_hub():
+    # Events persist across restarts and sessions for the analytics dashboard
+    store = EventStore(EVENTS_PATH).start()
+    # Agents are constructed when first selected, so startup only loads the support agent
+    hub = AgentHub(build_default_agents(store))
+    # Pick up edits to data/*.json without a restart, for each agent once it exists
+    watcher = DataWatcher([]).start()
+    hub.agents.on_build(watcher.watch)
+    return hub
+
+hub = load_hub()
+agents = hub.agents
 
-agents = load_agents()
+def ask_agent(query: str):
+    """Send a query through the hub; returns (response, response_time_ms)"""
+    # With auto-routing the hub picks the agent, and the UI follows its choice
+    agent = None if st.session_state.auto_route else st.session_state.active_agent
+    result = hub.handle_sync(query, agent=agent, session_id=st.session_state.session_id)
+    if result['confidence'] is not None:
+        st.session_state.active_agent = result['agent']
+        st.session_state.route_confidence = result['confidence']
+    if result['ok']:
+        return result['response'], result['latency_ms']
+    return {'type': 'error', 'response': f"⚠️ **Something went wrong**\n\n{result['error']}"}, result['latency_ms']
 
 # Simple CSS for better visibility
 st.markdown("""
@@ -116,10 +143,13 @@ for agent_id, (name, desc, col) in agents_info.items():
             st.session_state.active_agent = agent_id
             st.rerun()
 
+st.toggle("🧭 Auto-route each message to the best agent", key="auto_route")
+
 st.divider()
 
 # Display messages
-for message in st.session_state.messages:
+def render_message(message: dict):
+    """Render one chat message with its sentiment, timing and agent-specific extras"""
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
         
@@ -133,10 +163,17 @@ for message in st.session_state.messages:
         if "data" in message:
             data = message["data"]
             
+            if data.get("corrections"):
+                st.caption("🔤 **Did you mean:** " + ", ".join(
+                    f"~~{typo}~~ {fix}" for typo, fix in data["corrections"].items()))
+            
             # Product recommendations
-            if data.get("type") == "recommendations":
+            if data.get("type") == "recommendations" and data.get("products"):
                 st.divider()
                 st.markdown("### 🛍️ Recommended Products")
+                if data.get("similar_to"):
+                    st.caption(f"🔁 More like **{data['similar_to']}**")
+                reviews = data.get("reviews", {})
                 for product in data.get("products", []):
                     with st.expander(f"**{product['name']}** - ${product['price']}", expanded=True):
                         col_a, col_b = st.columns([2, 1])
@@ -146,6 +183,10 @@ for message in st.session_state.messages:
                         with col_b:
                             st.metric("Price", f"${product['price']}")
                             st.write(f"**Rating:** {'⭐' * int(product.get('rating', 0))}")
+                        review = reviews.get(product.get('id'))
+                        if review:
+                            st.caption(f"💬 **Reviews:** {review['positive_rate']}% positive · "
+                                       f"{review['negative_rate']}% negative ({review['reviews']:,} reviews)")
             
             # Social media content
             elif data.get("type") == "social_content":
@@ -154,6 +195,10 @@ for message in st.session_state.messages:
                 for idea in data.get("ideas", []):
                     st.info(f"**{idea.get('platform', 'Platform')} - {idea.get('type', 'Post')}**\n\n{idea['content']}")
             
+            # Related FAQs
+            elif data.get("type") == "faq" and data.get("alternatives"):
+                st.caption("📚 **Related questions:** " + " · ".join(alt['question'] for alt in data["alternatives"]))
+            
             # Analytics dashboard
             elif data.get("type") == "analytics":
                 st.divider()
@@ -166,21 +211,21 @@ for message in st.session_state.messages:
                     with c1:
                         st.metric("**Total Queries**", metrics['support']['total_queries'])
                     with c2:
-                        st.metric("**Resolved**", metrics['support']['resolved'])
+                        st.metric("**Resolution Rate**", f"{metrics['support']['resolution_rate']}%")
                     with c3:
-                        st.metric("**Avg Response Time**", f"{metrics['support']['avg_response_time']}min")
+                        st.metric("**Escalation Rate**", f"{metrics['support']['escalation_rate']}%")
                     with c4:
-                        st.metric("**Satisfaction**", f"{metrics['support']['satisfaction_rate']}%")
+                        st.metric("**Avg Response Time**", f"{metrics['support']['avg_response_time_ms']}ms")
                 
                 if agent_type in ['all', 'products']:
                     st.markdown("### 🛍️ Product Metrics")
                     c1, c2, c3, c4 = st.columns(4)
                     with c1:
-                        st.metric("**Recommendations**", metrics['products']['recommendations_made'])
+                        st.metric("**Product Queries**", metrics['products']['queries'])
                     with c2:
-                        st.metric("**Conversion Rate**", f"{metrics['products']['conversion_rate']}%")
+                        st.metric("**Recommendations**", metrics['products']['recommendations_made'])
                     with c3:
-                        st.metric("**Avg Order Value**", f"${metrics['products']['avg_order_value']}")
+                        st.metric("**Avg Response Time**", f"{metrics['products']['avg_response_time_ms']}ms")
                     with c4:
                         st.metric("**Top Category**", metrics['products']['top_category'])
                 
@@ -188,32 +233,68 @@ for message in st.session_state.messages:
                     st.markdown("### 📱 Social Media Metrics")
                     c1, c2, c3, c4 = st.columns(4)
                     with c1:
-                        st.metric("**Posts Generated**", metrics['social']['posts_generated'])
+                        st.metric("**Content Requests**", metrics['social']['content_requests'])
                     with c2:
-                        st.metric("**Engagement Rate**", f"{metrics['social']['engagement_rate']}%")
+                        st.metric("**Positive Sentiment**", f"{metrics['social']['positive_rate']}%")
                     with c3:
-                        st.metric("**Reach**", f"{metrics['social']['reach']:,}")
+                        st.metric("**Avg Response Time**", f"{metrics['social']['avg_response_time_ms']}ms")
                     with c4:
                         st.metric("**Best Performing**", metrics['social']['best_performing'])
+                
+                if agent_type in ['all', 'reviews'] and metrics.get('reviews'):
+                    st.markdown("### 💬 Review Sentiment")
+                    c1, c2, c3, c4 = st.columns(4)
+                    with c1:
+                        st.metric("**Reviews Scored**", f"{metrics['reviews']['reviews']:,}")
+                    with c2:
+                        st.metric("**Positive**", f"{metrics['reviews']['positive_rate']}%")
+                    with c3:
+                        st.metric("**Best Category**", metrics['reviews']['best_category'])
+                    with c4:
+                        st.metric("**Worst Category**", metrics['reviews']['worst_category'])
+                elif agent_type == 'reviews':
+                    st.info("No review summary yet. Score a corpus with `python -m utils.reviews reviews.jsonl`.")
             
             if data.get("escalate"):
                 st.warning(f"🎫 **Ticket Created:** {data.get('ticket_number', 'N/A')}")
 
+def render_compact(messages: list):
+    """Older messages as one lightweight text block instead of full widgets"""
+    lines = []
+    for message in messages:
+        icon = '👤' if message['role'] == 'user' else '🤖'
+        text = message['content'].replace('*', '').split('\n', 1)[0]
+        lines.append(f"{icon} {text[:120]}")
+    st.markdown('  \n'.join(lines))
+
+messages = st.session_state.messages
+window = st.session_state.render_window
+older = messages[:-window] if len(messages) > window else []
+if older:
+    with st.expander(f"🕘 {len(older)} earlier messages"):
+        render_compact(older)
+    if st.button(f"⬆️ Show {min(RECENT_MESSAGES, len(older))} more in full", key="show_more"):
+        st.session_state.render_window += RECENT_MESSAGES
+        st.rerun()
+for message in messages[len(older):]:
+    render_message(message)
+
 # Chat input
-if prompt := st.chat_input("💬 Type your message here..."):
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
-    with st.chat_message("assistant"):
-        message_placeholder = st.empty()
-        for msg in ["🤖 Thinking", "🤖 Thinking.", "🤖 Thinking..", "🤖 Thinking..."]:
-            message_placeholder.markdown(msg)
-            time.sleep(0.2)
-        
-        start_time = time.time()
-        response = agents[st.session_state.active_agent].process_query(prompt)
-        response_time = round((time.time() - start_time) * 1000, 2)
-        message_placeholder.markdown(response['response'])
-    
+def answer(query: str):
+    """Add the query and the agent's reply to the chat, showing live status while it runs"""
+    st.session_state.messages.append({"role": "user", "content": query})
+    with st.status("🤖 Thinking...", expanded=False) as status:
+        if st.session_state.auto_route:
+            status.write("Routing to the best agent...")
+        else:
+            status.write(f"Asking {agents_info[st.session_state.active_agent][0]}...")
+        response, response_time = ask_agent(query)
+        if st.session_state.auto_route:
+            status.write(f"Answered by {agents_info[st.session_state.active_agent][0]} "
+                         f"({st.session_state.route_confidence:.0%} confidence)")
+        failed = response.get('type') == 'error'
+        status.update(label=f"{'⚠️ Failed' if failed else '✅ Answered'} in {response_time}ms",
+                      state="error" if failed else "complete")
     st.session_state.messages.append({
         "role": "assistant",
         "content": response['response'],
@@ -222,52 +303,21 @@ if prompt := st.chat_input("💬 Type your message here..."):
     })
     st.rerun()
 
+if prompt := st.chat_input("💬 Type your message here..."):
+    with st.chat_message("user"):
+        st.markdown(prompt)
+    with st.chat_message("assistant"):
+        answer(prompt)
+
 # Suggested queries
 st.divider()
 st.markdown("## 💡 Quick Actions - Try These Queries")
 
-suggestions = {
-    'support': [
-        "📦 What's your return policy?",
-        "🚚 How can I track my order?",
-        "⚠️ This product arrived damaged",
-        "💳 What payment methods do you accept?"
-    ],
-    'product': [
-        "💻 Show me budget electronics",
-        "⭐ Recommend premium products",
-        "👔 What's in the fashion category?",
-        "🔥 Show me top-rated items"
-    ],
-    'social': [
-        "🚀 Create a product launch post",
-        "💬 Give me engagement ideas",
-        "💰 Write a sale promotion",
-        "🎁 Generate contest content"
-    ],
-    'analytics': [
-        "📊 Show overall metrics",
-        "💬 Support agent performance",
-        "🛍️ Product recommendation stats",
-        "📱 Social media engagement"
-    ]
-}
-
 cols = st.columns(2)
-for idx, suggestion in enumerate(suggestions[st.session_state.active_agent]):
+for idx, suggestion in enumerate(SUGGESTIONS[st.session_state.active_agent]):
     with cols[idx % 2]:
         if st.button(suggestion, key=f"quick_{idx}", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": suggestion})
-            start_time = time.time()
-            response = agents[st.session_state.active_agent].process_query(suggestion)
-            response_time = round((time.time() - start_time) * 1000, 2)
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": response['response'],
-                "data": response,
-                "response_time_ms": response_time
-            })
-            st.rerun()
+            answer(suggestion)
 
 # Sidebar
 with st.sidebar:
@@ -282,11 +332,28 @@ with st.sidebar:
         'analytics': '📊 Analytics Dashboard'
     }
     st.metric("🤖 Active Agent", active_names[st.session_state.active_agent])
+    cache_stats = agents[st.session_state.active_agent].cache_stats()
+    if cache_stats:
+        st.caption(f"🗄️ Response cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    
+    agent_metrics = agents[st.session_state.active_agent].metrics_snapshot()
+    if agent_metrics.get('calls'):
+        with st.expander("⏱️ Latency (ms)"):
+            for stage, summary in agent_metrics['stages'].items():
+                st.caption(f"**{stage}** p50 {summary['p50']} · p95 {summary['p95']} · p99 {summary['p99']}")
+            st.caption(f"{agent_metrics['calls']} calls, {agent_metrics['errors']} errors")
+            st.download_button(
+                label="📈 Prometheus metrics",
+                data=hub.prometheus(),
+                file_name="agent_metrics.prom",
+                mime="text/plain",
+                use_container_width=True
+            )
     
     if st.session_state.messages:
         st.divider()
         st.markdown("## 📝 Session Summary")
-        summary = ConversationSummarizer.summarize(st.session_state.messages)
+        summary = st.session_state.summarizer.sync(st.session_state.messages)
         
         st.metric("👤 User Messages", summary['user_messages'])
         st.metric("🤖 Bot Messages", summary['bot_messages'])
@@ -302,29 +369,30 @@ with st.sidebar:
     
     if st.button("🗑️ Clear Chat History", use_container_width=True, type="secondary"):
         st.session_state.messages = []
+        st.session_state.render_window = RECENT_MESSAGES
+        st.session_state.summarizer.reset()
+        for agent in agents.built().values():
+            agent.clear_history(st.session_state.session_id)
         st.rerun()
     
     st.divider()
     st.markdown("## 📥 Export Data")
     
-    if st.button("📄 Export Chat", use_container_width=True):
-        if st.session_state.messages:
-            export_data = {
-                'agent': st.session_state.active_agent,
-                'timestamp': datetime.now().isoformat(),
-                'total_messages': len(st.session_state.messages),
-                'messages': st.session_state.messages
-            }
-            json_str = json.dumps(export_data, indent=2)
-            st.download_button(
-                label="💾 Download JSON",
-                data=json_str,
-                file_name=f"ai_agent_chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json",
-                use_container_width=True
-            )
-        else:
-            st.info("💡 Start a conversation to export!")
+    if st.session_state.messages:
+        compact = st.checkbox("Compact (text only, no response payloads)", value=False)
+        compression = st.selectbox("Compression", available_compressions(), index=0)
+        # Snapshot the list now; the file is generated only when the button is clicked
+        snapshot = list(st.session_state.messages)
+        session_id = st.session_state.session_id
+        st.download_button(
+            label="💾 Download NDJSON",
+            data=lambda: export_bytes(snapshot, compression, compact, session_id),
+            file_name=f"ai_agent_chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}{EXTENSIONS[compression]}",
+            mime=MIME_TYPES[compression],
+            use_container_width=True
+        )
+    else:
+        st.info("💡 Start a conversation to export!")
     
     st.divider()
     st.caption("🤖 AI Agent Hub v1.0")
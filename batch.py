@@ -0,0 +1,179 @@
+"""
+AI Agent Hub - Batch Mode
+
+Replay JSONL queries through the agents on a process pool:
+
+    python batch.py queries.jsonl -o results.jsonl --agent support
+    cat queries.jsonl | python batch.py - --order completion > results.jsonl
+
+Each input line is {"query": "...", "agent": "product", "id": ..., "session_id": ...};
+only "query" is required, and a bare JSON string is also accepted. Results are
+written as JSONL. A throughput and latency report goes to stderr.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.history import session_scope
+from utils.latency_histogram import LatencyHistogram
+
+_agents: Optional[Dict] = None
+
+
+def _init_worker():
+    """Load the agents once per worker process"""
+    global _agents
+    from agents.hub import build_default_agents
+    _agents = build_default_agents()
+
+
+def _process_chunk(chunk: List[Tuple[int, Dict]], default_agent: str) -> List[Dict]:
+    """Run one chunk of (seq, record) pairs in a worker"""
+    results = []
+    for seq, record in chunk:
+        name = record.get('agent') or default_agent
+        result = {'seq': seq, 'id': record.get('id'), 'agent': name, 'query': record.get('query'),
+                  'ok': False, 'response': None, 'error': None, 'latency_ms': 0.0}
+        agent = _agents.get(name)
+        start = time.perf_counter()
+        try:
+            if 'parse_error' in record:
+                raise ValueError(f"Invalid JSON line: {record['parse_error']}")
+            if agent is None:
+                raise KeyError(f"Unknown agent: {name}")
+            if not isinstance(result['query'], str):
+                raise ValueError("Record has no 'query' string")
+            # A record without a session is its own session, so reruns of the file keep their tickets
+            session_id = record.get('session_id')
+            if session_id is None:
+                session_id = f"record-{record['id']}" if record.get('id') is not None else f"line-{seq}"
+            with session_scope(session_id):
+                result['response'] = agent.process_query(result['query'])
+            result['ok'] = True
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        results.append(result)
+    return results
+
+
+def read_records(stream) -> Iterator[Dict]:
+    """Parse input lines lazily; malformed lines become records carrying an error"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {'query': None, 'parse_error': str(e)}
+        if isinstance(record, str):
+            record = {'query': record}
+        elif not isinstance(record, dict):
+            record = {'query': None}
+        yield record
+
+
+def chunked(records: Iterator[Dict], size: int) -> Iterator[List[Tuple[int, Dict]]]:
+    """Number records and group them into chunks"""
+    numbered = enumerate(records)
+    while True:
+        chunk = list(itertools.islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(records: Iterator[Dict], out, default_agent: str = 'support', workers: int = None,
+              chunk_size: int = 256, order: str = 'input', max_pending: int = None) -> Dict:
+    """Fan records out over a process pool and stream results to `out`.
+
+    At most `max_pending` chunks are in flight; in input order, finished
+    chunks wait in a reorder buffer that the same bound also limits. Memory
+    therefore depends on workers and chunk size, not on input length.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    histogram = LatencyHistogram()
+    stats = {'total': 0, 'errors': 0}
+    chunks = chunked(records, chunk_size)
+    start = time.perf_counter()
+
+    def emit(results: List[Dict]):
+        for result in results:
+            stats['total'] += 1
+            if not result['ok']:
+                stats['errors'] += 1
+            histogram.record(result['latency_ms'])
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = {}
+        finished: Dict[int, List[Dict]] = {}
+        next_chunk = 0
+        submitted = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) + len(finished) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(_process_chunk, chunk, default_agent)] = submitted
+                submitted += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if order == 'completion':
+                    emit(future.result())
+                else:
+                    finished[index] = future.result()
+            while next_chunk in finished:
+                emit(finished.pop(next_chunk))
+                next_chunk += 1
+
+    elapsed = time.perf_counter() - start
+    stats['elapsed_s'] = round(elapsed, 3)
+    stats['throughput_qps'] = round(stats['total'] / elapsed, 1) if elapsed else 0.0
+    stats['latency_ms'] = histogram.summary()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay JSONL queries through the agents in parallel")
+    parser.add_argument('input', nargs='?', default='-', help="JSONL file of queries, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL results file, or - for stdout")
+    parser.add_argument('--agent', default='support', help="agent for records without an 'agent' field")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="queries per task sent to a worker")
+    parser.add_argument('--order', choices=['input', 'completion'], default='input')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = run_batch(read_records(source), sink, args.agent, args.workers, args.chunk_size, args.order)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    latency = stats['latency_ms']
+    print(f"Processed {stats['total']:,} queries in {stats['elapsed_s']}s "
+          f"({stats['throughput_qps']:,} q/s), {stats['errors']:,} errors", file=sys.stderr)
+    print(f"Latency ms: p50={latency['p50']} p95={latency['p95']} p99={latency['p99']} "
+          f"max={latency['max']}", file=sys.stderr)
+    return 1 if stats['errors'] and stats['errors'] == stats['total'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Benchmark - Streamlit rerun time against chat session length
+
+Fills st.session_state.messages with real agent replies (product cards,
+analytics grids, social posts, FAQs), then times full script reruns with
+Streamlit's AppTest harness. "windowed" is the app's default of rendering
+only the recent messages in full; "full" renders every message, as the app
+did before.
+
+Run from the repository root:
+    python -m benchmarks.bench_app_rerun --lengths 10 100 500 1000
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.generators import generate_queries
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+SESSION_AGENTS = ('support', 'product', 'social', 'analytics')
+
+
+def build_session(length: int) -> list:
+    """length chat messages, alternating user queries and real agent responses"""
+    from agents.hub import build_default_agents
+    agents = build_default_agents()
+    messages = []
+    for i in range(length // 2):
+        name = SESSION_AGENTS[i % len(SESSION_AGENTS)]
+        query = generate_queries(1, name, seed=i)[0][1]
+        response = agents[name].process_query(query)
+        messages.append({"role": "user", "content": query})
+        messages.append({"role": "assistant", "content": response['response'], "data": response,
+                         "response_time_ms": 1.0})
+    return messages
+
+
+def time_reruns(messages: list, window: int, reruns: int) -> float:
+    """Median seconds per rerun of app.py with the given render window"""
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.session_state['messages'] = messages
+    if window:
+        at.session_state['render_window'] = window
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 100, 500, 1000])
+    parser.add_argument('--reruns', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'messages':>10} {'windowed ms':>12} {'full ms':>10} {'speedup':>8}")
+    for length in args.lengths:
+        messages = build_session(length)
+        windowed = time_reruns(messages, None, args.reruns)
+        full = time_reruns(messages, len(messages) + 1, args.reruns)
+        print(f"{length:>10,} {windowed * 1000:>12.1f} {full * 1000:>10.1f} {full / windowed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
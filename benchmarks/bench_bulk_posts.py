@@ -0,0 +1,61 @@
+"""Benchmark - bulk social post generation over a synthetic catalog
+
+Streams a post for every product x platform from the compiled templates,
+first in this process and then on process pools of increasing size, and
+reports posts/s. Also compares one compiled render with str.format.
+
+Run from the repository root:
+    python -m benchmarks.bench_bulk_posts --products 100000
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.generators import iter_product_records
+from utils.templates import PLATFORMS, CompiledTemplate, TemplateEngine, bulk_generate, product_context
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'social_templates.json')
+
+
+def render_comparison(engine: TemplateEngine, rounds: int = 200_000) -> tuple:
+    """(str.format ns, compiled ns) per render of one template"""
+    source = engine.source['promotional'][0] if 'promotional' in engine.source else '{product} {discount}% off {category}'
+    context = product_context('electronics', {'id': 'X1', 'name': 'Widget', 'features': ['speed'], 'price': 9.5})
+    compiled = CompiledTemplate(source)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        source.format(**context)
+    formatted = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compiled.render(context)
+    rendered = time.perf_counter() - start
+    return formatted / rounds * 1e9, rendered / rounds * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--content-type', default='launch')
+    args = parser.parse_args()
+
+    from agents.social_agent import SocialAgent
+    engine = SocialAgent(TEMPLATES).engine
+
+    formatted, rendered = render_comparison(engine)
+    print(f"single render: str.format {formatted:.0f} ns, compiled {rendered:.0f} ns\n")
+
+    print(f"{'workers':>8} {'posts':>10} {'seconds':>8} {'posts/s':>12}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        posts = 0
+        for _ in bulk_generate(engine, iter_product_records(args.products), args.content_type, PLATFORMS, workers):
+            posts += 1
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {posts:>10,} {elapsed:>8.2f} {posts / elapsed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
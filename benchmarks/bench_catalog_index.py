@@ -0,0 +1,52 @@
+"""Benchmark - ProductAgent catalog index vs flatten-and-sort per query
+
+Run from the repository root:
+    python -m benchmarks.bench_catalog_index [items]
+"""
+
+import sys
+import time
+
+from agents.product_agent import ProductAgent
+from utils.catalog_index import CatalogIndex
+from benchmarks.generators import generate_products
+
+
+def legacy_query(products: dict, query_lower: str) -> list:
+    """The original flatten-and-sort path from ProductAgent.process_query"""
+    all_items = [item for items in products.values() for item in items]
+    if any(word in query_lower for word in ['budget', 'cheap', 'affordable']):
+        return sorted(all_items, key=lambda x: x['price'])[:3]
+    if any(word in query_lower for word in ['premium', 'luxury', 'expensive']):
+        return sorted(all_items, key=lambda x: x['price'], reverse=True)[:3]
+    return sorted(all_items, key=lambda x: x.get('rating', 0), reverse=True)[:3]
+
+
+def mean_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} items...")
+    products = generate_products(count)
+
+    agent = ProductAgent(storage='index')
+    start = time.perf_counter()
+    agent.catalog = CatalogIndex(products)
+    print(f"Index build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print(f"{'query':<28} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>9}")
+    for query in ("show me budget items", "recommend premium products", "top-rated items"):
+        assert [p['id'] for p in legacy_query(products, query)] == \
+               [p['id'] for p in agent.process_query(query)['products']]
+        legacy = mean_ms(lambda: legacy_query(products, query), 2)
+        indexed = mean_ms(lambda: agent.process_query(query), 1000)
+        print(f"{query:<28} {legacy:>10.1f} {indexed:>11.4f} {legacy / indexed:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
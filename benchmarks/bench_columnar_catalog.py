@@ -0,0 +1,49 @@
+"""Benchmark - columnar vs dict catalog: memory and filtered top-k
+
+Run from the repository root:
+    python -m benchmarks.bench_columnar_catalog [items]
+"""
+
+import sys
+import time
+
+from benchmarks.generators import generate_products
+from utils.catalog_index import CatalogIndex
+from utils.columnar_catalog import ColumnarCatalog
+
+FILTERS = {'category': 'home', 'max_price': 100, 'min_rating': 4.5, 'in_stock': True}
+
+
+def mean_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    products = generate_products(count)
+
+    start = time.perf_counter()
+    index = CatalogIndex(products)
+    index_build = time.perf_counter() - start
+    start = time.perf_counter()
+    columnar = ColumnarCatalog.from_products(products)
+    columnar_build = time.perf_counter() - start
+
+    assert [p['id'] for p in index.filter(**FILTERS)] == [p['id'] for p in columnar.filter(**FILTERS)]
+
+    dict_mem = index.memory_usage()
+    col_mem = columnar.memory_usage()
+    print(f"items: {count:,}")
+    print(f"{'backend':<10} {'build ms':>9} {'bytes/item':>11} {'total MB':>9} {'filter ms':>10}")
+    for name, backend, build, mem in (("dict", index, index_build, dict_mem),
+                                      ("columnar", columnar, columnar_build, col_mem)):
+        latency = mean_ms(lambda: backend.filter(**FILTERS), 5)
+        print(f"{name:<10} {build * 1000:>9.0f} {mem['total_bytes'] / count:>11.0f} "
+              f"{mem['total_bytes'] / 1e6:>9.1f} {latency:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark - EventStore write throughput and aggregate query latency
+
+Records synthetic QueryEvents as fast as one producer thread can, waits for
+the background writer to commit them, and reports sustained events/s for a
+few batch sizes. Then times aggregate queries over the resulting table.
+
+Run from the repository root:
+    python -m benchmarks.bench_event_store --events 200000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from benchmarks.generators import CATEGORIES
+from utils.event_store import EventStore
+from utils.events import QueryEvent
+
+AGENTS = ['SupportAgent', 'ProductAgent', 'SocialAgent', 'AnalyticsAgent']
+OUTCOMES = ['faq', 'general', 'escalation', 'recommendations', 'social_content', 'analytics']
+SENTIMENTS = [None, 'Positive', 'Negative', 'Neutral', 'Mixed']
+
+
+def generate_events(count: int, span: float = 7 * 86400, seed: int = 13) -> List[QueryEvent]:
+    """count events spread over the last `span` seconds"""
+    rng = random.Random(seed)
+    now = time.time()
+    return [
+        QueryEvent(now - rng.uniform(0, span), rng.choice(AGENTS), rng.choice(OUTCOMES), rng.random() < 0.1,
+                   rng.choice(SENTIMENTS), rng.uniform(0.05, 20.0),
+                   tuple(f"SYN{rng.randrange(100_000):09d}" for _ in range(rng.randint(0, 3))),
+                   rng.choice(CATEGORIES + [None]))
+        for _ in range(count)
+    ]
+
+
+def write_throughput(path: str, events: List[QueryEvent], batch_size: int) -> tuple:
+    """(enqueue events/s, end-to-end committed events/s)"""
+    store = EventStore(path, batch_size=batch_size, max_queue=len(events) + 1).start()
+    start = time.perf_counter()
+    for event in events:
+        store.record(event)
+    enqueued = time.perf_counter() - start
+    store.flush()
+    committed = time.perf_counter() - start
+    store.close()
+    return len(events) / enqueued, len(events) / committed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=100_000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    events = generate_events(args.events)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'batch':>8} {'enqueue ev/s':>14} {'committed ev/s':>15}")
+        for batch_size in args.batch_sizes:
+            path = os.path.join(directory, f'events_{batch_size}.db')
+            enqueue_rate, commit_rate = write_throughput(path, events, batch_size)
+            print(f"{batch_size:>8,} {enqueue_rate:>14,.0f} {commit_rate:>15,.0f}")
+
+        store = EventStore(os.path.join(directory, f'events_{args.batch_sizes[-1]}.db'))
+        now = time.time()
+        queries = [
+            ('last hour by agent', dict(start=now - 3600, group_by='agent')),
+            ('last day by category', dict(start=now - 86400, group_by='category')),
+            ('all by agent+sentiment', dict(group_by=('agent', 'sentiment'))),
+            ('all by hour', dict(group_by='hour')),
+        ]
+        print(f"\n{'query':<26} {'groups':>8} {'ms':>9}")
+        for label, kwargs in queries:
+            start = time.perf_counter()
+            rows = store.aggregate(**kwargs)
+            print(f"{label:<26} {len(rows):>8,} {(time.perf_counter() - start) * 1000:>9.1f}")
+        start = time.perf_counter()
+        store.totals(start=now - 86400)
+        print(f"{'totals (last day)':<26} {'':>8} {(time.perf_counter() - start) * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark - chat export: one json.dumps string vs streaming NDJSON
+
+Builds a session of real agent replies and exports it the old way (one
+indented JSON string) and with the streaming exporter in each mode,
+reporting time, output size and peak traced memory.
+
+Run from the repository root:
+    python -m benchmarks.bench_export --messages 20000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_app_rerun import build_session
+from utils.exporter import available_compressions, export_messages
+
+
+def measure(fn) -> tuple:
+    """(seconds, peak traced MB) of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=10_000)
+    args = parser.parse_args()
+
+    messages = build_session(args.messages)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'mode':<24} {'seconds':>8} {'size MB':>9} {'peak MB':>9}")
+
+        def legacy():
+            with open(os.path.join(directory, 'legacy.json'), 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'messages': messages}, indent=2))
+
+        elapsed, peak = measure(legacy)
+        size = os.path.getsize(os.path.join(directory, 'legacy.json')) / 1e6
+        print(f"{'json.dumps indent=2':<24} {elapsed:>8.2f} {size:>9.1f} {peak:>9.1f}")
+
+        for compact in (False, True):
+            for compression in available_compressions():
+                path = os.path.join(directory, f"export_{compact}_{compression}")
+                elapsed, peak = measure(lambda: export_messages(messages, path, compression, compact))
+                label = f"{'compact' if compact else 'full'} {compression}"
+                print(f"{label:<24} {elapsed:>8.2f} {os.path.getsize(path) / 1e6:>9.1f} {peak:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
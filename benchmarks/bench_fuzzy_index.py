@@ -0,0 +1,92 @@
+"""Benchmark - typo-tolerant lookup: trigram FuzzyIndex vs brute-force edit distance
+
+Indexes synthetic vocabularies of growing size and looks up misspelled
+words (one deletion, insertion, substitution or swap each) plus words that
+match nothing. Reports mean and p99 lookup latency, how often the intended
+word comes back first and how often it is at least among the closest words
+(a typo is often as close to another word, e.g. "blai" to "balai" and
+"bilai"), and the brute-force scan over the whole vocabulary for comparison
+(skipped above --brute-max terms). Exits non-zero when the p99 at the
+largest size misses the target.
+
+Run from the repository root:
+    python -m benchmarks.bench_fuzzy_index --sizes 1000 10000 100000 --target-us 1000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.generators import generate_vocabulary, make_typo
+from utils.fuzzy_index import FuzzyIndex, default_max_distance, edit_distance
+
+
+def brute_force(words, word: str):
+    """Closest word by scanning the whole vocabulary"""
+    limit = default_max_distance(word)
+    best = None
+    for candidate in words:
+        distance = edit_distance(word, candidate, limit)
+        if distance <= limit and (best is None or distance < best[1]):
+            best = (candidate, distance)
+    return best[0] if best else None
+
+
+def latencies(fn, queries):
+    """Per-call latency in microseconds"""
+    result = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        result.append((time.perf_counter() - start) * 1e6)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--queries', type=int, default=2_000)
+    parser.add_argument('--brute-max', type=int, default=10_000)
+    parser.add_argument('--target-us', type=float, default=1_000.0,
+                        help="budget for the p99 lookup latency at the largest size")
+    args = parser.parse_args(argv)
+
+    print(f"{'terms':>8} {'build s':>8} {'mean us':>8} {'p99 us':>8} {'hit %':>6} {'close %':>7} {'brute us':>9}")
+    p99 = 0.0
+    for size in args.sizes:
+        rng = random.Random(size)
+        words = generate_vocabulary(size)
+        start = time.perf_counter()
+        index = FuzzyIndex((word, i) for i, word in enumerate(words))
+        build = time.perf_counter() - start
+
+        targets = rng.sample(words, args.queries // 2)
+        typos = [make_typo(rng, word) for word in targets]
+        misses = [''.join(rng.choices('qxzjkvw', k=rng.randint(4, 10))) for _ in range(args.queries // 2)]
+        queries = typos + misses
+        rng.shuffle(queries)
+
+        times = sorted(latencies(index.best, queries))
+        hits = sum(index.best(typo) == target for typo, target in zip(typos, targets))
+        closest = 0
+        for typo, target in zip(typos, targets):
+            found = index.search(typo, k=len(index))
+            closest += any(word == target and distance == found[0][1] for word, distance in found)
+        brute = ''
+        if size <= args.brute_max:
+            sample = queries[:200]
+            for query in sample:
+                assert (index.best(query) is None) == (brute_force(words, query) is None), query
+            brute = f"{sum(latencies(lambda q: brute_force(words, q), sample)) / len(sample):>9.0f}"
+        p99 = times[int(len(times) * 0.99)]
+        print(f"{size:>8,} {build:>8.2f} {sum(times) / len(times):>8.1f} {p99:>8.1f} "
+              f"{100 * hits / len(typos):>6.1f} {100 * closest / len(typos):>7.1f} {brute}")
+
+    verdict = 'within' if p99 <= args.target_us else 'over'
+    print(f"\np99 at {args.sizes[-1]:,} terms {p99:.1f} us: {verdict} the {args.target_us:.0f} us target")
+    return 0 if p99 <= args.target_us else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
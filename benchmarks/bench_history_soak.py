@@ -0,0 +1,53 @@
+"""Benchmark - conversation history memory under a long soak
+
+Appends messages from many sessions to one agent's history and samples
+traced memory along the way. With bounded history the samples level off
+once every session is full, instead of growing with the message count.
+
+Run from the repository root:
+    python -m benchmarks.bench_history_soak --messages 2000000 --sessions 5000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmarks.generators import generate_texts
+from utils.history import SessionHistory
+
+
+def soak(history: SessionHistory, messages: int, sessions: int, samples: int = 10) -> list:
+    """Append messages spread at random over sessions; return (appended, traced MB, appends/s) samples"""
+    texts = generate_texts(1000, words=12)
+    rng = random.Random(1)
+    step = max(1, messages // samples)
+    points = []
+    start = time.perf_counter()
+    for i in range(1, messages + 1):
+        history.append('user' if i % 2 else 'assistant', f"{texts[i % len(texts)]} #{i}", rng.randrange(sessions))
+        if i % step == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            points.append((i, current / 1e6, i / (time.perf_counter() - start)))
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--sessions', type=int, default=1_000)
+    parser.add_argument('--capacity', type=int, default=100)
+    parser.add_argument('--max-sessions', type=int, default=1_000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    history = SessionHistory(args.capacity, args.max_sessions)
+    print(f"{'appended':>12} {'traced MB':>10} {'appends/s':>12}")
+    for appended, mb, rate in soak(history, args.messages, args.sessions):
+        print(f"{appended:>12,} {mb:>10.1f} {rate:>12,.0f}")
+    _, peak = tracemalloc.get_traced_memory()
+    print(f"peak traced: {peak / 1e6:.1f} MB; {history.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark - IntentRouter accuracy and latency
+
+Checks routing accuracy on the labeled UI quick actions (agents/suggestions.py)
+and on noisy synthetic variations of them, then times one route() against
+scanning every agent's keyword list with `keyword in query`.
+
+Run from the repository root:
+    python -m benchmarks.bench_intent_router --queries 5000
+"""
+
+import argparse
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+from agents.router import IntentRouter
+from agents.suggestions import SUGGESTIONS
+from benchmarks.generators import generate_queries
+
+
+def accuracy(route: Callable[[str], str], labeled: List[Tuple[str, str]]) -> Tuple[float, Counter]:
+    """(share routed to the labeled agent, Counter of (expected, got) misses)"""
+    misses = Counter()
+    for expected, query in labeled:
+        got = route(query)
+        if got != expected:
+            misses[(expected, got)] += 1
+    return 1 - sum(misses.values()) / len(labeled), misses
+
+
+def scan_route(vocabularies: Dict[str, List[str]]) -> Callable[[str], str]:
+    """Baseline: count substring hits of every keyword of every agent, one list after another"""
+    def route(query: str) -> str:
+        query_lower = query.lower()
+        scores = {name: sum(1 for keyword in keywords if keyword in query_lower)
+                  for name, keywords in vocabularies.items()}
+        return max(scores, key=scores.get)
+    return route
+
+
+def per_call_us(fn: Callable[[str], object], queries: List[str], rounds: int = 5) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for query in queries:
+            fn(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=5_000)
+    args = parser.parse_args()
+
+    from agents.hub import build_default_agents
+    agents = build_default_agents()
+    vocabularies = {name: agent.intent_vocabulary() for name, agent in agents.items()}
+    start = time.perf_counter()
+    router = IntentRouter(vocabularies, 'support')
+    print(f"compiled {len(router)} terms for {len(vocabularies)} agents in "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+    suggestions = [(name, query) for name, queries in SUGGESTIONS.items() for query in queries]
+    noisy = generate_queries(args.queries)
+    scan = scan_route(vocabularies)
+    print(f"{'router':<10} {'quick actions':>14} {'noisy':>8} {'us/query':>9}")
+    for label, route in (('intent', lambda q: router.route(q)[0]), ('scan', scan)):
+        exact, misses = accuracy(route, suggestions)
+        noisy_accuracy, _ = accuracy(route, noisy)
+        print(f"{label:<10} {exact:>13.1%} {noisy_accuracy:>8.1%} {per_call_us(route, [q for _, q in noisy]):>9.2f}")
+        for (expected, got), count in misses.items():
+            print(f"  missed: {count} {expected} -> {got}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark - review sentiment pipeline: analyze() per line vs streaming chunks on a process pool
+
+Writes a synthetic JSONL review corpus over a synthetic catalog, then
+scores it three ways, reporting reviews/s and the parent's max RSS so far:
+
+- the old way: read every line and call SentimentAnalyzer.analyze on it
+- ReviewPipeline in this process (workers=1)
+- ReviewPipeline on a process pool
+
+Also checks resumability: scoring the first half, appending the rest and
+resuming from the checkpoint must give the same summary as one full run.
+
+Run from the repository root:
+    python -m benchmarks.bench_review_pipeline --reviews 1000000 --products 10000
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+from benchmarks.generators import iter_product_records, write_reviews
+from utils.reviews import ReviewPipeline, parse_line
+from utils.sentiment_analyzer import SentimentAnalyzer
+
+
+def per_line(path: str) -> int:
+    """Baseline: one analyze() call per review, no aggregation"""
+    analyzer = SentimentAnalyzer()
+    count = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            record = parse_line(line)
+            if record is not None:
+                analyzer.analyze(record[2])
+                count += 1
+    return count
+
+
+def comparable(summary: dict) -> dict:
+    return {key: value for key, value in summary.items() if key not in ('generated_at', 'source')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reviews', type=int, default=200_000)
+    parser.add_argument('--products', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=None, help="pool size (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    categories = {item['id']: category for category, item in iter_product_records(args.products)}
+    directory = tempfile.mkdtemp()
+    try:
+        corpus = os.path.join(directory, 'reviews.jsonl')
+        write_reviews(corpus, args.reviews, list(categories))
+        print(f"{args.reviews:,} reviews over {len(categories):,} products "
+              f"({os.path.getsize(corpus) / 1e6:.1f} MB), {os.cpu_count()} CPU(s)")
+        print(f"{'mode':<24} {'seconds':>8} {'reviews/s':>11} {'max RSS MB':>11}")
+
+        def report(label, fn):
+            start = time.perf_counter()
+            count = fn()
+            elapsed = time.perf_counter() - start
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{label:<24} {elapsed:>8.2f} {count / elapsed:>11,.0f} {rss:>11.0f}")
+
+        report('analyze() per line', lambda: per_line(corpus))
+        summaries = {}
+        for label, workers in (('pipeline pool', args.workers), ('pipeline workers=1', 1)):
+            pipeline = ReviewPipeline(categories)
+            report(label, lambda: pipeline.run(corpus, workers=workers, chunk_size=args.chunk_size)['records'])
+            summaries[label] = comparable(pipeline.summary())
+
+        # Resume: half the corpus, then the rest appended
+        checkpoint = os.path.join(directory, 'summary.checkpoint')
+        partial = os.path.join(directory, 'partial.jsonl')
+        with open(corpus, 'rb') as f:
+            lines = f.readlines()
+        with open(partial, 'wb') as f:
+            f.writelines(lines[:len(lines) // 2])
+        ReviewPipeline(categories, checkpoint).run(partial, workers=1, chunk_size=args.chunk_size)
+        with open(partial, 'ab') as f:
+            f.writelines(lines[len(lines) // 2:])
+        resumed = ReviewPipeline(categories, checkpoint)
+        stats = resumed.run(partial, workers=1, chunk_size=args.chunk_size)
+        full = summaries['pipeline workers=1']
+        identical = (comparable(resumed.summary()) == full and summaries['pipeline pool'] == full)
+        print(f"resumed {stats['records']:,} new reviews; summaries identical: {identical}")
+        print(f"summary size: {len(json.dumps(resumed.summary(), separators=(',', ':'))) / 1e3:.0f} KB")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark - SentimentAnalyzer: legacy substring scans vs token lexicon vs NumPy batch
+
+Scores the same synthetic texts with the original 32 `word in text` scans,
+with analyze() per text and with analyze_batch(), reporting texts/s. Also
+prints how each handles a few phrases substring matching gets wrong.
+
+Run from the repository root:
+    python -m benchmarks.bench_sentiment --texts 20000
+"""
+
+import argparse
+import time
+
+from benchmarks.generators import generate_texts
+from utils.lazy_import import optional_module
+from utils.sentiment_analyzer import SentimentAnalyzer
+
+LEGACY_POSITIVE = [
+    'good', 'great', 'excellent', 'amazing', 'love', 'best',
+    'fantastic', 'wonderful', 'awesome', 'perfect', 'happy',
+    'satisfied', 'impressed', 'recommend', 'helpful', 'thank'
+]
+LEGACY_NEGATIVE = [
+    'bad', 'terrible', 'worst', 'hate', 'awful', 'horrible',
+    'disappointed', 'angry', 'frustrated', 'broken', 'defective',
+    'useless', 'damaged', 'poor', 'complaint', 'refund'
+]
+
+PHRASES = ["goodbye", "not good", "this is not bad at all", "I don't love it", "really really helpful"]
+
+
+def legacy_analyze(text: str) -> str:
+    """The original classification: count substring hits of each word list"""
+    text_lower = text.lower()
+    positive = sum(1 for word in LEGACY_POSITIVE if word in text_lower)
+    negative = sum(1 for word in LEGACY_NEGATIVE if word in text_lower)
+    if positive == negative:
+        return 'Neutral' if positive == 0 else 'Mixed'
+    return 'Positive' if positive > negative else 'Negative'
+
+
+def texts_per_second(fn, texts, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--texts', type=int, default=20_000)
+    parser.add_argument('--words', type=int, nargs='+', default=[10, 20, 100])
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer()
+    print(f"{'words':>6} {'legacy t/s':>12} {'analyze t/s':>12} {'batch t/s':>12} {'agree':>7}")
+    for words in args.words:
+        texts = generate_texts(args.texts, words=words)
+        legacy = texts_per_second(lambda ts: [legacy_analyze(t) for t in ts], texts)
+        single = texts_per_second(lambda ts: [analyzer.analyze(t) for t in ts], texts)
+        batch = texts_per_second(analyzer.analyze_batch, texts)
+        agree = sum(legacy_analyze(t) == r['sentiment'] for t, r in zip(texts, analyzer.analyze_batch(texts)))
+        print(f"{words:>6} {legacy:>12,.0f} {single:>12,.0f} {batch:>12,.0f} {agree / len(texts):>7.1%}")
+    if optional_module('numpy') is None:
+        print("(numpy not installed: analyze_batch ran per text)")
+
+    print(f"\n{'phrase':<26} {'legacy':<10} {'lexicon':<10}")
+    for phrase in PHRASES:
+        print(f"{phrase:<26} {legacy_analyze(phrase):<10} {analyzer.analyze(phrase)['sentiment']:<10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark - cold start: import time per module and time to the first response
+
+Every measurement runs in a fresh interpreter, so nothing is already
+imported or cached. Prints the cumulative import time of each module the
+app loads (from python -X importtime), then the time from the first import
+to the support agent's first answer (what a user waits for on a cold app,
+streamlit itself aside) and each other agent's first answer after it.
+Exits non-zero when the median time to the first response misses the
+target.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --repeat 5 --target-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# What app.py imports, heaviest suspects first; streamlit is reported but not part of the target
+MODULES = ['streamlit', 'numpy', 'agents.hub', 'agents.support_agent', 'agents.product_agent',
+           'agents.social_agent', 'agents.analytics_agent', 'utils.reviews', 'utils.event_store',
+           'utils.exporter', 'utils.summarizer']
+
+FIRST_QUERIES = {
+    'support': "How do I track my order?",
+    'product': "Recommend headphones under $100",
+    'social': "Write a post about our new headphones",
+    'analytics': "Show me today's analytics summary",
+}
+
+PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "from agents.hub import AgentHub\n"
+    "imported = time.perf_counter()\n"
+    "queries = json.loads(sys.argv[1])\n"
+    "hub = AgentHub()\n"
+    "result = hub.handle_sync(queries['support'], agent='support')\n"
+    "first = time.perf_counter()\n"
+    "timings = {'import_ms': (imported - start) * 1000, 'first_response_ms': (first - start) * 1000,\n"
+    "           'numpy_loaded': 'numpy' in sys.modules, 'built': list(hub.agents.built()), 'ok': result['ok']}\n"
+    "for name, query in queries.items():\n"
+    "    if name != 'support':\n"
+    "        begin = time.perf_counter()\n"
+    "        timings['ok'] &= hub.handle_sync(query, agent=name)['ok']\n"
+    "        timings[f'{name}_first_ms'] = (time.perf_counter() - begin) * 1000\n"
+    "hub.close()\n"
+    "print(json.dumps(timings))\n"
+)
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of each module imported by `import module`"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {}
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def cold_start(repeat: int = 3) -> List[Dict]:
+    """Timings of the probe in repeat fresh interpreters"""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-c', PROBE, json.dumps(FIRST_QUERIES)],
+                                   capture_output=True, text=True, check=True)
+        runs.append(json.loads(completed.stdout.splitlines()[-1]))
+    return runs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=150.0,
+                        help="budget for the median time from first import to first response")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<28} {'import ms':>10}")
+    for module in MODULES:
+        times = import_times(module)
+        shown = f"{times[module] / 1000:>10.1f}" if module in times else f"{'missing':>10}"
+        print(f"{module:<28} {shown}")
+
+    runs = cold_start(args.repeat)
+    print(f"\n{'cold start (median of ' + str(len(runs)) + ')':<28} {'ms':>10}")
+    for key in ['import_ms', 'first_response_ms'] + [f'{name}_first_ms' for name in FIRST_QUERIES if name != 'support']:
+        print(f"{key:<28} {statistics.median(run[key] for run in runs):>10.1f}")
+    print(f"agents built for the first response: {', '.join(runs[0]['built'])}; "
+          f"numpy loaded: {runs[0]['numpy_loaded']}")
+    if not all(run['ok'] for run in runs):
+        print("some probe queries failed")
+        return 1
+
+    median = statistics.median(run['first_response_ms'] for run in runs)
+    verdict = 'within' if median <= args.target_ms else 'over'
+    print(f"\nfirst response {median:.1f} ms: {verdict} the {args.target_ms:.0f} ms target")
+    return 0 if median <= args.target_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
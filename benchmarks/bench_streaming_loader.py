@@ -0,0 +1,96 @@
+"""Benchmark - streaming vs json.load product ingest (peak memory and time)
+
+Generates a synthetic products.json and products.ndjson of the requested
+size, then loads each in a fresh subprocess so peak RSS is measured in
+isolation. Use --size-mb 2048 or more for multi-GB runs.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming_loader --size-mb 200
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.generators import CATEGORIES, make_product
+
+LOADERS = {
+    'json.load': (
+        "import json\n"
+        "from utils.columnar_catalog import ColumnarCatalog\n"
+        "with open(PATH, encoding='utf-8') as f:\n"
+        "    catalog = ColumnarCatalog.from_products(json.load(f))\n"
+    ),
+    'streaming': (
+        "from agents.product_agent import ProductAgent\n"
+        "catalog = ProductAgent(storage='columnar', data_path=PATH).catalog\n"
+    ),
+}
+
+PROBE = (
+    "import resource, sys, time\n"
+    "PATH = sys.argv[1]\n"
+    "start = time.perf_counter()\n"
+    "{loader}"
+    "elapsed = time.perf_counter() - start\n"
+    "peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(len(catalog), elapsed, peak_kb)\n"
+)
+
+
+def write_fixtures(directory: str, size_mb: int, seed: int = 5) -> tuple:
+    """Write products.json and products.ndjson of roughly size_mb each, streaming"""
+    json_path = os.path.join(directory, 'products.json')
+    ndjson_path = os.path.join(directory, 'products.ndjson')
+    target = size_mb * 1024 * 1024
+    per_category = target // len(CATEGORIES[:8])
+    rng = random.Random(seed)
+    i = 0
+    with open(json_path, 'w', encoding='utf-8') as jf, open(ndjson_path, 'w', encoding='utf-8') as nf:
+        jf.write('{')
+        for c, category in enumerate(CATEGORIES[:8]):
+            jf.write(('\n' if c == 0 else ',\n') + json.dumps(category) + ': [')
+            written = 0
+            while written < per_category:
+                item = make_product(rng, i)
+                encoded = json.dumps(item)
+                jf.write(('\n' if written == 0 else ',\n') + encoded)
+                nf.write(json.dumps({'key': category, 'value': item}) + '\n')
+                written += len(encoded) + 2
+                i += 1
+            jf.write('\n]')
+        jf.write('\n}\n')
+    return json_path, ndjson_path, i
+
+
+def probe(loader: str, path: str) -> tuple:
+    code = PROBE.format(loader=LOADERS[loader])
+    out = subprocess.run([sys.executable, '-c', code, path], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    items, elapsed, peak_kb = out.stdout.split()
+    return int(items), float(elapsed), int(peak_kb) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=200)
+    parser.add_argument('--dir', default=None, help="where to write fixtures (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        json_path, ndjson_path, count = write_fixtures(directory, args.size_mb)
+        file_mb = os.path.getsize(json_path) / 1e6
+        print(f"fixture: {count:,} items, {file_mb:.0f} MB JSON")
+        print(f"{'loader':<20} {'items':>12} {'seconds':>9} {'peak RSS MB':>12}")
+        for loader, path in (('json.load', json_path), ('streaming', json_path), ('streaming', ndjson_path)):
+            items, elapsed, peak_mb = probe(loader, path)
+            label = f"{loader} ({os.path.splitext(path)[1][1:]})"
+            print(f"{label:<20} {items:>12,} {elapsed:>9.1f} {peak_mb:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
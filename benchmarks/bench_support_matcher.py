@@ -0,0 +1,64 @@
+"""Benchmark - SupportAgent FAQ matching vs FAQ count
+
+Run from the repository root:
+    python -m benchmarks.bench_support_matcher
+"""
+
+import time
+
+from agents.support_agent import SupportAgent
+from utils.faq_index import FAQIndex
+from benchmarks.generators import generate_faqs
+
+
+def legacy_match(agent: SupportAgent, query_lower: str):
+    """The original per-FAQ any(kw in query) scan"""
+    for key, faq in agent.faqs.items():
+        if any(kw in query_lower for kw in faq.get('keywords', [])):
+            return key
+    if any(kw in query_lower for kw in agent.complex_keywords):
+        return 'escalation'
+    return None
+
+
+def compiled_match(agent: SupportAgent, query_lower: str):
+    """Single pass over the query using the compiled automata"""
+    data = agent.faq_data
+    matched = data.matcher.labels(query_lower)
+    if matched:
+        return data.index.keys[min(matched)]
+    if agent.escalation_matcher.contains_any(query_lower):
+        return 'escalation'
+    return None
+
+
+def time_per_query(fn, agent, queries, repeat: int = 3) -> float:
+    """Best-of-repeat mean latency in microseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for q in queries:
+            fn(agent, q)
+        best = min(best, (time.perf_counter() - start) / len(queries))
+    return best * 1e6
+
+
+def main():
+    agent = SupportAgent()
+    queries = [
+        "what's your return policy for a damaged item i received last week?",
+        "how can i track my order, it has not arrived and the status is unclear",
+        "hello there, i just wanted to say the service was great",
+    ]
+    print(f"{'faqs':>8} {'legacy us':>12} {'compiled us':>12} {'speedup':>8}")
+    for count in (10, 100, 1_000, 10_000):
+        agent.faq_data = agent._build_faq_data(FAQIndex(generate_faqs(count, random_keywords=True)))
+        for q in queries:
+            assert legacy_match(agent, q) == compiled_match(agent, q)
+        legacy = time_per_query(legacy_match, agent, queries)
+        compiled = time_per_query(compiled_match, agent, queries)
+        print(f"{count:>8} {legacy:>12.1f} {compiled:>12.1f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
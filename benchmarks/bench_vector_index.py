@@ -0,0 +1,72 @@
+"""Benchmark - ProductVectors: TF-IDF build, memory and cosine top-k latency
+
+Builds the term-major TF-IDF matrix over synthetic catalogs and reports
+build time, matrix memory and the parent's max RSS, then times free-text
+searches ("waterproof lightweight") and "more like this" lookups, exact and
+approximate. For the approximate mode, recall is the share of results
+scoring at least the exact k-th score (synthetic products tie a lot), and
+score is its total similarity relative to the exact top k.
+
+Run from the repository root:
+    python -m benchmarks.bench_vector_index --sizes 100000 1000000
+"""
+
+import argparse
+import random
+import resource
+import time
+
+from benchmarks.generators import FEATURES, NOUNS, iter_product_records
+from utils.vector_index import ProductVectors
+
+
+def latencies(fn, queries):
+    """Per-call latency in milliseconds, and the results"""
+    times, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'products':>10} {'build s':>8} {'matrix MB':>10} {'RSS MB':>8} {'query':<8} {'mode':<7} "
+          f"{'mean ms':>8} {'p99 ms':>8} {'recall':>7} {'score':>6}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        vectors = ProductVectors.from_records(iter_product_records(size))
+        build = time.perf_counter() - start
+        memory = vectors.memory_usage()['total_bytes'] / 1e6
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        rng = random.Random(size)
+        texts = [f"{rng.choice(FEATURES)} {rng.choice(FEATURES)} {rng.choice(NOUNS)}" for _ in range(args.queries)]
+        picked = set(rng.sample(range(size), args.queries))
+        items = [record for row, record in enumerate(iter_product_records(size)) if row in picked]
+        workloads = (
+            ('text', texts, lambda approximate: lambda text: vectors.search(text, args.k, approximate=approximate)),
+            ('similar', items, lambda approximate: lambda record: vectors.similar(*record, args.k, approximate)),
+        )
+        for label, queries, search in workloads:
+            exact_times, exact = latencies(search(False), queries)
+            approx_times, approx = latencies(search(True), queries)
+            hits = sum(sum(score >= b[-1][1] - 1e-6 for _, score in a) for a, b in zip(approx, exact) if b)
+            recall = hits / max(1, sum(len(b) for b in exact))
+            # How similar the approximate results are, relative to the exact ones
+            quality = (sum(score for a in approx for _, score in a)
+                       / max(1e-9, sum(score for b in exact for _, score in b)))
+            for mode, times, mode_recall, mode_quality in (('exact', exact_times, 1.0, 1.0),
+                                                           ('approx', approx_times, recall, quality)):
+                print(f"{size:>10,} {build:>8.2f} {memory:>10.1f} {rss:>8.0f} {label:<8} {mode:<7} "
+                      f"{sum(times) / len(times):>8.2f} {times[int(len(times) * 0.99)]:>8.2f} "
+                      f"{mode_recall:>7.3f} {mode_quality:>6.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Synthetic data generators for benchmarks
+
+Everything is seeded, so the same arguments always produce the same data.
+Writers stream to disk, so large fixtures never need to fit in memory.
+"""
+
+import json
+import random
+import string
+from typing import Dict, Iterator, List, Tuple
+
+from agents.suggestions import SUGGESTIONS
+
+CATEGORIES = [
+    'electronics', 'fashion', 'home', 'sports', 'beauty', 'toys', 'garden', 'books',
+    'grocery', 'automotive', 'office', 'pets', 'music', 'outdoor', 'health', 'baby',
+    'tools', 'jewelry', 'games', 'travel'
+]
+SUBCATEGORIES = ['audio', 'wearable', 'accessories', 'outerwear', 'footwear', 'kitchen', 'decor', 'fitness']
+ADJECTIVES = ['Smart', 'Premium', 'Wireless', 'Portable', 'Classic', 'Ultra', 'Eco', 'Compact', 'Pro', 'Designer']
+NOUNS = ['Earbuds', 'Watch', 'Charger', 'Jacket', 'Sneakers', 'Coffee Maker', 'Lamp', 'Backpack', 'Speaker', 'Blender']
+FEATURES = [
+    'Noise Cancellation', '24hr battery', 'Waterproof', 'GPS tracking', 'Fast charging', 'Slim fit',
+    'Lightweight', 'App-controlled', 'Programmable', 'Auto-clean', 'Breathable mesh', 'LED display'
+]
+FAQ_TOPICS = [
+    'shipping', 'delivery', 'return', 'refund', 'payment', 'invoice', 'warranty', 'tracking',
+    'account', 'password', 'discount', 'coupon', 'gift', 'exchange', 'size', 'stock'
+]
+FILLER = ['please', 'help', 'need', 'know', 'about', 'order', 'item', 'today', 'quickly', 'thanks']
+POSITIVE = ['great', 'love', 'excellent', 'amazing', 'thank you', 'perfect']
+NEGATIVE = ['terrible', 'broken', 'disappointed', 'awful', 'damaged', 'worst']
+
+
+def make_product(rng: random.Random, i: int) -> Dict:
+    """One synthetic product record"""
+    return {
+        'id': f"SYN{i:09d}",
+        'name': f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+        'price': round(rng.uniform(5, 2000), 2),
+        'category': rng.choice(SUBCATEGORIES),
+        'features': rng.sample(FEATURES, 3),
+        'rating': round(rng.uniform(1, 5), 1),
+        'stock': rng.randint(0, 500)
+    }
+
+
+def iter_product_records(count: int, categories: int = 20, seed: int = 11) -> Iterator[Tuple[str, Dict]]:
+    """Stream (category, item) pairs, grouped by category as in products.json"""
+    rng = random.Random(seed)
+    names = CATEGORIES[:categories]
+    per_category, extra = divmod(count, len(names))
+    i = 0
+    for c, category in enumerate(names):
+        for _ in range(per_category + (1 if c < extra else 0)):
+            yield category, make_product(rng, i)
+            i += 1
+
+
+def generate_products(count: int, categories: int = 20, seed: int = 11) -> Dict[str, List[Dict]]:
+    """A {category: [items]} catalog with count items"""
+    products: Dict[str, List[Dict]] = {}
+    for category, item in iter_product_records(count, categories, seed):
+        products.setdefault(category, []).append(item)
+    return products
+
+
+def write_products(path: str, count: int, fmt: str = 'json', categories: int = 20, seed: int = 11) -> int:
+    """Stream a catalog to path as products.json layout or NDJSON; returns items written"""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'ndjson':
+            for category, item in iter_product_records(count, categories, seed):
+                f.write(json.dumps({'key': category, 'value': item}) + '\n')
+                written += 1
+            return written
+        current = None
+        f.write('{')
+        for category, item in iter_product_records(count, categories, seed):
+            if category != current:
+                f.write(('\n' if current is None else '\n],\n') + json.dumps(category) + ': [\n')
+                current = category
+            else:
+                f.write(',\n')
+            f.write(json.dumps(item))
+            written += 1
+        f.write('\n]\n}\n' if current is not None else '}\n')
+    return written
+
+
+def _answer_terms(rng: random.Random, count: int, k: int = 15) -> List[str]:
+    """Answer vocabulary that grows with the corpus, so term frequencies stay Zipf-like"""
+    vocabulary = max(100, count * 5)
+    return [f"term{int(vocabulary ** rng.random())}" for _ in range(k)]
+
+
+def generate_faqs(count: int, seed: int = 7, random_keywords: bool = False) -> Dict[str, Dict]:
+    """count FAQs; keywords come from a topic vocabulary, or random strings if random_keywords"""
+    rng = random.Random(seed)
+    faqs = {}
+    for i in range(count):
+        if random_keywords:
+            keywords = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))) for _ in range(3)]
+        else:
+            keywords = [f"{rng.choice(FAQ_TOPICS)}{i}", rng.choice(FAQ_TOPICS)]
+        topic = keywords[-1]
+        faqs[f"faq_{i}"] = {
+            'question': f"How does {topic} work for {' '.join(rng.sample(FILLER, 2))} case {i}?",
+            'answer': f"{topic.capitalize()}: {rng.choice(FILLER)} {' '.join(_answer_terms(rng, count))}.",
+            'category': topic,
+            'keywords': keywords
+        }
+    return faqs
+
+
+def write_faqs(path: str, count: int, seed: int = 7):
+    """Write a faqs.json of count entries"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(generate_faqs(count, seed), f)
+
+
+def generate_queries(count: int, agent: str = None, seed: int = 3) -> List[Tuple[str, str]]:
+    """(agent, query) pairs mixing the UI quick actions with synthetic variations"""
+    rng = random.Random(seed)
+    agents = [agent] if agent else list(SUGGESTIONS)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(agents)
+        base = rng.choice(SUGGESTIONS[name])
+        extra = ' '.join(rng.sample(FILLER + CATEGORIES[:4] + FAQ_TOPICS[:4], rng.randint(0, 4)))
+        queries.append((name, f"{base} {extra}".strip()))
+    return queries
+
+
+def generate_texts(count: int, words: int = 20, seed: int = 5) -> List[str]:
+    """Customer-style texts with a mix of positive and negative words"""
+    rng = random.Random(seed)
+    vocabulary = FILLER + FAQ_TOPICS + POSITIVE + NEGATIVE
+    return [' '.join(rng.choices(vocabulary, k=words)) for _ in range(count)]
+
+
+def write_reviews(path: str, count: int, product_ids: List[str], words: int = 16, seed: int = 13) -> int:
+    """Stream a review corpus as JSONL about product_ids; every tenth line is a plain-text transcript"""
+    rng = random.Random(seed)
+    vocabulary = FILLER + FAQ_TOPICS + POSITIVE + NEGATIVE + ['not', 'very', 'really']
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            text = ' '.join(rng.choices(vocabulary, k=rng.randint(words // 2, words * 3 // 2)))
+            if i % 10 == 9:
+                f.write(text + '\n')
+            else:
+                f.write(json.dumps({'product_id': rng.choice(product_ids), 'text': text}) + '\n')
+    return count
+
+
+def generate_vocabulary(count: int, seed: int = 17) -> List[str]:
+    """count distinct pronounceable words of 4-12 letters, standing in for product names and keywords"""
+    rng = random.Random(seed)
+    onsets = ['b', 'c', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'w',
+              'br', 'ch', 'cl', 'fr', 'gr', 'pl', 'sh', 'st', 'tr']
+    vowels = ['a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'ou']
+    words = set()
+    while len(words) < count:
+        word = ''.join(rng.choice(onsets) + rng.choice(vowels) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.5:
+            word += rng.choice(['s', 'n', 'r', 'ng', 'x', 'ics'])
+        if 4 <= len(word) <= 12:
+            words.add(word)
+    return sorted(words)
+
+
+def make_typo(rng: random.Random, word: str) -> str:
+    """word with one random deletion, insertion, substitution or adjacent swap"""
+    i = rng.randrange(len(word))
+    kind = rng.choice(['delete', 'insert', 'substitute', 'swap'])
+    if kind == 'delete':
+        return word[:i] + word[i + 1:]
+    if kind == 'insert':
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+    if kind == 'substitute':
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def generate_messages(count: int, seed: int = 9) -> List[Dict]:
+    """Alternating user/assistant messages shaped like st.session_state.messages"""
+    rng = random.Random(seed)
+    sentiments = ['Positive', 'Negative', 'Neutral', 'Mixed']
+    texts = generate_texts(count, words=12, seed=seed)
+    messages = []
+    for i in range(count):
+        if i % 2 == 0:
+            messages.append({'role': 'user', 'content': texts[i]})
+        else:
+            messages.append({
+                'role': 'assistant',
+                'content': 'Here is what I found.',
+                'data': {'type': 'social_content', 'sentiment': {'sentiment': rng.choice(sentiments)}}
+            })
+    return messages
@@ -0,0 +1,329 @@
+"""Benchmark suite - micro and macro benchmarks for every agent and utility
+
+Run from the repository root:
+    python -m benchmarks.run                        # default profile, prints a table
+    python -m benchmarks.run --save-baseline        # write benchmarks/baseline.json
+    python -m benchmarks.run --compare              # flag regressions against the baseline
+    python -m benchmarks.run --compare --repeat 3   # median of three runs, for a noisy machine
+    python -m benchmarks.run --profile full -k product
+
+Results are JSON: {"meta": {...}, "results": {name: {"value", "unit",
+"lower_is_better", ...}}}. Compare mode exits non-zero when any benchmark is
+worse than the baseline by more than --threshold and by more than the noise
+floor of its unit, and lists latency benchmarks whose mean or p99 is far from
+their median. --repeat runs the suite several times and keeps the median.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from benchmarks import generators
+from utils.latency_histogram import LatencyHistogram
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+PROFILES = {
+    'quick': {'products': [1_000, 10_000], 'faqs': [100, 1_000], 'messages': [10, 100], 'min_time': 0.1},
+    'default': {'products': [1_000, 10_000, 100_000], 'faqs': [100, 1_000, 10_000],
+                'messages': [10, 100, 1_000], 'min_time': 0.25},
+    'full': {'products': [1_000, 10_000, 100_000, 1_000_000], 'faqs': [100, 1_000, 10_000, 100_000],
+             'messages': [10, 100, 1_000, 10_000], 'min_time': 0.5},
+}
+
+# Smallest absolute change counted as a regression, per unit: below this a
+# relative change is timer and scheduler noise (a 2.5 us median moving 1 us is 40%)
+NOISE_FLOORS = {'us': 2.0, 'ms': 10.0}
+
+# A mean or p99 this many times the median means a few calls stalled
+OUTLIER_RATIO = 10.0
+
+
+def time_calls(fn: Callable, inputs: List, min_time: float, min_calls: int = 50) -> Dict:
+    """Call fn over inputs (cycling) for at least min_time; median per-call latency in microseconds"""
+    histogram = LatencyHistogram(min_value=0.01, max_value=1e8)
+    perf = time.perf_counter
+    calls = 0
+    deadline = perf() + min_time
+    while calls < min_calls or perf() < deadline:
+        for item in inputs:
+            start = perf()
+            fn(item)
+            histogram.record((perf() - start) * 1e6)
+            calls += 1
+        if not inputs:
+            break
+    summary = histogram.summary()
+    # The median is the compared value: it is far less sensitive to scheduler noise than the mean
+    return {'value': summary['p50'], 'unit': 'us', 'lower_is_better': True,
+            'mean': summary['mean'], 'p99': summary['p99'], 'max': summary['max'], 'calls': calls}
+
+
+def time_once(fn: Callable) -> Dict:
+    """Wall time of a single call in milliseconds"""
+    start = time.perf_counter()
+    fn()
+    return {'value': round((time.perf_counter() - start) * 1000, 3), 'unit': 'ms', 'lower_is_better': True}
+
+
+def uncached(agent):
+    """Disable the response cache so micro benchmarks measure real work"""
+    agent.response_cache = None
+    return agent
+
+
+def run_suite(profile: Dict, selected: str = None) -> Dict[str, Dict]:
+    from agents.support_agent import SupportAgent
+    from agents.product_agent import ProductAgent
+    from agents.social_agent import SocialAgent
+    from agents.analytics_agent import AnalyticsAgent
+    from agents.hub import AgentHub, build_default_agents
+    from agents.router import IntentRouter
+    from utils.sentiment_analyzer import SentimentAnalyzer
+    from utils.summarizer import ConversationSummarizer, IncrementalSummarizer
+    from utils.metrics import AgentMetrics
+    from utils.history import SessionHistory
+    from utils.events import EventAggregator, QueryEvent
+
+    results: Dict[str, Dict] = {}
+    min_time = profile['min_time']
+
+    def record(name: str, thunk: Callable[[], Dict]):
+        if selected and selected not in name:
+            return
+        results[name] = thunk()
+        print(f"  {name:<48} {results[name]['value']:>12.3f} {results[name]['unit']}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        support_queries = [q for _, q in generators.generate_queries(200, 'support')]
+        for count in profile['faqs']:
+            path = os.path.join(tmp, f'faqs_{count}.json')
+            generators.write_faqs(path, count)
+            holder = {}
+            record(f"load.support[faqs={count}]", lambda: time_once(lambda: holder.setdefault('agent', SupportAgent(data_path=path))))
+            agent = uncached(holder.get('agent') or SupportAgent(data_path=path))
+            record(f"support.process_query[faqs={count}]", lambda: time_calls(agent.process_query, support_queries, min_time))
+
+        product_queries = [q for _, q in generators.generate_queries(200, 'product')]
+        feature_queries = [f"{a} {b}" for a, b in zip(generators.FEATURES, reversed(generators.FEATURES))]
+        for count in profile['products']:
+            path = os.path.join(tmp, f'products_{count}.json')
+            generators.write_products(path, count)
+            holder = {}
+            record(f"load.product[items={count}]", lambda: time_once(lambda: holder.setdefault('agent', ProductAgent(data_path=path))))
+            agent = uncached(holder.get('agent') or ProductAgent(data_path=path))
+            record(f"product.process_query[items={count}]", lambda: time_calls(agent.process_query, product_queries, min_time))
+            record(f"vectors.search[items={count}]",
+                   lambda: time_calls(agent.vector_index().search, feature_queries, min_time))
+
+        social = uncached(SocialAgent(product_agent=agent))
+        social_queries = [q for _, q in generators.generate_queries(200, 'social')]
+        record("social.process_query", lambda: time_calls(social.process_query, social_queries, min_time))
+
+        def bulk_posts() -> Dict:
+            from utils.templates import bulk_generate
+            start = time.perf_counter()
+            posts = sum(1 for _ in bulk_generate(social.engine, generators.iter_product_records(10_000), workers=1))
+            return {'value': round(posts / (time.perf_counter() - start), 1), 'unit': 'posts/s', 'lower_is_better': False}
+
+        record("templates.bulk_generate[products=10000]", bulk_posts)
+
+        analytics = uncached(AnalyticsAgent())
+        analytics_queries = [q for _, q in generators.generate_queries(200, 'analytics')]
+        record("analytics.process_query", lambda: time_calls(analytics.process_query, analytics_queries, min_time))
+
+        analyzer = SentimentAnalyzer()
+        mixed_texts = [q for _, q in generators.generate_queries(200)]
+        record("sentiment.analyze[queries]", lambda: time_calls(analyzer.analyze, mixed_texts, min_time))
+        for words in (10, 100):
+            texts = generators.generate_texts(200, words=words)
+            record(f"sentiment.analyze[words={words}]", lambda: time_calls(analyzer.analyze, texts, min_time))
+            record(f"sentiment.analyze_batch[texts=1000,words={words}]",
+                   lambda: time_calls(analyzer.analyze_batch, [texts * 5], min_time, min_calls=5))
+
+        def fuzzy_lookups() -> Dict:
+            import random
+            from utils.fuzzy_index import FuzzyIndex
+            words = generators.generate_vocabulary(100_000)
+            index = FuzzyIndex((word, i) for i, word in enumerate(words))
+            rng = random.Random(3)
+            typos = [generators.make_typo(rng, word) for word in rng.sample(words, 500)]
+            return time_calls(index.best, typos, min_time)
+
+        record("fuzzy.best[terms=100000]", fuzzy_lookups)
+
+        for count in profile['messages']:
+            messages = generators.generate_messages(count)
+            record(f"summarizer.summarize[messages={count}]",
+                   lambda: time_calls(ConversationSummarizer.summarize, [messages], min_time, min_calls=5))
+            incremental = IncrementalSummarizer(messages)
+            record(f"summarizer.incremental[messages={count}]",
+                   lambda: time_calls(lambda m: (incremental.add(m), incremental.summary()), messages[:100], min_time))
+
+        history = SessionHistory(capacity=100, max_sessions=1_000)
+        sessions = [f"session-{i}" for i in range(2_000)]
+        record("history.append", lambda: time_calls(lambda s: history.append('user', 'hello', s), sessions, min_time))
+
+        aggregator = EventAggregator()
+        now = time.time()
+        events = [QueryEvent(now - i * 37.0, f"Agent{i % 4}", 'faq', i % 9 == 0, None, 1.5, ('P1',), 'shipping')
+                  for i in range(1_000)]
+        record("events.record", lambda: time_calls(aggregator.record, events, min_time))
+        record("events.totals[hour]", lambda: time_calls(aggregator.totals, ['hour'], min_time))
+
+        telemetry = AgentMetrics('bench')
+
+        def timed_noop(_):
+            with telemetry.timed('noop'):
+                pass
+
+        record("metrics.timed_overhead", lambda: time_calls(timed_noop, [None] * 100, min_time))
+
+        router = IntentRouter.from_agents(build_default_agents())
+        mixed_queries = [q for _, q in generators.generate_queries(200)]
+        record("router.route", lambda: time_calls(router.route, mixed_queries, min_time))
+
+        def hub_throughput() -> Dict:
+            hub = AgentHub()
+            mixed = generators.generate_queries(2_000)
+
+            async def drive():
+                return await asyncio.gather(*(hub.handle(q, a) for a, q in mixed))
+
+            start = time.perf_counter()
+            outcomes = asyncio.run(drive())
+            elapsed = time.perf_counter() - start
+            hub.close()
+            return {'value': round(len(mixed) / elapsed, 1), 'unit': 'qps', 'lower_is_better': False,
+                    'errors': sum(1 for o in outcomes if not o['ok'])}
+
+        record("hub.handle[mixed=2000]", hub_throughput)
+
+        def store_throughput() -> Dict:
+            from benchmarks.bench_event_store import generate_events, write_throughput
+            _, committed = write_throughput(os.path.join(tmp, 'events.db'), generate_events(20_000), 1000)
+            return {'value': round(committed, 1), 'unit': 'events/s', 'lower_is_better': False}
+
+        record("event_store.commit[events=20000]", store_throughput)
+
+        def first_response() -> Dict:
+            from benchmarks.bench_startup import cold_start
+            runs = cold_start(repeat=3)
+            return {'value': round(statistics.median(run['first_response_ms'] for run in runs), 3), 'unit': 'ms',
+                    'lower_is_better': True, 'numpy_loaded': runs[0]['numpy_loaded']}
+
+        record("startup.first_response", first_response)
+
+    return results
+
+
+def combine_runs(runs: List[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """One result per benchmark from repeated suite runs: the median of each statistic, the largest max"""
+    if len(runs) == 1:
+        return runs[0]
+    combined = {}
+    for name, first in runs[0].items():
+        samples = [run[name] for run in runs if name in run]
+        result = dict(first)
+        for key, value in first.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values = [sample[key] for sample in samples]
+                result[key] = max(values) if key == 'max' else statistics.median(values)
+        result['samples'] = [sample['value'] for sample in samples]
+        combined[name] = result
+    return combined
+
+
+def outliers(result: Dict) -> List[str]:
+    """The statistics of a latency result that are over OUTLIER_RATIO times its median"""
+    median = result.get('value')
+    if not median:
+        return []
+    return [f"{key} {result[key]:.1f}" for key in ('mean', 'p99')
+            if result.get(key, 0) > OUTLIER_RATIO * median]
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Print a comparison table and any outliers; return names that regressed beyond threshold and noise"""
+    regressions = []
+    noted = []
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>9} {'mean':>12} {'p99':>12}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        spread = f"{current.get('mean', 0):>12.3f} {current.get('p99', 0):>12.3f}" if 'mean' in current else ''
+        for source, result in (('baseline', base), ('current', current)):
+            found = outliers(result) if result else []
+            if found:
+                noted.append(f"{name} ({source}): median {result['value']:.1f} {result['unit']}, {', '.join(found)}")
+        if not base or not base.get('value'):
+            print(f"{name:<48} {'-':>12} {current['value']:>12.3f} {'new':>9} {spread}")
+            continue
+        delta = current['value'] - base['value']
+        change = delta / base['value']
+        worse = change > threshold if current['lower_is_better'] else change < -threshold
+        # Changes within the noise floor of the unit are not regressions, however large relatively
+        worse = worse and abs(delta) > NOISE_FLOORS.get(current['unit'], 0.0)
+        flag = '  REGRESSION' if worse else ''
+        print(f"{name:<48} {base['value']:>12.3f} {current['value']:>12.3f} {change:>+8.1%} {spread}{flag}")
+        if worse:
+            regressions.append(name)
+    if noted:
+        print(f"\nOutliers (mean or p99 over {OUTLIER_RATIO:g}x the median):")
+        for line in noted:
+            print(f"  {line}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='default')
+    parser.add_argument('-k', dest='selected', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--output', default=None, help="write results JSON here")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="write results to the baseline file")
+    parser.add_argument('--compare', action='store_true', help="compare against the baseline file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="relative change counted as a regression")
+    parser.add_argument('--repeat', type=int, default=1, help="run the suite this many times and keep the median")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for run in range(max(1, args.repeat)):
+        print(f"Running '{args.profile}' profile ({run + 1}/{max(1, args.repeat)})...", file=sys.stderr)
+        runs.append(run_suite(PROFILES[args.profile], args.selected))
+    results = combine_runs(runs)
+    report = {
+        'meta': {
+            'profile': args.profile,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results
+    }
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Wrote {path}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} and the noise floor", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
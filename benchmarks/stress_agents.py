@@ -0,0 +1,167 @@
+"""Stress test - hundreds of threads sharing one agent set
+
+Mirrors the app under st.cache_resource: one set of agents, many session
+threads calling process_query at once, each inside its own session scope,
+while a background thread keeps hot-reloading the support data. Then
+checks that shared state stayed consistent:
+
+- the escalation counter equals the escalations actually returned
+- every ticket matches ticket_number(query, session), is unique per
+  (query, session) and is the same in processes with other hash seeds
+- each session's history holds exactly its own exchanges, in order
+- call counters and analytics events add up to the calls made
+
+Exits non-zero on any failure. Run from the repository root:
+    python -m benchmarks.stress_agents --threads 256 --queries 40
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from agents.support_agent import ticket_number
+from benchmarks.generators import generate_queries
+from utils.history import session_scope
+
+ESCALATIONS = ["my order arrived damaged", "this is urgent, it's broken", "I want to speak to manager",
+               "the charger is defective", "it is not working at all"]
+
+
+def session_queries(thread: int, count: int) -> List[Tuple[str, str]]:
+    """A thread's (agent, query) workload; every fifth query is a support escalation"""
+    queries = generate_queries(count, seed=thread)
+    for i in range(0, count, 5):
+        queries[i] = ('support', ESCALATIONS[(thread + i) % len(ESCALATIONS)])
+    return queries
+
+
+def tickets_in_subprocess(pairs: List[Tuple[str, str]], hash_seed: str) -> List[str]:
+    """ticket_number for each (query, session) computed by a fresh interpreter with another hash seed"""
+    code = ("import json, sys\nfrom agents.support_agent import ticket_number\n"
+            "print(json.dumps([ticket_number(q, s) for q, s in json.load(sys.stdin)]))")
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+    output = subprocess.run([sys.executable, '-c', code], input=json.dumps(pairs), env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=256)
+    parser.add_argument('--queries', type=int, default=40, help="per thread; at most half the history capacity")
+    parser.add_argument('--reloads', type=int, default=20, help="support data reloads during the run")
+    args = parser.parse_args()
+
+    from agents.hub import build_default_agents
+    agents = build_default_agents()
+    analytics = agents['analytics']
+    support = agents['support']
+    if args.queries * 2 > support.history_capacity:
+        parser.error(f"--queries must be at most {support.history_capacity // 2}")
+
+    barrier = threading.Barrier(args.threads + 1)
+    errors: List[str] = []
+    tickets: Dict[Tuple[str, str], set] = {}
+    escalations = Counter()
+    calls = Counter()
+    results_lock = threading.Lock()
+    escalations_before = support.escalation_count
+    calls_before = {name: agent.metrics_snapshot().get('calls', 0) for name, agent in agents.items()}
+    events_before = analytics.aggregator.events
+
+    def worker(thread: int):
+        session_id = f"stress-{thread}"
+        workload = session_queries(thread, args.queries)
+        seen: List[Tuple[str, str]] = []
+        local_calls = Counter()
+        barrier.wait()
+        try:
+            for name, query in workload:
+                agent = agents[name]
+                with session_scope(session_id):
+                    response = agent.process_query(query)
+                agent.add_to_history('user', query, session_id)
+                agent.add_to_history('assistant', response.get('response', ''), session_id)
+                local_calls[name] += 1
+                if response.get('escalate'):
+                    seen.append((query, response['ticket_number']))
+        except Exception as e:
+            with results_lock:
+                errors.append(f"thread {thread}: {type(e).__name__}: {e}")
+            return
+        with results_lock:
+            calls.update(local_calls)
+            escalations[session_id] = len(seen)
+            for query, ticket in seen:
+                tickets.setdefault((query, session_id), set()).add(ticket)
+
+    def reloader():
+        barrier.wait()
+        for _ in range(args.reloads):
+            support.reload()
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    threads.append(threading.Thread(target=reloader))
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total_calls = sum(calls.values())
+    print(f"{args.threads} threads, {total_calls:,} queries in {elapsed:.2f}s "
+          f"({total_calls / elapsed:,.0f} q/s), {args.reloads} reloads")
+
+    failures = list(errors)
+
+    escalated = sum(escalations.values())
+    if support.escalation_count - escalations_before != escalated:
+        failures.append(f"escalation_count moved by {support.escalation_count - escalations_before}, "
+                        f"but {escalated} escalations were returned")
+
+    for (query, session_id), issued in tickets.items():
+        if issued != {ticket_number(query, session_id)}:
+            failures.append(f"{session_id} got tickets {sorted(issued)} for {query!r}")
+    distinct = {ticket for issued in tickets.values() for ticket in issued}
+    if len(distinct) != len(tickets):
+        failures.append(f"{len(tickets)} (query, session) pairs share only {len(distinct)} ticket ids")
+    pairs = sorted(tickets)[:200]
+    expected = [ticket_number(query, session_id) for query, session_id in pairs]
+    for seed in ('1', '2'):
+        if tickets_in_subprocess(pairs, seed) != expected:
+            failures.append(f"ticket ids differ in a process with PYTHONHASHSEED={seed}")
+
+    for thread in range(args.threads):
+        session_id = f"stress-{thread}"
+        workload = session_queries(thread, args.queries)
+        for name in agents:
+            sent = [query for agent_name, query in workload if agent_name == name]
+            stored = [m.content for m in agents[name].get_history(session_id) if m.role == 'user']
+            if stored != sent:
+                failures.append(f"{name} history for {session_id} has {len(stored)} user messages, sent {len(sent)}")
+                break
+
+    for name, agent in agents.items():
+        made = agent.metrics_snapshot().get('calls', 0) - calls_before[name]
+        if made != calls[name]:
+            failures.append(f"{name} counted {made} calls, {calls[name]} were made")
+    if analytics.aggregator.events - events_before != total_calls:
+        failures.append(f"analytics saw {analytics.aggregator.events - events_before} events, {total_calls} were made")
+
+    print(f"{escalated:,} escalations, {len(distinct):,} distinct tickets, "
+          f"{sum(len(agent.history.session_ids()) for agent in agents.values()):,} session histories")
+    for failure in failures[:20]:
+        print(f"FAIL {failure}")
+    print("OK" if not failures else f"{len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
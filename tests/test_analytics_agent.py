@@ -0,0 +1,48 @@
+"""Tests - AnalyticsAgent report window selection"""
+
+import pytest
+
+from agents.analytics_agent import AnalyticsAgent
+from utils.event_store import EventStore
+
+
+@pytest.mark.parametrize('query, window', [
+    ("Show me all time stats", 'all'),
+    ("all-time metrics", 'all'),
+    ("best day ever", 'all'),
+    ("lifetime kpi", 'all'),
+    ("live dashboard", 'minute'),
+    ("what's happening right now", 'minute'),
+    ("stats for the last hour", 'minute'),
+    ("real-time metrics", 'minute'),
+    ("weekly report", 'day'),
+    ("metrics for the last 30 days", 'day'),
+    ("analytics summary", 'hour'),
+])
+def test_window_words(query, window):
+    assert AnalyticsAgent._window(query.lower())[0] == window
+
+
+@pytest.mark.parametrize('query', [
+    "Show me every metric",
+    "I never see the dashboard",
+    "however the stats look",
+    "I know the kpi",
+    "delivery performance report",
+    "deliveries this period",
+    "time to resolve, all of it",
+])
+def test_window_words_inside_other_words_are_ignored(query):
+    assert AnalyticsAgent._window(query.lower()) == ('hour', 'Last 24 hours')
+
+
+def test_all_time_is_only_claimed_with_the_event_store(tmp_path):
+    report = AnalyticsAgent().process_query("all time stats")
+    assert report['period'] == 'Last 30 days'
+    assert report['response'].endswith("Last 30 days (all-time totals need the event store)")
+    store = EventStore(str(tmp_path / 'events.db'))
+    try:
+        report = AnalyticsAgent(store=store).process_query("all time stats")
+    finally:
+        store.close()
+    assert report['period'] == 'All time' and report['response'].endswith("· All time")
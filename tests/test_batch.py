@@ -0,0 +1,89 @@
+"""Tests - batch mode ordering, error records, exit code and in-flight bound"""
+
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import batch
+
+
+class EchoAgent:
+    def process_query(self, query):
+        return {'response': query.upper()}
+
+
+@pytest.fixture
+def threaded(monkeypatch):
+    """Run chunks on threads against an echo agent, slowing the earliest chunks most"""
+    state = {'submitted': 0, 'out': io.StringIO(), 'peak': 0}
+
+    class Pool(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            state['submitted'] += 1
+            emitted_chunks = len(state['out'].getvalue().splitlines()) // state['chunk_size']
+            state['peak'] = max(state['peak'], state['submitted'] - emitted_chunks)
+            return super().submit(fn, *args)
+
+    process_chunk = batch._process_chunk
+
+    def slow_chunk(chunk, default_agent):
+        time.sleep(max(0.0, 0.02 - 0.002 * chunk[0][0]))
+        return process_chunk(chunk, default_agent)
+
+    monkeypatch.setattr(batch, 'ProcessPoolExecutor', Pool)
+    monkeypatch.setattr(batch, '_init_worker', lambda: None)
+    monkeypatch.setattr(batch, '_agents', {'echo': EchoAgent()})
+    monkeypatch.setattr(batch, '_process_chunk', slow_chunk)
+    return state
+
+
+def run(state, lines, **kwargs):
+    state['chunk_size'] = kwargs.setdefault('chunk_size', 1)
+    stats = batch.run_batch(batch.read_records(io.StringIO('\n'.join(lines))), state['out'],
+                            default_agent='echo', workers=4, **kwargs)
+    return stats, [json.loads(line) for line in state['out'].getvalue().splitlines()]
+
+
+def test_input_order_is_restored_and_completion_order_is_not(threaded):
+    lines = [json.dumps({'query': f"q{i}", 'id': i}) for i in range(10)]
+    stats, results = run(threaded, lines)
+    assert [r['seq'] for r in results] == list(range(10))
+    assert [r['response']['response'] for r in results] == [f"Q{i}" for i in range(10)]
+    assert stats['total'] == 10 and stats['errors'] == 0
+
+    threaded['out'] = io.StringIO()
+    _, results = run(threaded, lines, order='completion')
+    assert sorted(r['seq'] for r in results) == list(range(10))
+    assert [r['seq'] for r in results] != list(range(10))
+
+
+def test_bad_lines_and_unknown_agents_become_error_records(threaded):
+    lines = ['"bare string"', '{not json', '[1, 2]', '{"id": 7}', '{"query": "hi", "agent": "nobody"}', '', '{"query": "ok"}']
+    stats, results = run(threaded, lines)
+    assert [r['ok'] for r in results] == [True, False, False, False, False, True]
+    assert results[0]['response'] == {'response': 'BARE STRING'}
+    assert results[1]['error'].startswith("ValueError: Invalid JSON line")
+    assert results[2]['error'] == "ValueError: Record has no 'query' string"
+    assert results[3]['id'] == 7 and results[3]['error'] == "ValueError: Record has no 'query' string"
+    assert results[4]['error'] == "KeyError: 'Unknown agent: nobody'"
+    assert stats['total'] == 6 and stats['errors'] == 4
+
+
+def test_in_flight_chunks_stay_within_max_pending(threaded):
+    lines = [json.dumps({'query': f"q{i}"}) for i in range(40)]
+    stats, results = run(threaded, lines, chunk_size=2, max_pending=3)
+    assert stats['total'] == 40 and [r['seq'] for r in results] == list(range(40))
+    assert threaded['peak'] <= 3
+
+
+def test_exit_code_is_an_error_only_when_every_record_fails(threaded, tmp_path, capsys):
+    source = tmp_path / 'queries.jsonl'
+    source.write_text('{broken\n{"query": "x", "agent": "nobody"}\n', encoding='utf-8')
+    threaded['chunk_size'] = 256
+    assert batch.main([str(source), '-o', str(tmp_path / 'out.jsonl'), '--agent', 'echo']) == 1
+    source.write_text('{broken\n{"query": "x"}\n', encoding='utf-8')
+    assert batch.main([str(source), '-o', str(tmp_path / 'out.jsonl'), '--agent', 'echo']) == 0
+    assert "1 errors" in capsys.readouterr().err
@@ -0,0 +1,34 @@
+"""Tests - benchmark comparison noise floor, outlier report and repeated runs"""
+
+from benchmarks.run import combine_runs, compare
+
+
+def latency(value, mean=None, p99=None):
+    return {'value': value, 'unit': 'us', 'lower_is_better': True,
+            'mean': value if mean is None else mean, 'p99': value * 2 if p99 is None else p99}
+
+
+def test_regressions_need_the_threshold_and_the_noise_floor(capsys):
+    baseline = {'tiny': latency(2.5), 'slow': latency(100.0), 'qps': {'value': 100.0, 'unit': 'qps', 'lower_is_better': False}}
+    results = {'tiny': latency(3.5), 'slow': latency(140.0), 'qps': {'value': 70.0, 'unit': 'qps', 'lower_is_better': False},
+               'added': latency(1.0)}
+    assert compare(results, baseline, 0.25) == ['slow', 'qps']
+    assert 'new' in capsys.readouterr().out
+
+
+def test_outliers_are_reported_for_baseline_and_current(capsys):
+    baseline = {'stalled': latency(48.0, mean=515_759.0, p99=460.0)}
+    results = {'stalled': latency(50.0, p99=900.0), 'steady': latency(10.0)}
+    assert compare(results, baseline, 0.25) == []
+    out = capsys.readouterr().out
+    assert 'stalled (baseline): median 48.0 us, mean 515759.0' in out
+    assert 'stalled (current): median 50.0 us, p99 900.0' in out
+    assert 'steady (' not in out
+
+
+def test_repeated_runs_keep_the_median():
+    runs = [{'x': dict(latency(value), max=value * 3)} for value in (5.0, 50.0, 6.0)]
+    combined = combine_runs(runs)['x']
+    assert combined['value'] == 6.0 and combined['max'] == 150.0
+    assert combined['samples'] == [5.0, 50.0, 6.0] and combined['unit'] == 'us'
+    assert combine_runs(runs[:1]) is runs[0]
@@ -0,0 +1,94 @@
+"""Tests - CatalogIndex orderings and ColumnarCatalog parity with it"""
+
+import pytest
+
+from benchmarks.generators import generate_products
+from utils.catalog_index import CatalogIndex
+
+PRODUCTS = {
+    'electronics': [
+        {'id': 'E1', 'name': 'Earbuds', 'price': 129.99, 'rating': 4.5, 'stock': 10},
+        {'id': 'E2', 'name': 'Charger', 'price': 45.99, 'rating': 4.5, 'stock': 0},
+        {'id': 'E3', 'name': 'Watch', 'price': 399.99, 'rating': 4.8, 'stock': 3},
+    ],
+    'fashion': [
+        {'id': 'F1', 'name': 'Jacket', 'price': 249.99, 'rating': 4.7, 'stock': 5},
+        {'id': 'F2', 'name': 'Sneakers', 'price': 159.99, 'rating': 4.5, 'stock': 8},
+    ],
+}
+
+
+def ids(items):
+    return [item['id'] for item in items]
+
+
+def test_orderings_match_sorted_over_the_flattened_catalog():
+    index = CatalogIndex(PRODUCTS)
+    flat = [item for items in PRODUCTS.values() for item in items]
+    assert ids(index.cheapest()) == ids(sorted(flat, key=lambda x: x['price'])[:3])
+    assert ids(index.most_expensive()) == ids(sorted(flat, key=lambda x: x['price'], reverse=True)[:3])
+    # Rating ties keep catalog order
+    assert ids(index.top_rated(5)) == ['E3', 'F1', 'E1', 'E2', 'F2']
+
+
+def test_filter_and_lookups():
+    index = CatalogIndex(PRODUCTS)
+    assert ids(index.filter(max_price=200)) == ['E1', 'E2', 'F2']
+    assert ids(index.filter(max_price=200, in_stock=True, sort_by='price')) == ['E1', 'F2']
+    assert ids(index.filter(category='fashion', min_rating=4.6)) == ['F1']
+    assert index.filter(category='garden') == []
+    assert ids(index.in_category('electronics', k=2)) == ['E1', 'E2']
+    assert index.get('F2')['name'] == 'Sneakers'
+    assert index.get('missing') is None
+
+
+@pytest.fixture(scope='module')
+def catalogs():
+    pytest.importorskip('numpy')
+    from utils.columnar_catalog import ColumnarCatalog
+    products = generate_products(20_000, categories=8)
+    # Fields the columns don't cover, and names far longer (and wider) than the rest
+    for n, item in enumerate(item for items in products.values() for item in items):
+        if n % 7 == 0:
+            item['brand'] = f"Brand {n % 13}"
+            item['tags'] = ['sale', str(n)]
+        if n % 1000 == 0:
+            item['name'] = "Édition spéciale — " + "très " * 40 + item['name']
+    return CatalogIndex(products), ColumnarCatalog.from_products(products)
+
+
+def test_columnar_catalog_matches_the_dict_catalog(catalogs):
+    index, columnar = catalogs
+    assert len(columnar) == len(index)
+    assert columnar.categories == index.categories
+    assert columnar.cheapest(10) == index.cheapest(10)
+    assert columnar.most_expensive(10) == index.most_expensive(10)
+    assert columnar.top_rated(10) == index.top_rated(10)
+    for category in index.categories:
+        assert columnar.in_category(category, 5) == index.in_category(category, 5)
+    assert list(columnar.iter_records()) == list(index.iter_records())
+
+
+@pytest.mark.parametrize('filters', [
+    {'max_price': 100},
+    {'min_price': 500, 'max_price': 600, 'sort_by': 'price'},
+    {'min_rating': 4.5, 'in_stock': True, 'k': 10},
+    {'category': 'books', 'max_price': 50},
+    {'category': 'no such category'},
+])
+def test_columnar_filter_matches_the_dict_catalog(catalogs, filters):
+    index, columnar = catalogs
+    assert columnar.filter(**filters) == index.filter(**filters)
+
+
+def test_filter_with_no_room_returns_nothing(catalogs):
+    index, columnar = catalogs
+    for k in (0, -1):
+        assert index.filter(k=k) == columnar.filter(k=k) == []
+
+
+def test_columnar_get_matches_the_dict_catalog(catalogs):
+    index, columnar = catalogs
+    for _, item in list(index.iter_records())[::997]:
+        assert columnar.get(item['id']) == item
+    assert columnar.get('SYN999999999') is None
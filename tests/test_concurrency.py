@@ -0,0 +1,73 @@
+"""Tests - one agent set shared by many session threads (a small benchmarks.stress_agents)"""
+
+import os
+import threading
+from collections import Counter
+
+import pytest
+
+from benchmarks.stress_agents import session_queries
+from utils.history import session_scope
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THREADS = 16
+QUERIES = 20
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    monkeypatch.chdir(ROOT)  # agents read data/ relative to the repository root
+    from agents.hub import build_default_agents
+    return build_default_agents()
+
+
+def test_shared_agents_stay_consistent_under_threads_and_reloads(agents):
+    support, analytics = agents['support'], agents['analytics']
+    names = list(agents)
+    calls_before = {name: agents[name].metrics_snapshot().get('calls', 0) for name in names}
+    events_before = analytics.aggregator.events
+    barrier = threading.Barrier(THREADS + 1)
+    errors, calls, escalations = [], Counter(), []
+    lock = threading.Lock()
+
+    def worker(thread):
+        session_id = f"session-{thread}"
+        barrier.wait()
+        try:
+            for name, query in session_queries(thread, QUERIES):
+                agent = agents[name]
+                with session_scope(session_id):
+                    response = agent.process_query(query)
+                agent.add_to_history('user', query, session_id)
+                agent.add_to_history('assistant', response.get('response', ''), session_id)
+                with lock:
+                    calls[name] += 1
+                    if response.get('escalate'):
+                        escalations.append(response['ticket_number'])
+        except Exception as e:  # collected and asserted on below
+            with lock:
+                errors.append(f"{thread}: {type(e).__name__}: {e}")
+
+    def reloader():
+        barrier.wait()
+        for _ in range(5):
+            support.reload()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    threads.append(threading.Thread(target=reloader))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert support.escalation_count == len(escalations)
+    for name in names:
+        assert agents[name].metrics_snapshot().get('calls', 0) - calls_before[name] == calls[name]
+    assert analytics.aggregator.events - events_before == sum(calls.values())
+    for thread in range(THREADS):
+        session_id = f"session-{thread}"
+        workload = session_queries(thread, QUERIES)
+        for name in names:
+            sent = [query for agent_name, query in workload if agent_name == name]
+            assert [m.content for m in agents[name].get_history(session_id) if m.role == 'user'] == sent
@@ -0,0 +1,88 @@
+"""Tests - streaming JSON and NDJSON record iteration"""
+
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from benchmarks.generators import generate_products, write_products
+from utils.data_loader import iter_json_object, iter_ndjson, iter_records
+
+DOCUMENT = {
+    'numbers': [1, 22, 333, -4.5e3, 0],
+    'text': ["commas, colons: and ]brackets}", "escaped \"quote\" and \\ backslash", "ünïcödé ✓"],
+    'nested': [{'a': [1, {'b': None}]}, {}, []],
+    'empty': [],
+    'scalar': 123456789,
+    'flag': True,
+}
+
+
+@pytest.fixture
+def document_path(tmp_path):
+    path = tmp_path / 'document.json'
+    path.write_text(json.dumps(DOCUMENT, indent=2, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 16, 1 << 16])
+def test_every_chunk_boundary_decodes_the_same_values(document_path, chunk_size):
+    assert dict(iter_json_object(document_path, chunk_size=chunk_size)) == DOCUMENT
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 16])
+def test_nested_streams_array_elements(document_path, chunk_size):
+    pairs = list(iter_json_object(document_path, nested=True, chunk_size=chunk_size))
+    expected = []
+    for key, value in DOCUMENT.items():
+        expected += [(key, element) for element in value] if isinstance(value, list) else [(key, value)]
+    assert pairs == expected
+
+
+def test_empty_object(tmp_path):
+    path = tmp_path / 'empty.json'
+    path.write_text(' { } ')
+    assert list(iter_json_object(str(path))) == []
+
+
+def test_truncated_file_raises(tmp_path):
+    path = tmp_path / 'truncated.json'
+    path.write_text('{"a": [1, 2, ')
+    with pytest.raises(ValueError):
+        list(iter_json_object(str(path), nested=True))
+
+
+def test_large_generated_catalog_streams_in_both_layouts(tmp_path):
+    products = generate_products(5_000, categories=8)
+    expected = [(category, item) for category, items in products.items() for item in items]
+    json_path, ndjson_path = str(tmp_path / 'products.json'), str(tmp_path / 'products.ndjson')
+    assert write_products(json_path, 5_000, categories=8) == 5_000
+    assert write_products(ndjson_path, 5_000, fmt='ndjson', categories=8) == 5_000
+    assert list(iter_records(json_path, nested=True)) == expected
+    assert list(iter_records(ndjson_path)) == expected
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('fmt, nested', [('json', True), ('ndjson', False)])
+def test_streaming_peak_memory_does_not_grow_with_the_file(tmp_path, fmt, nested):
+    path = str(tmp_path / f'products.{fmt}')
+    write_products(path, 50_000, fmt=fmt)
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_records(path, nested=nested))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 50_000
+    # About 10 MB on disk; json.load alone would hold several times that
+    assert peak < 2_000_000 and peak < os.path.getsize(path) / 5
+
+
+def test_ndjson_skips_blank_lines_and_reports_bad_records(tmp_path):
+    path = tmp_path / 'faqs.jsonl'
+    path.write_text('{"key": "a", "value": 1}\n\n{"key": "b", "value": [2]}\n')
+    assert list(iter_ndjson(str(path))) == [('a', 1), ('b', [2])]
+    path.write_text('{"key": "a", "value": 1}\n{"name": "b"}\n')
+    with pytest.raises(ValueError, match=':2:'):
+        list(iter_ndjson(str(path)))
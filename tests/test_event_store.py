@@ -0,0 +1,106 @@
+"""Tests - EventStore persistence and aggregation"""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from utils import exporter
+from utils.event_store import EventStore
+from utils.events import EventAggregator, QueryEvent
+
+NOW = 1_700_000_000.0
+
+EVENTS = [
+    QueryEvent(NOW - 30, 'SupportAgent', 'faq', False, 'Neutral', 2.0, (), 'logistics'),
+    QueryEvent(NOW - 20, 'SupportAgent', 'escalation', True, 'Negative', 4.0, (), None),
+    QueryEvent(NOW - 10, 'ProductAgent', 'recommendations', False, None, 6.0, ('E1', 'E2'), 'electronics'),
+    QueryEvent(NOW - 7200, 'SupportAgent', 'faq', False, 'Positive', 8.0, (), 'payment'),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(str(tmp_path / 'events.db'), flush_interval=0.01).start()
+    for event in EVENTS:
+        store.record(event)
+    store.flush()
+    yield store
+    store.close()
+
+
+def test_events_round_trip(store):
+    assert store.count() == len(EVENTS)
+    assert list(store.iter_events()) == sorted(EVENTS, key=lambda event: event.timestamp)
+    assert [event.timestamp for event in store.iter_events(start=NOW - 60)] == [NOW - 30, NOW - 20, NOW - 10]
+
+
+def test_aggregate_by_agent(store):
+    rows = {row['agent']: row for row in store.aggregate(start=NOW - 60)}
+    support = rows['SupportAgent']
+    assert (support['count'], support['escalations'], support['resolved']) == (2, 1, 1)
+    assert support['avg_latency_ms'] == 3.0 and support['max_latency_ms'] == 4.0
+    assert rows['ProductAgent']['products'] == 2
+
+
+def test_aggregate_by_several_columns(store):
+    rows = store.aggregate(group_by=['agent', 'outcome'])
+    assert {(row['agent'], row['outcome']): row['count'] for row in rows} == {
+        ('SupportAgent', 'faq'): 2, ('SupportAgent', 'escalation'): 1, ('ProductAgent', 'recommendations'): 1}
+    with pytest.raises(ValueError):
+        store.aggregate(group_by='ts; DROP TABLE events')
+
+
+def test_totals_match_the_in_memory_aggregator(store):
+    extra = QueryEvent(NOW - 5, 'SupportAgent', 'faq', False, 'Neutral', 1.0, (), 'logistics')
+    store.record(extra)
+    store.flush()
+    aggregator = EventAggregator()
+    for event in EVENTS[:3] + [extra]:
+        aggregator.record(event)
+    assert store.totals(start=NOW - 60) == aggregator.totals('hour', now=NOW)
+
+
+def test_events_survive_a_restart(store, tmp_path):
+    store.close()
+    reopened = EventStore(str(tmp_path / 'events.db'))
+    assert reopened.count() == len(EVENTS)
+
+
+def test_full_queue_drops_are_counted_across_threads(tmp_path):
+    store = EventStore(str(tmp_path / 'events.db'), max_queue=10)  # no writer, so the queue fills
+    threads = [threading.Thread(target=lambda: [store.record(EVENTS[0]) for _ in range(2_000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.dropped == 8 * 2_000 - 10
+
+
+def test_read_only_store_never_writes(store, tmp_path):
+    store.close()
+    reader = EventStore(str(tmp_path / 'events.db'), read_only=True)
+    assert list(reader.iter_events()) == sorted(EVENTS, key=lambda event: event.timestamp)
+    with pytest.raises(RuntimeError):
+        reader.start()
+    with pytest.raises(sqlite3.OperationalError):
+        reader._reader().execute("DELETE FROM events")
+    with pytest.raises(sqlite3.OperationalError):
+        EventStore(str(tmp_path / 'missing.db'), read_only=True)
+    assert not (tmp_path / 'missing.db').exists()
+
+
+def test_exporter_reads_the_store_read_only(store, tmp_path):
+    store.close()
+    output = tmp_path / 'events.ndjson'
+    assert exporter.main([str(tmp_path / 'events.db'), '-o', str(output)]) == 0
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line['timestamp'] for line in lines] == sorted(event.timestamp for event in EVENTS)
+
+    other = tmp_path / 'other.db'
+    sqlite3.connect(str(other)).execute("CREATE TABLE notes (text TEXT)").connection.close()
+    with pytest.raises(sqlite3.OperationalError):
+        exporter.main([str(other), '-o', str(output)])
+    tables = sqlite3.connect(str(other)).execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    assert tables == [('notes',)]
@@ -0,0 +1,46 @@
+"""Tests - FAQIndex BM25 ranking"""
+
+from utils.faq_index import FAQIndex, stem, tokenize
+
+FAQS = {
+    'shipping': {'question': "What are your shipping options?", 'keywords': ['ship', 'delivery'],
+                 'answer': "Standard shipping takes 5-7 business days, express shipping 2-3."},
+    'return': {'question': "What is your return policy?", 'keywords': ['return', 'refund'],
+               'answer': "Return any item within 30 days for a refund."},
+    'payment': {'question': "What payment methods do you accept?", 'keywords': ['pay', 'credit card'],
+                'answer': "We accept credit cards and PayPal."},
+}
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert tokenize("What are the shipping options?") == ['ship', 'option']
+    assert stem('ships') == stem('shipping') == 'ship'
+
+
+def test_best_match_ranks_first():
+    index = FAQIndex(FAQS)
+    assert index.search("how long does express shipping take")[0]['key'] == 'shipping'
+    assert index.search("can I get a refund")[0]['key'] == 'return'
+    assert index.search("do you take credit cards")[0]['key'] == 'payment'
+
+
+def test_results_are_sorted_and_report_matched_terms():
+    index = FAQIndex(FAQS)
+    results = index.search("refund for shipping", k=3)
+    assert [r['score'] for r in results] == sorted((r['score'] for r in results), reverse=True)
+    assert {r['key'] for r in results} == {'shipping', 'return'}
+    assert all(r['terms'] == 1 for r in results)
+
+
+def test_unknown_terms_find_nothing():
+    assert FAQIndex(FAQS).search("quantum entanglement") == []
+    assert FAQIndex().search("shipping") == []
+
+
+def test_incremental_add_matches_bulk_build():
+    index = FAQIndex()
+    for key, faq in FAQS.items():
+        index.add(key, faq)
+    index.finalize()
+    for query in ("shipping", "refund policy", "credit card payment"):
+        assert index.search(query) == FAQIndex(FAQS).search(query)
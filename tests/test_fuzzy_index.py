@@ -0,0 +1,50 @@
+"""Tests - FuzzyIndex lookups against a brute-force edit distance scan"""
+
+import random
+
+import pytest
+
+from benchmarks.generators import generate_vocabulary, make_typo
+from utils.fuzzy_index import FuzzyIndex, default_max_distance, edit_distance, grams
+
+
+@pytest.fixture(scope='module', params=[300, 2_000], ids=['counter', 'numpy'])
+def vocabulary(request):
+    words = generate_vocabulary(request.param)
+    rng = random.Random(request.param)
+    queries = [make_typo(rng, word) for word in rng.sample(words, 50)]
+    queries += [make_typo(rng, make_typo(rng, word)) for word in rng.sample(words, 50)]
+    return words, FuzzyIndex((word, i) for i, word in enumerate(words)), queries
+
+
+def test_search_matches_brute_force(vocabulary):
+    words, index, queries = vocabulary
+    for query in queries:
+        limit = default_max_distance(query)
+        distances = sorted(d for d in (edit_distance(query, word, limit) for word in words) if d <= limit)
+        found = index.search(query, k=5)
+        assert [distance for _, distance in found] == distances[:5], query
+        assert all(edit_distance(query, word, limit) == distance for word, distance in found)
+
+
+def test_narrower_passes_agree_with_one_full_pass(vocabulary):
+    _, index, queries = vocabulary
+    for query in queries:
+        max_distance = default_max_distance(query)
+        for k in (1, 3):
+            expected = index._search(query, grams(query), max_distance, k) if max_distance else index.search(query, k=k)
+            assert index.search(query, k=k) == expected, query
+
+
+def test_best_and_correct():
+    index = FuzzyIndex([("refund policy", 'refund'), ("shipping options", 'shipping')])
+    assert index.best("refnd") == 'refund'
+    assert index.best("qqqqqq") is None
+    assert index.labels('shipping') == ('shipping',)
+    assert index.correct("Where is my refnd", skip={'where', 'is', 'my'}) == ("where is my refund", {'refnd': 'refund'})
+
+
+def test_labels_are_deduplicated_in_first_seen_order():
+    index = FuzzyIndex([("red shoes", 'a'), ("blue shoes", 'b'), ("red red hat", 'a'), ("shoes", 'a')])
+    assert index.labels('shoes') == ('a', 'b')
+    assert index.labels('red') == ('a',)
@@ -0,0 +1,78 @@
+"""Tests - RingBuffer wraparound, SessionHistory LRU eviction and session_scope isolation"""
+
+import asyncio
+import threading
+
+import pytest
+
+from utils.history import DEFAULT_SESSION, Message, RingBuffer, SessionHistory, current_session, session_scope
+
+
+def contents(messages):
+    return [message.content for message in messages]
+
+
+def test_ring_buffer_wraps_around_keeping_the_newest():
+    ring = RingBuffer(3)
+    for i in range(7):
+        ring.append(Message('user', str(i), float(i)))
+    assert len(ring) == 3 and ring.evicted == 4
+    assert contents(ring) == ['4', '5', '6']
+    assert contents(ring.recent(2)) == ['5', '6']
+    assert contents(ring.recent(10)) == ['4', '5', '6']
+    ring.clear()
+    assert list(ring) == [] and ring.recent(2) == []
+    ring.append(Message('user', 'again', 0.0))
+    assert contents(ring) == ['again']
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_least_recently_used_session_is_evicted():
+    history = SessionHistory(capacity=2, max_sessions=3)
+    for session in ('a', 'b', 'c'):
+        history.append('user', f"hi from {session}", session)
+    # Appending to 'a' makes 'b' the least recently used
+    history.append('user', "a again", 'a')
+    history.append('user', "hi from d", 'd')
+    assert history.session_ids() == ['c', 'a', 'd']
+    assert history.get('b') == []
+    assert contents(history.get('a')) == ["hi from a", "a again"]
+    history.append('user', "a third", 'a')
+    assert contents(history.get('a', last=5)) == ["a again", "a third"]
+    assert history.stats() == {'sessions': 3, 'messages': 4, 'evicted_messages': 1, 'evicted_sessions': 1}
+    history.clear('a')
+    assert history.session_ids() == ['c', 'd']
+
+
+def test_session_scope_is_isolated_per_thread_and_task():
+    seen = {}
+    barrier = threading.Barrier(4)
+
+    def worker(session):
+        with session_scope(session):
+            barrier.wait()
+            seen[session] = current_session()
+        seen[f"{session} after"] = current_session()
+
+    threads = [threading.Thread(target=worker, args=(f"s{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(seen[f"s{i}"] == f"s{i}" and seen[f"s{i} after"] == DEFAULT_SESSION for i in range(4))
+
+    async def task(session):
+        with session_scope(session):
+            await asyncio.sleep(0)
+            return current_session()
+
+    async def gather():
+        return await asyncio.gather(*(task(f"t{i}") for i in range(4)))
+
+    assert asyncio.run(gather()) == ['t0', 't1', 't2', 't3']
+    with session_scope('outer'):
+        with session_scope(None):
+            assert current_session() == DEFAULT_SESSION
+        assert current_session() == 'outer'
+    assert current_session() == DEFAULT_SESSION
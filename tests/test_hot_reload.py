@@ -0,0 +1,56 @@
+"""Tests - DataWatcher reloads on content changes only and survives broken writes"""
+
+import os
+
+import pytest
+
+from agents.support_agent import SupportAgent
+from benchmarks.generators import write_faqs
+from utils.hot_reload import DataWatcher
+
+
+@pytest.fixture
+def watched(tmp_path):
+    path = str(tmp_path / 'faqs.json')
+    write_faqs(path, 20)
+    agent = SupportAgent(data_path=path)
+    return path, agent, DataWatcher([agent])
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def test_touch_with_the_same_content_does_not_reload(watched):
+    path, agent, watcher = watched
+    snapshot = agent.faq_data
+    bump_mtime(path)
+    assert watcher.check_once() == []
+    assert agent.faq_data is snapshot and agent.data_version == 0
+
+
+def test_changed_content_swaps_the_snapshot(watched):
+    path, agent, watcher = watched
+    snapshot = agent.faq_data
+    write_faqs(path, 30, seed=8)
+    bump_mtime(path)
+    assert watcher.check_once() == ['SupportAgent']
+    assert agent.faq_data is not snapshot and agent.data_version == 1
+    assert len(agent.faqs) == 30
+    assert watcher.check_once() == []
+
+
+def test_broken_json_keeps_the_old_snapshot_until_fixed(watched):
+    path, agent, watcher = watched
+    snapshot = agent.faq_data
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"shipping": {"question": "half-writ')
+    bump_mtime(path)
+    assert watcher.check_once() == []
+    assert agent.faq_data is snapshot and agent.data_version == 0
+    assert len(agent.faqs) == 20
+    write_faqs(path, 25)
+    bump_mtime(path)
+    assert watcher.check_once() == ['SupportAgent']
+    assert len(agent.faqs) == 25
@@ -0,0 +1,125 @@
+"""Tests - AgentHub concurrency limit, timeouts and lazy agent construction"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.base_agent import BaseAgent
+from agents.hub import AgentHub, LazyAgents
+
+
+class SlowAgent(BaseAgent):
+    """Blocks every query until released, tracking how many run at once"""
+
+    cache_ttl = None
+
+    def __init__(self):
+        super().__init__("SlowAgent")
+        self.release = threading.Event()
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def process_query(self, query):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        self.release.wait(5)
+        with self._lock:
+            self.running -= 1
+        return {'type': 'slow', 'response': query}
+
+
+def test_concurrency_limit_holds_across_handle_sync_callers():
+    agent = SlowAgent()
+    hub = AgentHub({'slow': agent}, default_agent='slow', max_workers=8, max_concurrency=2, timeout=5)
+    with ThreadPoolExecutor(6) as callers:
+        results = [callers.submit(hub.handle_sync, f"q{i}", 'slow') for i in range(6)]
+        time.sleep(0.2)
+        assert agent.running == 2
+        agent.release.set()
+        assert all(result.result()['ok'] for result in results)
+    assert agent.peak == 2
+    hub.close()
+
+
+def test_concurrency_limit_holds_for_gathered_requests():
+    agent = SlowAgent()
+    agent.release.set()
+    hub = AgentHub({'slow': agent}, default_agent='slow', max_workers=8, max_concurrency=3, timeout=5)
+
+    async def drive():
+        return await asyncio.gather(*(hub.handle(f"q{i}", 'slow') for i in range(200)))
+
+    assert all(result['ok'] for result in asyncio.run(drive()))
+    assert agent.peak <= 3
+    hub.close()
+
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_finishes():
+    agent = SlowAgent()
+    hub = AgentHub({'slow': agent}, default_agent='slow', max_concurrency=1, timeout=5)
+    first = hub.handle_sync("stuck", 'slow', timeout=0.05)
+    assert not first['ok'] and first['error'] == "Timed out after 0.05s"
+    second = hub.handle_sync("queued", 'slow', timeout=0.1)
+    assert not second['ok'] and agent.peak == 1  # the abandoned thread still holds the only slot
+    agent.release.set()
+    time.sleep(0.1)
+    assert hub.handle_sync("free again", 'slow', timeout=1)['ok']
+    hub.close()
+
+
+def test_explicit_zero_timeout_is_not_the_default():
+    agent = SlowAgent()
+    hub = AgentHub({'slow': agent}, default_agent='slow', timeout=5)
+    start = time.perf_counter()
+    assert hub.handle_sync("now", 'slow', timeout=0)['error'] == "Timed out after 0s"
+    assert time.perf_counter() - start < 1
+    agent.release.set()
+    hub.close()
+
+
+def test_unknown_agent_is_an_error_result():
+    hub = AgentHub({'slow': SlowAgent()}, default_agent='slow')
+    assert hub.handle_sync("hi", 'missing')['error'] == "Unknown agent: missing"
+    hub.close()
+
+
+def test_lazy_agents_build_on_first_lookup_and_run_hooks():
+    built = []
+    agents = LazyAgents({'a': SlowAgent, 'b': SlowAgent})
+    agents.on_build(lambda agent: built.append(agent))
+    assert list(agents) == ['a', 'b'] and agents.built() == {}
+    first = agents['a']
+    assert agents['a'] is first and built == [first]
+    assert agents.get('missing') is None
+    assert list(agents.built()) == ['a']
+
+
+class KeywordAgent(BaseAgent):
+    """Answers with its name; routes on its class keywords plus words learned from data"""
+
+    def __init__(self, name, learned=()):
+        super().__init__(name)
+        self.learned = list(learned)
+
+    def intent_vocabulary(self):
+        return [self.agent_name] + self.learned
+
+    def process_query(self, query):
+        return {'type': 'keyword', 'response': self.agent_name}
+
+
+def test_routing_uses_static_keywords_until_an_agent_is_built():
+    agents = LazyAgents({'orders': lambda: KeywordAgent('orders'), 'shop': lambda: KeywordAgent('shop', ['laptops'])},
+                        keywords={'orders': lambda: ['orders'], 'shop': lambda: ['shop']})
+    hub = AgentHub(agents, default_agent='orders')
+    assert hub.route("shop for gifts")[0] == 'shop'
+    assert hub.route("any laptops") == ('orders', 0.0)
+    assert agents.built() == {}
+    # Once built, an agent routes on its full vocabulary
+    agents['shop']
+    assert hub.route("any laptops")[0] == 'shop'
+    assert list(agents.built()) == ['shop']
+    hub.close()
@@ -0,0 +1,40 @@
+"""Tests - KeywordMatcher against the substring scans it replaced"""
+
+import random
+
+from benchmarks.generators import generate_faqs, generate_queries
+from utils.keyword_matcher import KeywordMatcher
+
+
+def legacy_first_match(faqs, text):
+    """The original SupportAgent scan: first FAQ in file order with any keyword in the text"""
+    for position, faq in enumerate(faqs.values()):
+        if any(kw in text for kw in faq.get('keywords', [])):
+            return position
+    return None
+
+
+def test_first_match_order_matches_the_legacy_scan():
+    faqs = generate_faqs(200, random_keywords=True)
+    matcher = KeywordMatcher((kw, position) for position, faq in enumerate(faqs.values())
+                             for kw in faq['keywords'])
+    rng = random.Random(1)
+    keywords = [kw for faq in faqs.values() for kw in faq['keywords']]
+    texts = [query for _, query in generate_queries(300)]
+    texts += [f"{rng.choice(keywords)} and {rng.choice(keywords)}" for _ in range(300)]
+    texts += [rng.choice(keywords)[1:-1] for _ in range(100)]  # partial keywords must not match
+    for text in texts:
+        labels = matcher.labels(text)
+        assert (min(labels) if labels else None) == legacy_first_match(faqs, text), text
+
+
+def test_overlapping_keywords_all_match():
+    matcher = KeywordMatcher([('he', 'a'), ('she', 'b'), ('hers', 'c'), ('his', 'd')])
+    assert matcher.labels("ushers") == {'a', 'b', 'c'}
+    assert list(matcher.iter_matches("ushers")) == ['b', 'a', 'c']
+    assert not matcher.contains_any("hi you")
+
+
+def test_matching_is_case_insensitive():
+    matcher = KeywordMatcher([('Credit Card', 'payment')])
+    assert matcher.labels("I paid by CREDIT CARD") == {'payment'}
@@ -0,0 +1,78 @@
+"""Tests - LatencyHistogram percentiles and merging, and the Prometheus export"""
+
+import math
+import random
+
+import pytest
+
+from utils.latency_histogram import LatencyHistogram
+from utils.metrics import BUCKET_BOUNDS_MS, AgentMetrics, to_prometheus
+
+
+def samples(n, seed=5):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(0, 2) for _ in range(n)]
+
+
+def nearest_rank(values, p):
+    return sorted(values)[max(1, math.ceil(p / 100 * len(values))) - 1]
+
+
+def test_percentiles_match_sorted_samples_within_bucket_resolution():
+    values = samples(20_000)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    for p in (1, 25, 50, 90, 95, 99, 99.9, 100):
+        exact = nearest_rank(values, p)
+        assert histogram.percentile(p) == pytest.approx(exact, rel=1 / histogram.sub_buckets), p
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+    assert histogram.percentile(100) == max(values)
+
+
+def test_merge_equals_recording_everything_in_one():
+    values = samples(5_000)
+    whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(values):
+        whole.record(value)
+        (left if i % 3 else right).record(value)
+    left.merge(right)
+    assert left.counts == whole.counts
+    assert left.summary() == whole.summary()
+    with pytest.raises(ValueError):
+        left.merge(LatencyHistogram(sub_buckets=16))
+
+
+def test_values_beyond_the_max_bucket_report_the_true_max():
+    histogram = LatencyHistogram(max_value=100.0)
+    for value in (1.0, 2.0, 5_000.0, 90_000.0):
+        histogram.record(value)
+    assert histogram.percentile(50) == pytest.approx(2.0, rel=1 / 32)
+    assert histogram.percentile(100) == 90_000.0
+    assert histogram.summary()['max'] == 90_000.0
+    # Past max_value only the true max is known, so overflow values count from there
+    assert histogram.cumulative_counts([10.0, 100.0, 5_000.0, 90_000.0]) == [2, 2, 2, 4]
+
+
+def test_prometheus_histogram_is_cumulative_with_sum_and_count():
+    metrics = AgentMetrics('Shop "A"')
+    timings = [0.05, 0.3, 0.3, 4.0, 40.0, 20_000.0]
+    for elapsed_ms in timings:
+        metrics.record_call(elapsed_ms)
+    metrics.record_call(2.0, failed=True)
+    timings.append(2.0)
+    text = to_prometheus([metrics.snapshot()])
+    labels = 'agent="Shop \\"A\\"",stage="total"'
+    assert '# TYPE agent_stage_duration_seconds histogram' in text
+    assert f'agent_calls_total{{agent="Shop \\"A\\""}} 7' in text
+    assert f'agent_errors_total{{agent="Shop \\"A\\""}} 1' in text
+    buckets = [line for line in text.splitlines() if line.startswith('agent_stage_duration_seconds_bucket')]
+    assert len(buckets) == len(BUCKET_BOUNDS_MS) + 1
+    counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    for bound, line in zip(BUCKET_BOUNDS_MS, buckets):
+        assert f'le="{bound / 1000:.6g}"' in line
+        assert int(line.rsplit(' ', 1)[1]) == sum(1 for t in timings if t <= bound)
+    assert buckets[-1] == f'agent_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 7'
+    assert f'agent_stage_duration_seconds_sum{{{labels}}} {sum(timings) / 1000:.6g}' in text
+    assert f'agent_stage_duration_seconds_count{{{labels}}} 7' in text
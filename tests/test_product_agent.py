@@ -0,0 +1,58 @@
+"""Tests - ProductAgent query filters, and indexes built at load and reload time"""
+
+import os
+
+import pytest
+
+from agents import product_agent
+from agents.product_agent import ProductAgent
+from benchmarks.generators import write_products
+
+
+def test_typo_index_is_built_at_load_and_reload_not_per_query(tmp_path, monkeypatch):
+    path = os.path.join(tmp_path, 'products.json')
+    write_products(path, 200, categories=4)
+    built = []
+
+    class CountingFuzzyIndex(product_agent.FuzzyIndex):
+        def __init__(self, terms=()):
+            super().__init__(terms)
+            built.append(self)
+
+    monkeypatch.setattr(product_agent, 'FuzzyIndex', CountingFuzzyIndex)
+    agent = ProductAgent(storage='index', data_path=path, reviews_path='')
+    assert len(built) == 1
+    agent.process_query("recommend categroy3 products")
+    assert len(built) == 1
+    write_products(path, 300, categories=4)
+    agent.reload()
+    assert len(built) == 2 and agent.fuzzy_index() is built[-1]
+    agent.process_query("recommend categroy3 products")
+    assert len(built) == 2
+
+
+@pytest.fixture(scope='module')
+def agent(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('catalog') / 'products.json')
+    write_products(path, 500, categories=4)
+    return ProductAgent(storage='index', data_path=path, reviews_path='')
+
+
+@pytest.mark.parametrize('query, filters', [
+    ("laptops under 20", {'max_price': 20.0}),
+    ("laptops under $20", {'max_price': 20.0}),
+    ("items over 100", {'min_price': 100.0}),
+    ("items over $100", {'min_price': 100.0}),
+    ("electronics over 50 rated 4.5+", {'min_price': 50.0, 'min_rating': 4.5}),
+    ("anything rated over 4", {'min_rating': 4.0}),
+    ("at least 4 stars under 200", {'min_rating': 4.0, 'max_price': 200.0}),
+])
+def test_price_phrasings_with_and_without_dollar_sign(agent, query, filters):
+    assert agent._parse_filters(query) == filters
+
+
+def test_price_filters_apply_to_recommendations(agent):
+    for query, passes in (("recommend items over 100", lambda item: item['price'] >= 100),
+                          ("recommend items under 20", lambda item: item['price'] <= 20)):
+        products = agent.process_query(query)['products']
+        assert products and all(passes(item) for item in products), query
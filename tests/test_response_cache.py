@@ -0,0 +1,73 @@
+"""Tests - ResponseCache expiry and agent cache invalidation on reload"""
+
+import json
+
+from agents.support_agent import SupportAgent
+from utils.response_cache import ResponseCache, normalize_query
+
+
+def write_faqs(path, answer):
+    path.write_text(json.dumps({'shipping': {'question': "What are your shipping options?",
+                                             'answer': answer, 'category': 'logistics', 'keywords': ['ship']}}))
+
+
+def test_lru_eviction_and_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('utils.response_cache.time.monotonic', lambda: now[0])
+    cache = ResponseCache(maxsize=2, ttl=10)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)  # evicts b, the least recently used
+    assert cache.get('b') is None
+    now[0] += 10
+    assert cache.get('a') is None
+    assert cache.stats()['evictions'] == 1 and cache.stats()['expirations'] == 1
+
+
+def test_queries_differing_in_case_and_spacing_share_an_entry(tmp_path):
+    path = tmp_path / 'faqs.json'
+    write_faqs(path, "Ships in 5 days.")
+    agent = SupportAgent(data_path=str(path))
+    agent.process_query("Do you ship?")
+    agent.process_query("  do YOU   ship? ")
+    assert normalize_query("  do YOU   ship? ") == "do you ship?"
+    assert agent.cache_stats()['hits'] == 1
+
+
+def test_reload_invalidates_cached_responses(tmp_path):
+    path = tmp_path / 'faqs.json'
+    write_faqs(path, "Ships in 5 days.")
+    agent = SupportAgent(data_path=str(path))
+    assert "5 days" in agent.process_query("do you ship")['response']
+    assert "5 days" in agent.process_query("do you ship")['response']
+    write_faqs(path, "Ships in 2 days.")
+    agent.reload()
+    assert "2 days" in agent.process_query("do you ship")['response']
+
+
+def test_cached_responses_are_copies(tmp_path):
+    path = tmp_path / 'faqs.json'
+    write_faqs(path, "Ships in 5 days.")
+    agent = SupportAgent(data_path=str(path))
+    agent.process_query("do you ship")['response'] = 'changed by a caller'
+    assert agent.process_query("do you ship")['response'] != 'changed by a caller'
+
+
+def test_product_reload_invalidates_social_posts(tmp_path):
+    from agents.product_agent import ProductAgent
+    from agents.social_agent import SocialAgent
+
+    def write_products(name):
+        (tmp_path / 'products.json').write_text(json.dumps({'fashion': [
+            {'id': 'F1', 'name': name, 'price': 99.0, 'category': 'outerwear', 'features': ['Warm'],
+             'rating': 4.9, 'stock': 3}]}))
+
+    write_products("Wool Coat")
+    products = ProductAgent(data_path=str(tmp_path / 'products.json'))
+    social = SocialAgent(product_agent=products)
+    query = "Write a launch post for fashion"
+    assert "Wool Coat" in social.process_query(query)['ideas'][0]['content']
+    write_products("Rain Jacket")
+    products.reload()
+    assert "Rain Jacket" in social.process_query(query)['ideas'][0]['content']
@@ -0,0 +1,97 @@
+"""Tests - ReviewPipeline scoring, checkpoints and resume"""
+
+import json
+
+import pytest
+
+import utils.reviews
+from benchmarks.generators import write_reviews
+from utils.reviews import ReviewPipeline, ReviewSummary
+
+PRODUCT_IDS = ['P1', 'P2', 'P3', 'P4']
+CATEGORIES = {'P1': 'electronics', 'P2': 'electronics', 'P3': 'fashion', 'P4': 'home'}
+
+
+def tallies(pipeline):
+    summary = pipeline.summary()
+    return {key: summary[key] for key in ('records', 'skipped', 'overall', 'categories', 'products')}
+
+
+def full_run(path):
+    pipeline = ReviewPipeline(CATEGORIES)
+    pipeline.run(path, workers=1, chunk_size=100, resume=False)
+    return pipeline
+
+
+def test_counts_and_categories(tmp_path):
+    path = tmp_path / 'reviews.jsonl'
+    path.write_text('\n'.join(json.dumps(record) for record in [
+        {'product_id': 'P1', 'text': 'great, I love it'},
+        {'product_id': 'P1', 'text': 'terrible and broken'},
+        {'product_id': 'P3', 'text': 'it arrived'},
+        {'text': 'no product named here'},
+    ]) + '\n{not json\n')
+    pipeline = full_run(str(path))
+    summary = ReviewSummary(pipeline.summary())
+    assert pipeline.records == 4 and pipeline.skipped == 1  # malformed JSON is skipped
+    assert summary.product('P1')['reviews'] == 2
+    assert summary.category('electronics')['positive_rate'] == 50.0
+    assert list(summary.best_reviewed()) == ['P1', 'P3']
+
+
+def test_resume_after_an_interrupted_run_matches_a_full_run(tmp_path, monkeypatch):
+    path = str(tmp_path / 'reviews.jsonl')
+    write_reviews(path, 2_000, PRODUCT_IDS)
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    score_chunk = utils.reviews._score_chunk
+    calls = []
+
+    def failing(lines):
+        calls.append(len(lines))
+        if len(calls) == 8:
+            raise KeyboardInterrupt
+        return score_chunk(lines)
+
+    monkeypatch.setattr(utils.reviews, '_score_chunk', failing)
+    with pytest.raises(KeyboardInterrupt):
+        ReviewPipeline(CATEGORIES, checkpoint, checkpoint_every=3).run(path, workers=1, chunk_size=100)
+    monkeypatch.setattr(utils.reviews, '_score_chunk', score_chunk)
+
+    resumed = ReviewPipeline(CATEGORIES, checkpoint, checkpoint_every=3)
+    stats = resumed.run(path, workers=1, chunk_size=100)
+    assert stats['resumed']
+    assert stats['records'] == 2_000 - 600  # two checkpoints of three 100-line chunks were kept
+    assert tallies(resumed) == tallies(full_run(path))
+
+
+def test_appended_lines_are_scored_incrementally(tmp_path):
+    path = tmp_path / 'reviews.jsonl'
+    write_reviews(str(path), 1_000, PRODUCT_IDS)
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    ReviewPipeline(CATEGORIES, checkpoint).run(str(path), workers=1, chunk_size=100)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'product_id': 'P2', 'text': 'amazing'}) + '\n')
+        f.write('{"product_id": "P2", "text": "still being writ')  # no newline yet: left for later
+    pipeline = ReviewPipeline(CATEGORIES, checkpoint)
+    stats = pipeline.run(str(path), workers=1)
+    assert stats['resumed'] and stats['records'] == 1
+    assert pipeline.records == 1_001
+
+
+def test_a_replaced_corpus_is_not_resumed(tmp_path):
+    path = tmp_path / 'reviews.jsonl'
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    write_reviews(str(path), 500, PRODUCT_IDS)
+    ReviewPipeline(CATEGORIES, checkpoint).run(str(path), workers=1)
+    write_reviews(str(path), 100, PRODUCT_IDS, seed=1)
+    stats = ReviewPipeline(CATEGORIES, checkpoint).run(str(path), workers=1)
+    assert not stats['resumed'] and stats['total_records'] == 100
+
+
+@pytest.mark.parametrize('max_pending', [None, 1])
+def test_pool_run_matches_in_process_run(tmp_path, max_pending):
+    path = str(tmp_path / 'reviews.jsonl')
+    write_reviews(path, 1_000, PRODUCT_IDS)
+    pooled = ReviewPipeline(CATEGORIES)
+    pooled.run(path, workers=2, chunk_size=100, max_pending=max_pending, resume=False)
+    assert tallies(pooled) == tallies(full_run(path))
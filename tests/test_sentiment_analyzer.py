@@ -0,0 +1,34 @@
+"""Tests - SentimentAnalyzer lexicon scoring and batch parity"""
+
+import pytest
+
+from benchmarks.generators import generate_texts
+from utils.sentiment_analyzer import SentimentAnalyzer
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return SentimentAnalyzer()
+
+
+@pytest.mark.parametrize('text, sentiment', [
+    ("This is great, I love it", 'Positive'),
+    ("terrible and broken", 'Negative'),
+    ("not good", 'Negative'),
+    ("this is not bad at all", 'Positive'),
+    ("goodbye", 'Neutral'),
+    ("", 'Neutral'),
+])
+def test_analyze(analyzer, text, sentiment):
+    assert analyzer.analyze(text)['sentiment'] == sentiment
+
+
+def test_analyze_batch_matches_analyze(analyzer):
+    texts = generate_texts(2_000, words=20) + ["", "not not good", "very very bad", "I don't love it"]
+    assert analyzer.analyze_batch(texts) == [analyzer.analyze(text) for text in texts]
+
+
+def test_analyze_batch_without_numpy_matches_too(analyzer, monkeypatch):
+    monkeypatch.setattr('utils.sentiment_analyzer.optional_module', lambda name: None)
+    texts = generate_texts(50, words=10)
+    assert analyzer.analyze_batch(texts) == [analyzer.analyze(text) for text in texts]
@@ -0,0 +1,34 @@
+"""Tests - IncrementalSummarizer agrees with ConversationSummarizer"""
+
+from benchmarks.generators import generate_messages
+from utils.summarizer import ConversationSummarizer, IncrementalSummarizer
+
+
+def test_every_prefix_summarizes_the_same():
+    messages = generate_messages(200)
+    messages[4]['content'] = "Where is my order? The shipping was slow"
+    incremental = IncrementalSummarizer()
+    assert incremental.summary() == ConversationSummarizer.summarize([])
+    for count in range(1, len(messages) + 1):
+        incremental.add(messages[count - 1])
+        assert incremental.summary() == ConversationSummarizer.summarize(messages[:count])
+
+
+def test_sync_catches_up_and_resets_after_a_clear():
+    messages = generate_messages(50)
+    incremental = IncrementalSummarizer(messages[:10])
+    assert incremental.sync(messages) == ConversationSummarizer.summarize(messages)
+    assert incremental.sync(messages[:3]) == ConversationSummarizer.summarize(messages[:3])
+    assert incremental.sync([]) == ConversationSummarizer.summarize([])
+
+
+def test_sync_resets_when_the_list_is_replaced():
+    messages = generate_messages(50)
+    incremental = IncrementalSummarizer(messages[:10])
+    # A cleared chat that has grown past the old length again
+    replacement = generate_messages(20)
+    replacement[0]['content'] = "Do you ship electronics abroad?"
+    assert incremental.sync(replacement) == ConversationSummarizer.summarize(replacement)
+    incremental.reset()
+    assert incremental.summary() == ConversationSummarizer.summarize([])
+    assert incremental.sync(messages[:5]) == ConversationSummarizer.summarize(messages[:5])
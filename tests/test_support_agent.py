@@ -0,0 +1,72 @@
+"""Tests - SupportAgent FAQ matching, escalation and general replies"""
+
+import os
+
+import pytest
+
+from agents.support_agent import SupportAgent, ticket_number
+from utils.history import session_scope
+
+FAQS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'faqs.json')
+
+
+@pytest.fixture
+def agent():
+    agent = SupportAgent(data_path=FAQS_PATH)
+    agent.response_cache = None
+    return agent
+
+
+@pytest.mark.parametrize('query', [
+    "cancel my order",
+    "is this product any good",
+    "where are you located",
+    "hello there",
+])
+def test_off_topic_questions_get_the_general_reply(agent, query):
+    assert agent.process_query(query)['type'] == 'general'
+
+
+@pytest.mark.parametrize('query, key', [
+    ("How can I track my order?", 'track'),
+    ("what is your return policy", 'return'),
+    ("refund please", 'return'),
+    ("payment methods", 'payment'),
+    ("how long does standard shipping take", 'shipping'),
+    ("which credit cards do you accept", 'payment'),
+    ("is my item under warranty", 'warranty'),
+])
+def test_faq_questions_get_their_answer(agent, query, key):
+    response = agent.process_query(query)
+    assert response['type'] == 'faq'
+    assert response['faq_key'] == key
+
+
+def test_misspelled_question_is_corrected(agent):
+    response = agent.process_query("I want a refnd")
+    assert response['faq_key'] == 'return'
+    assert response['corrections'] == {'refnd': 'refund'}
+
+
+def test_complaint_escalates_with_a_ticket(agent):
+    response = agent.process_query("my product is broken")
+    assert response['type'] == 'escalation'
+    assert response['ticket_number'].startswith('TKT-')
+    assert agent.escalation_count == 1
+
+
+def test_tickets_are_stable_within_a_session(agent):
+    with session_scope('alice'):
+        first = agent.process_query("my product is broken")['ticket_number']
+        retry = agent.process_query("My product  is broken ")['ticket_number']
+    with session_scope('bob'):
+        other = agent.process_query("my product is broken")['ticket_number']
+    assert first == retry == ticket_number("my product is broken", 'alice')
+    assert other != first
+
+
+def test_tickets_outside_a_session_are_never_shared(agent):
+    tickets = {agent.process_query("my product is broken")['ticket_number'] for _ in range(20)}
+    assert len(tickets) == 20
+    assert ticket_number("broken", 'default', 'a1') == ticket_number("broken", 'default', 'a1')
+    assert ticket_number("broken", 'default', 'a1') != ticket_number("broken", 'default', 'a2')
@@ -0,0 +1,19 @@
+"""Tests - bulk post generation on a process pool"""
+
+import json
+import os
+
+from benchmarks.generators import iter_product_records
+from utils.templates import TemplateEngine, bulk_generate
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'social_templates.json')
+
+
+def test_pool_output_matches_in_process_output():
+    with open(TEMPLATES_PATH, 'r', encoding='utf-8') as f:
+        engine = TemplateEngine(json.load(f))
+    records = list(iter_product_records(300, categories=4))
+    expected = list(bulk_generate(engine, records, workers=1))
+    assert len(expected) > len(records)
+    assert list(bulk_generate(engine, iter(records), workers=2, chunk_size=40)) == expected
+    assert list(bulk_generate(engine, iter(records), workers=2, chunk_size=40, max_pending=1)) == expected
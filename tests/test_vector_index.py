@@ -0,0 +1,38 @@
+"""Tests - ProductVectors search, category filters and id lookups"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+import utils.vector_index
+from benchmarks.generators import generate_products
+from utils.vector_index import ProductVectors
+
+PRODUCTS = generate_products(5_000, categories=6)
+
+
+@pytest.fixture(scope='module')
+def vectors():
+    return ProductVectors.from_records((category, item) for category, items in PRODUCTS.items() for item in items)
+
+
+def test_category_of(vectors):
+    for category, items in PRODUCTS.items():
+        for item in items[::250]:
+            assert vectors.category_of(item['id']) == category
+    assert vectors.category_of('SYN999999999') is None
+
+
+def test_category_filter_keeps_only_that_category(vectors):
+    category = vectors.categories[2]
+    found = vectors.search("wireless lightweight", k=10, category=category)
+    assert len(found) == 10
+    assert all(vectors.category_of(item_id) == category for item_id, _ in found)
+
+
+def test_approximate_category_search_falls_back_to_exact(vectors, monkeypatch):
+    # Keep so few postings per term that they hold no product of most categories
+    monkeypatch.setattr(utils.vector_index, 'APPROXIMATE_POSTINGS', 3)
+    for category in vectors.categories:
+        exact = vectors.search("wireless lightweight", k=10, category=category)
+        assert vectors.search("wireless lightweight", k=10, category=category, approximate=True) == exact
@@ -0,0 +1,120 @@
+"""Catalog Index - Precomputed orderings for product lookups"""
+
+import heapq
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def estimate_dict_bytes(obj: Any, _seen: Optional[set] = None) -> int:
+    """Recursive sys.getsizeof over dicts, lists and their contents"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_dict_bytes(k, _seen) + estimate_dict_bytes(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(estimate_dict_bytes(v, _seen) for v in obj)
+    return size
+
+
+class CatalogIndex:
+    """Read-only indexes over a {category: [items]} product catalog.
+
+    Sorting happens once at build time. Budget, premium and top-rated queries
+    then slice a precomputed ordering, which is O(k) per request. Orderings
+    are stable, so ties resolve in catalog order exactly as a per-request
+    sorted() over the flattened catalog would.
+    """
+
+    def __init__(self, products: Dict[str, List[Dict]]):
+        self.by_category: Dict[str, List[Dict]] = {}
+        self.items: List[Dict] = []
+        self._item_categories: List[str] = []
+        for category, items in products.items():
+            self.by_category[category] = items
+            self.items.extend(items)
+            self._item_categories.extend([category] * len(items))
+
+        self.by_id: Dict[str, Dict] = {item['id']: item for item in self.items if 'id' in item}
+        self._by_price = sorted(self.items, key=lambda x: x['price'])
+        self._by_price_desc = sorted(self.items, key=lambda x: x['price'], reverse=True)
+        self._by_rating_desc = sorted(self.items, key=lambda x: x.get('rating', 0), reverse=True)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Dict]]) -> 'CatalogIndex':
+        """Build from a stream of (category, item) pairs"""
+        products: Dict[str, List[Dict]] = {}
+        for category, item in records:
+            products.setdefault(category, []).append(item)
+        return cls(products)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def categories(self) -> List[str]:
+        """Category names in catalog order"""
+        return list(self.by_category)
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        """Look up one item by id"""
+        return self.by_id.get(item_id)
+
+    def iter_records(self) -> Iterator[tuple]:
+        """Yield (category, item) for every item"""
+        return zip(self._item_categories, self.items)
+
+    def in_category(self, category: str, k: int = 3) -> List[Dict]:
+        """First k items of a category, in catalog order"""
+        return self.by_category.get(category, [])[:k]
+
+    def cheapest(self, k: int = 3) -> List[Dict]:
+        """k lowest-priced items"""
+        return self._by_price[:k]
+
+    def most_expensive(self, k: int = 3) -> List[Dict]:
+        """k highest-priced items"""
+        return self._by_price_desc[:k]
+
+    def top_rated(self, k: int = 3) -> List[Dict]:
+        """k highest-rated items"""
+        return self._by_rating_desc[:k]
+
+    def top_k(self, k: int, key: Callable[[Dict], Any],
+              predicate: Optional[Callable[[Dict], bool]] = None,
+              category: Optional[str] = None) -> List[Dict]:
+        """Heap-based top-k (smallest key first) for ad-hoc orderings and filters"""
+        items = self.by_category.get(category, []) if category else self.items
+        if predicate is not None:
+            items = (item for item in items if predicate(item))
+        return heapq.nsmallest(k, items, key=key)
+
+    def filter(self, category: Optional[str] = None, min_price: Optional[float] = None,
+               max_price: Optional[float] = None, min_rating: Optional[float] = None,
+               in_stock: bool = False, sort_by: str = 'rating', k: int = 3) -> List[Dict]:
+        """Top-k items passing the filters, by rating (desc) or price (asc)"""
+        def predicate(item: Dict) -> bool:
+            return ((min_price is None or item['price'] >= min_price)
+                    and (max_price is None or item['price'] <= max_price)
+                    and (min_rating is None or item.get('rating', 0) >= min_rating)
+                    and (not in_stock or item.get('stock', 0) > 0))
+
+        if category is not None and category not in self.by_category:
+            return []
+        key = (lambda x: -x.get('rating', 0)) if sort_by == 'rating' else (lambda x: x['price'])
+        return self.top_k(k, key, predicate, category)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by the item dicts plus the orderings"""
+        item_bytes = estimate_dict_bytes(self.by_category)
+        index_bytes = sum(sys.getsizeof(x) for x in (self.items, self._item_categories, self.by_id,
+                                                     self._by_price, self._by_price_desc, self._by_rating_desc))
+        return {
+            'items': len(self),
+            'item_bytes': item_bytes,
+            'index_bytes': index_bytes,
+            'total_bytes': item_bytes + index_bytes
+        }
@@ -0,0 +1,245 @@
+"""Columnar Catalog - NumPy-backed product storage with vectorized filters"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_index import estimate_dict_bytes
+
+# Item fields stored as columns; any others are kept per row in ColumnarCatalog.extras
+COLUMNS = frozenset(['id', 'name', 'price', 'category', 'features', 'rating', 'stock'])
+
+
+class StringColumn:
+    """Strings stored end to end as UTF-8 bytes plus row offsets, so no row is padded to the longest"""
+
+    def __init__(self, values: List[str]):
+        joined = ''.join(values)
+        if joined.isascii():
+            # One byte per character, so the strings' own lengths are their byte lengths
+            self.data = joined.encode('ascii')
+        else:
+            values = [value.encode('utf-8') for value in values]
+            self.data = b''.join(values)
+        self.offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, values), dtype=np.int64, count=len(values)), out=self.offsets[1:])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self.data[self.offsets[row]:self.offsets[row + 1]].decode('utf-8')
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes
+
+
+class ColumnarCatalogBuilder:
+    """Accumulate items one at a time into compact typed buffers"""
+
+    def __init__(self):
+        self._categories: Dict[str, int] = {}
+        self._subcategories: Dict[str, int] = {}
+        self._feature_sets: Dict[tuple, int] = {}
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.feature_codes = array('i')
+        self.category_codes = array('i')
+        self.subcategory_codes = array('i')
+        self.price = array('d')
+        self.rating = array('d')
+        self.stock = array('i')
+        # Fields outside COLUMNS, by row, for the rows that have any
+        self.extras: Dict[int, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _intern(self, table: Dict, value) -> int:
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        return code
+
+    def add(self, category: str, item: Dict):
+        """Append one catalog item filed under category"""
+        self.ids.append(item.get('id', ''))
+        self.names.append(item.get('name', ''))
+        self.feature_codes.append(self._intern(self._feature_sets, tuple(item.get('features', []))))
+        self.category_codes.append(self._intern(self._categories, category))
+        self.subcategory_codes.append(self._intern(self._subcategories, item.get('category', '')))
+        self.price.append(float(item['price']))
+        self.rating.append(float(item.get('rating', 0)))
+        self.stock.append(int(item.get('stock', 0)))
+        if not item.keys() <= COLUMNS:
+            self.extras[len(self.ids) - 1] = {key: value for key, value in item.items() if key not in COLUMNS}
+
+    def build(self) -> 'ColumnarCatalog':
+        """Freeze the buffers into a ColumnarCatalog"""
+        return ColumnarCatalog(self)
+
+
+class ColumnarCatalog:
+    """Product catalog stored as parallel NumPy columns.
+
+    price, rating and stock live in typed arrays, ids and names in
+    offset-encoded string columns, categories are interned to small integer
+    codes, fields outside COLUMNS are kept in a side dict keyed by row, and
+    items are only materialized as dicts when they are returned. Implements the same lookup API as CatalogIndex so either
+    can back ProductAgent.
+    """
+
+    def __init__(self, builder: ColumnarCatalogBuilder):
+        self.category_names: List[str] = list(builder._categories)
+        self.subcategory_names: List[str] = list(builder._subcategories)
+        self.ids = StringColumn(builder.ids)
+        self.names = StringColumn(builder.names)
+        self.extras: Dict[int, Dict] = builder.extras
+        self.feature_sets: List[tuple] = list(builder._feature_sets)
+        self.feature_codes = np.frombuffer(builder.feature_codes, dtype=np.int32).copy()
+        self.category_codes = np.frombuffer(builder.category_codes, dtype=np.int32).astype(np.int16 if len(self.category_names) < 2 ** 15 else np.int32)
+        self.subcategory_codes = np.frombuffer(builder.subcategory_codes, dtype=np.int32).astype(np.int16 if len(self.subcategory_names) < 2 ** 15 else np.int32)
+        self.price = np.frombuffer(builder.price, dtype=np.float64).copy()
+        self.rating = np.frombuffer(builder.rating, dtype=np.float64).copy()
+        self.stock = np.frombuffer(builder.stock, dtype=np.int32).copy()
+
+        # Stable orderings match sorted() tie-breaking over the flattened catalog
+        self._by_price = np.argsort(self.price, kind='stable').astype(np.int32)
+        self._by_price_desc = np.argsort(-self.price, kind='stable').astype(np.int32)
+        self._by_rating_desc = np.argsort(-self.rating, kind='stable').astype(np.int32)
+        self._category_rows = {
+            code: np.flatnonzero(self.category_codes == code).astype(np.int32)
+            for code in range(len(self.category_names))
+        }
+        self._id_order = np.array(sorted(range(len(builder.ids)), key=builder.ids.__getitem__), dtype=np.int32)
+
+    @classmethod
+    def from_products(cls, products: Dict[str, List[Dict]]) -> 'ColumnarCatalog':
+        """Build from a {category: [items]} dict"""
+        return cls.from_records(
+            (category, item) for category, items in products.items() for item in items
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Dict]]) -> 'ColumnarCatalog':
+        """Build from a stream of (category, item) pairs without holding the dicts"""
+        builder = ColumnarCatalogBuilder()
+        for category, item in records:
+            builder.add(category, item)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @property
+    def categories(self) -> List[str]:
+        """Category names in catalog order"""
+        return self.category_names
+
+    def record(self, row: int) -> Dict:
+        """Materialize one row as a product dict"""
+        item = {
+            'id': self.ids[row],
+            'name': self.names[row],
+            'price': float(self.price[row]),
+            'category': self.subcategory_names[self.subcategory_codes[row]],
+            'features': list(self.feature_sets[self.feature_codes[row]]),
+            'rating': float(self.rating[row]),
+            'stock': int(self.stock[row])
+        }
+        extra = self.extras.get(row)
+        if extra:
+            item.update(extra)
+        return item
+
+    def records(self, rows) -> List[Dict]:
+        """Materialize rows, in the order given"""
+        return [self.record(int(row)) for row in rows]
+
+    def iter_records(self) -> Iterator[tuple]:
+        """Yield (category, item) for every row"""
+        for row in range(len(self)):
+            yield self.category_names[self.category_codes[row]], self.record(row)
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        """Look up one item by id via binary search over the id column"""
+        pos = bisect_left(self._id_order, item_id, key=self.ids.__getitem__)
+        if pos < len(self) and self.ids[self._id_order[pos]] == item_id:
+            return self.record(int(self._id_order[pos]))
+        return None
+
+    def in_category(self, category: str, k: int = 3) -> List[Dict]:
+        """First k items of a category, in catalog order"""
+        if category not in self.category_names:
+            return []
+        return self.records(self._category_rows[self.category_names.index(category)][:k])
+
+    def cheapest(self, k: int = 3) -> List[Dict]:
+        """k lowest-priced items"""
+        return self.records(self._by_price[:k])
+
+    def most_expensive(self, k: int = 3) -> List[Dict]:
+        """k highest-priced items"""
+        return self.records(self._by_price_desc[:k])
+
+    def top_rated(self, k: int = 3) -> List[Dict]:
+        """k highest-rated items"""
+        return self.records(self._by_rating_desc[:k])
+
+    def mask(self, category: Optional[str] = None, min_price: Optional[float] = None,
+             max_price: Optional[float] = None, min_rating: Optional[float] = None,
+             in_stock: bool = False) -> np.ndarray:
+        """Boolean row mask for the given range filters"""
+        mask = np.ones(len(self), dtype=bool)
+        if category is not None:
+            if category not in self.category_names:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.category_codes == self.category_names.index(category)
+        if min_price is not None:
+            mask &= self.price >= min_price
+        if max_price is not None:
+            mask &= self.price <= max_price
+        if min_rating is not None:
+            mask &= self.rating >= min_rating
+        if in_stock:
+            mask &= self.stock > 0
+        return mask
+
+    def filter(self, category: Optional[str] = None, min_price: Optional[float] = None,
+               max_price: Optional[float] = None, min_rating: Optional[float] = None,
+               in_stock: bool = False, sort_by: str = 'rating', k: int = 3) -> List[Dict]:
+        """Top-k rows passing the filters, by rating (desc) or price (asc)"""
+        if k <= 0:
+            return []
+        rows = np.flatnonzero(self.mask(category, min_price, max_price, min_rating, in_stock))
+        if not len(rows):
+            return []
+        keys = -self.rating[rows] if sort_by == 'rating' else self.price[rows]
+        if len(rows) > k:
+            # argpartition finds the k-th key in O(n); ties at the boundary keep catalog order
+            kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+            chosen = np.flatnonzero(keys < kth)
+            ties = np.flatnonzero(keys == kth)[:k - len(chosen)]
+            selected = np.concatenate([chosen, ties])
+            rows, keys = rows[selected], keys[selected]
+        order = np.lexsort((rows, keys))
+        return self.records(rows[order])
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by the columnar representation"""
+        arrays = (self.ids, self.names, self.category_codes, self.subcategory_codes,
+                  self.feature_codes, self.price, self.rating, self.stock, self._id_order,
+                  self._by_price, self._by_price_desc, self._by_rating_desc,
+                  *self._category_rows.values())
+        column_bytes = sum(a.nbytes for a in arrays)
+        table_bytes = estimate_dict_bytes([self.category_names, self.subcategory_names, self.feature_sets,
+                                           self.extras])
+        return {
+            'items': len(self),
+            'column_bytes': column_bytes,
+            'table_bytes': table_bytes,
+            'total_bytes': column_bytes + table_bytes
+        }
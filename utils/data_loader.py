@@ -0,0 +1,136 @@
+"""Data Loader - Incremental parsing of large JSON and NDJSON data files
+
+Two on-disk layouts are supported:
+
+* JSON: a top-level object, e.g. ``{"electronics": [{...}, {...}], ...}``.
+  With ``nested=True`` array values are streamed element by element, so a
+  category with millions of items never has to be held as one list.
+* NDJSON / JSONL: one ``{"key": ..., "value": ...}`` record per line. For a
+  product catalog each line is one item, ``key`` being its category.
+
+Both yield ``(key, value)`` pairs and keep memory bounded by the read chunk
+plus the largest single record.
+"""
+
+import json
+import os
+from typing import Any, Iterator, Tuple
+
+CHUNK_SIZE = 1 << 16
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+WHITESPACE = ' \t\n\r'
+DELIMITERS = WHITESPACE + ',:]}'
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Sliding text buffer over a file, refilled on demand"""
+
+    def __init__(self, handle, chunk_size: int):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk; return False once the file is exhausted"""
+        if self.eof:
+            return False
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A number or literal not yet followed by a delimiter may continue in the next chunk
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_json_object(path: str, nested: bool = False, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Stream (key, value) pairs from a top-level JSON object.
+
+    With nested=True, array values yield one (key, element) pair per element
+    instead of one pair for the whole array.
+    """
+    with open(path, 'r', encoding='utf-8') as handle:
+        reader = _Reader(handle, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if nested and reader.peek() == '[':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield key, reader.value()
+                        if reader.peek() == ',':
+                            reader.pos += 1
+                            continue
+                        reader.expect(']')
+                        break
+            else:
+                yield key, reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            return
+
+
+def iter_ndjson(path: str) -> Iterator[Tuple[str, Any]]:
+    """Stream (key, value) pairs from an NDJSON file of {"key", "value"} records"""
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            try:
+                key, value = record['key'], record['value']
+            except (KeyError, TypeError):
+                raise ValueError(f"{path}:{line_number}: expected a {{\"key\", \"value\"}} record")
+            yield key, value
+
+
+def iter_records(path: str, nested: bool = False) -> Iterator[Tuple[str, Any]]:
+    """Stream (key, value) pairs from a JSON or NDJSON file, chosen by extension"""
+    if os.path.splitext(path)[1].lower() in NDJSON_EXTENSIONS:
+        return iter_ndjson(path)
+    return iter_json_object(path, nested=nested)
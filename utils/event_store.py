@@ -0,0 +1,239 @@
+"""Event Store - Persistent SQLite (WAL) log of QueryEvents with batched background writes"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from utils.events import QueryEvent, Rollup
+from utils.metrics import AtomicCounter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    agent TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    escalated INTEGER NOT NULL,
+    resolved INTEGER NOT NULL,
+    sentiment TEXT,
+    latency_ms REAL NOT NULL,
+    category TEXT,
+    products INTEGER NOT NULL,
+    product_ids TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+"""
+
+INSERT = "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Columns aggregate() can group by; values are trusted SQL expressions, so the table is read-only
+GROUP_COLUMNS = MappingProxyType({
+    'agent': 'agent',
+    'outcome': 'outcome',
+    'category': 'category',
+    'sentiment': 'sentiment',
+    'minute': 'CAST(ts / 60 AS INTEGER) * 60',
+    'hour': 'CAST(ts / 3600 AS INTEGER) * 3600',
+    'day': 'CAST(ts / 86400 AS INTEGER) * 86400',
+})
+
+_STOP = object()
+
+
+def _row(event: QueryEvent) -> tuple:
+    return (event.timestamp, event.agent, event.outcome, int(event.escalated), int(event.resolved),
+            event.sentiment, event.latency_ms, event.category, len(event.product_ids),
+            ','.join(event.product_ids) or None)
+
+
+class EventStore:
+    """Append-only event log in SQLite, written off the request path.
+
+    record() only enqueues: it never touches disk and never blocks, and if
+    the queue is full the event is counted in `dropped` instead. A daemon
+    thread drains the queue in batches of up to batch_size, one transaction
+    per batch. WAL mode lets aggregate queries run while the writer appends.
+    With read_only=True an existing file is opened for queries only: no
+    schema is created and the writer cannot start.
+    """
+
+    def __init__(self, path: str = 'data/events.db', batch_size: int = 1000,
+                 flush_interval: float = 0.5, max_queue: int = 100_000, read_only: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.read_only = read_only
+        self.written = 0
+        # Bumped by every thread whose record() finds the queue full, and by the writer
+        self.drops = AtomicCounter()
+        self.logger = logging.getLogger("EventStore")
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._local = threading.local()
+        self._thread: Optional[threading.Thread] = None
+        conn = self._connect()
+        try:
+            if not read_only:
+                conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @property
+    def dropped(self) -> int:
+        """Events lost to a full queue or a failed write"""
+        return self.drops.value
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            # mode=ro fails on a missing file instead of creating it, and never writes
+            return sqlite3.connect(f"{Path(self.path).absolute().as_uri()}?mode=ro", uri=True, timeout=30.0)
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """One read connection per thread (sqlite3 connections are not shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def start(self) -> 'EventStore':
+        """Start the background writer"""
+        if self.read_only:
+            raise RuntimeError(f"EventStore {self.path} is open read-only")
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="EventStore", daemon=True)
+            self._thread.start()
+        return self
+
+    def record(self, event: QueryEvent):
+        """Queue an event for writing; usable directly as an agent listener"""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.drops.increment()
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = [first]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(item is _STOP for item in batch)
+                rows = [_row(item) for item in batch if item is not _STOP]
+                try:
+                    if rows:
+                        with conn:
+                            conn.executemany(INSERT, rows)
+                        self.written += len(rows)
+                except sqlite3.Error:
+                    self.logger.exception(f"Dropped a batch of {len(rows)} events")
+                    self.drops.increment(len(rows))
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Block until every event queued so far has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            raise RuntimeError("EventStore writer is not running; call start() first")
+        self._queue.join()
+
+    def close(self):
+        """Write what is queued, then stop the writer"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+
+    def _grouped(self, start: Optional[float], end: Optional[float], columns: List[str]) -> List[tuple]:
+        """Raw (group keys..., count, escalations, resolved, errors, latency sum, latency max, products) rows"""
+        unknown = [c for c in columns if c not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot group by {unknown}; choose from {sorted(GROUP_COLUMNS)}")
+        keys = ', '.join(f"{GROUP_COLUMNS[c]} AS {c}" for c in columns)
+        sql = (f"SELECT {keys}, COUNT(*), SUM(escalated), SUM(resolved), SUM(outcome = 'error'), "
+               f"SUM(latency_ms), MAX(latency_ms), SUM(products) FROM events "
+               f"WHERE ts >= ? AND ts < ? GROUP BY {', '.join(columns)} ORDER BY COUNT(*) DESC")
+        params = (start if start is not None else float('-inf'), end if end is not None else float('inf'))
+        return self._reader().execute(sql, params).fetchall()
+
+    def aggregate(self, start: Optional[float] = None, end: Optional[float] = None,
+                  group_by: Union[str, Sequence[str]] = 'agent') -> List[Dict[str, Any]]:
+        """Counts, rates and latency over [start, end), grouped by one or more GROUP_COLUMNS"""
+        columns = [group_by] if isinstance(group_by, str) else list(group_by)
+        results = []
+        for row in self._grouped(start, end, columns):
+            count, escalations, resolved, errors, latency_total, latency_max, products = row[len(columns):]
+            result = dict(zip(columns, row))
+            result.update({
+                'count': count,
+                'escalations': escalations,
+                'resolved': resolved,
+                'errors': errors,
+                'resolution_rate': round(100 * resolved / count, 1),
+                'escalation_rate': round(100 * escalations / count, 1),
+                'avg_latency_ms': round(latency_total / count, 2),
+                'max_latency_ms': round(latency_max, 2),
+                'products': products,
+            })
+            results.append(result)
+        return results
+
+    def totals(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-agent summaries plus 'all', in the same shape as EventAggregator.totals"""
+        # One scan grouped by every dimension, folded into per-agent rollups here
+        rollups: Dict[str, Rollup] = {}
+        for agent, outcome, sentiment, category, *values in self._grouped(
+                start, end, ['agent', 'outcome', 'sentiment', 'category']):
+            count, escalations, resolved, errors, latency_total, latency_max, products = values
+            rollup = rollups.get(agent)
+            if rollup is None:
+                rollup = rollups[agent] = Rollup()
+            rollup.count += count
+            rollup.escalations += escalations
+            rollup.resolved += resolved
+            rollup.errors += errors
+            rollup.latency_total += latency_total
+            rollup.latency_max = max(rollup.latency_max, latency_max)
+            rollup.products += products
+            for tally, key in ((rollup.outcomes, outcome), (rollup.sentiments, sentiment),
+                               (rollup.categories, category)):
+                if key is not None:
+                    tally[key] = tally.get(key, 0) + count
+        overall = Rollup()
+        for rollup in rollups.values():
+            overall.merge(rollup)
+        summaries = {agent: rollup.summary() for agent, rollup in rollups.items()}
+        summaries['all'] = overall.summary()
+        return summaries
+
+    def iter_events(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[QueryEvent]:
+        """Stored events in [start, end), oldest first, read lazily through a cursor"""
+        params = (start if start is not None else float('-inf'), end if end is not None else float('inf'))
+        cursor = self._reader().execute(
+            "SELECT ts, agent, outcome, escalated, sentiment, latency_ms, product_ids, category "
+            "FROM events WHERE ts >= ? AND ts < ? ORDER BY ts", params)
+        for ts, agent, outcome, escalated, sentiment, latency_ms, product_ids, category in cursor:
+            yield QueryEvent(ts, agent, outcome, bool(escalated), sentiment, latency_ms,
+                             tuple(product_ids.split(',')) if product_ids else (), category)
+
+    def count(self) -> int:
+        """Events written so far (across restarts)"""
+        return self._reader().execute("SELECT COUNT(*) FROM events").fetchone()[0]
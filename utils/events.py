@@ -0,0 +1,212 @@
+"""Events - Per-query events and time-bucketed rollups"""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Outcomes that did not answer the user's question
+UNRESOLVED_OUTCOMES = frozenset(['general', 'error', 'escalation'])
+
+
+class QueryEvent(NamedTuple):
+    """What one process_query call did, small enough to emit on every request"""
+    timestamp: float
+    agent: str
+    outcome: str
+    escalated: bool
+    sentiment: Optional[str]
+    latency_ms: float
+    product_ids: Tuple[str, ...]
+    category: Optional[str]
+
+    @property
+    def resolved(self) -> bool:
+        return not self.escalated and self.outcome not in UNRESOLVED_OUTCOMES
+
+    @classmethod
+    def from_response(cls, agent: str, response: Optional[Dict[str, Any]], latency_ms: float,
+                      timestamp: Optional[float] = None) -> 'QueryEvent':
+        """Build an event from an agent reply; a None response records an error"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if response is None:
+            return cls(timestamp, agent, 'error', False, None, latency_ms, (), None)
+        sentiment = response.get('sentiment')
+        return cls(
+            timestamp,
+            agent,
+            response.get('type', 'unknown'),
+            bool(response.get('escalate')),
+            sentiment.get('sentiment') if isinstance(sentiment, dict) else None,
+            latency_ms,
+            tuple(p['id'] for p in response.get('products', ()) if 'id' in p),
+            response.get('category') or response.get('content_type')
+        )
+
+
+class Rollup:
+    """Running totals for one agent over one time bucket"""
+    __slots__ = ('count', 'errors', 'escalations', 'resolved', 'latency_total', 'latency_max',
+                 'products', 'outcomes', 'sentiments', 'categories')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.escalations = 0
+        self.resolved = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.products = 0
+        self.outcomes: Dict[str, int] = {}
+        self.sentiments: Dict[str, int] = {}
+        self.categories: Dict[str, int] = {}
+
+    def add(self, event: QueryEvent):
+        """Fold one event into the totals"""
+        self.count += 1
+        if event.outcome == 'error':
+            self.errors += 1
+        if event.escalated:
+            self.escalations += 1
+        if event.resolved:
+            self.resolved += 1
+        self.latency_total += event.latency_ms
+        if event.latency_ms > self.latency_max:
+            self.latency_max = event.latency_ms
+        self.products += len(event.product_ids)
+        self.outcomes[event.outcome] = self.outcomes.get(event.outcome, 0) + 1
+        if event.sentiment:
+            self.sentiments[event.sentiment] = self.sentiments.get(event.sentiment, 0) + 1
+        if event.category:
+            self.categories[event.category] = self.categories.get(event.category, 0) + 1
+
+    def merge(self, other: 'Rollup'):
+        """Add another rollup's totals into this one"""
+        self.count += other.count
+        self.errors += other.errors
+        self.escalations += other.escalations
+        self.resolved += other.resolved
+        self.latency_total += other.latency_total
+        self.latency_max = max(self.latency_max, other.latency_max)
+        self.products += other.products
+        for mine, theirs in ((self.outcomes, other.outcomes), (self.sentiments, other.sentiments),
+                             (self.categories, other.categories)):
+            for key, n in theirs.items():
+                mine[key] = mine.get(key, 0) + n
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus derived rates (percent) and mean latency"""
+        count = self.count
+        return {
+            'count': count,
+            'errors': self.errors,
+            'escalations': self.escalations,
+            'resolved': self.resolved,
+            'resolution_rate': round(100 * self.resolved / count, 1) if count else 0.0,
+            'escalation_rate': round(100 * self.escalations / count, 1) if count else 0.0,
+            'avg_latency_ms': round(self.latency_total / count, 2) if count else 0.0,
+            'max_latency_ms': round(self.latency_max, 2),
+            'products': self.products,
+            'outcomes': dict(self.outcomes),
+            'sentiments': dict(self.sentiments),
+            'categories': dict(self.categories),
+            'top_category': max(self.categories, key=self.categories.get) if self.categories else None
+        }
+
+
+class RollupRing:
+    """Fixed number of time buckets of fixed width, reused in a ring.
+
+    A bucket is addressed by (timestamp // width) % size and remembers which
+    period it holds, so a slot left over from an earlier lap is reset on
+    first write and skipped by reads. Memory and read cost are O(size).
+    """
+
+    def __init__(self, width: float, size: int):
+        self.width = width
+        self.size = size
+        self._periods: List[int] = [-1] * size
+        self._buckets: List[Dict[str, Rollup]] = [{} for _ in range(size)]
+
+    def add(self, event: QueryEvent):
+        period = int(event.timestamp // self.width)
+        slot = period % self.size
+        if self._periods[slot] != period:
+            self._periods[slot] = period
+            self._buckets[slot] = {}
+        bucket = self._buckets[slot]
+        rollup = bucket.get(event.agent)
+        if rollup is None:
+            rollup = bucket[event.agent] = Rollup()
+        rollup.add(event)
+
+    def totals(self, now: float, periods: Optional[int] = None) -> Dict[str, Rollup]:
+        """Per-agent totals over the last `periods` buckets (all of them by default)"""
+        current = int(now // self.width)
+        oldest = current - min(periods or self.size, self.size) + 1
+        merged: Dict[str, Rollup] = {}
+        for period, bucket in zip(self._periods, self._buckets):
+            if oldest <= period <= current:
+                for agent, rollup in bucket.items():
+                    merged.setdefault(agent, Rollup()).merge(rollup)
+        return merged
+
+    def series(self, now: float, agent: Optional[str] = None) -> List[Tuple[float, int]]:
+        """(bucket start, event count) for every bucket in the window, oldest first"""
+        current = int(now // self.width)
+        points = []
+        for period in range(current - self.size + 1, current + 1):
+            slot = period % self.size
+            count = 0
+            if self._periods[slot] == period:
+                bucket = self._buckets[slot]
+                rollups = bucket.values() if agent is None else [bucket[agent]] if agent in bucket else []
+                count = sum(r.count for r in rollups)
+            points.append((period * self.width, count))
+        return points
+
+
+class EventAggregator:
+    """In-process rollups of QueryEvents per minute, hour and day.
+
+    record() is the listener agents publish to; it updates one bucket in
+    each ring. Reads merge at most size buckets, never replay events.
+    """
+
+    WINDOWS = MappingProxyType({
+        'minute': (60.0, 60),         # last hour, by minute
+        'hour': (3600.0, 24),         # last day, by hour
+        'day': (86400.0, 30),         # last 30 days, by day
+    })
+
+    def __init__(self):
+        self.rings = {name: RollupRing(width, size) for name, (width, size) in self.WINDOWS.items()}
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def record(self, event: QueryEvent):
+        """Add one event to every ring"""
+        with self._lock:
+            self.events += 1
+            for ring in self.rings.values():
+                ring.add(event)
+
+    def totals(self, window: str = 'hour', periods: Optional[int] = None,
+               now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-agent summaries plus an 'all' entry over one ring's window"""
+        now = time.time() if now is None else now
+        with self._lock:
+            merged = self.rings[window].totals(now, periods)
+        overall = Rollup()
+        for rollup in merged.values():
+            overall.merge(rollup)
+        summaries = {agent: rollup.summary() for agent, rollup in merged.items()}
+        summaries['all'] = overall.summary()
+        return summaries
+
+    def series(self, window: str = 'minute', agent: Optional[str] = None,
+               now: Optional[float] = None) -> List[Tuple[float, int]]:
+        """Event counts per bucket, for charts"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self.rings[window].series(now, agent)
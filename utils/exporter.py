@@ -0,0 +1,144 @@
+"""Exporter - Streaming NDJSON export of chat sessions and stored events"""
+
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:  # zstd export is optional
+    zstandard = None
+
+# Response fields kept in compact mode; everything else in 'data' is dropped
+COMPACT_FIELDS = ('type', 'escalate', 'ticket_number', 'category', 'faq_key', 'content_type', 'agent_type')
+
+EXTENSIONS = {'none': '.ndjson', 'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst'}
+MIME_TYPES = {'none': 'application/x-ndjson', 'gzip': 'application/gzip', 'zstd': 'application/zstd'}
+
+
+def available_compressions() -> List[str]:
+    """Compression options usable in this environment"""
+    return [c for c in EXTENSIONS if c != 'zstd' or zstandard is not None]
+
+
+@contextmanager
+def open_output(target: Union[str, IO[bytes]], compression: str = 'none') -> Iterator[IO[bytes]]:
+    """Binary writer for a path or an open binary file, compressing on the fly"""
+    if compression not in EXTENSIONS:
+        raise ValueError(f"Unknown compression {compression!r}; choose from {sorted(EXTENSIONS)}")
+    if compression == 'zstd' and zstandard is None:
+        raise ImportError("zstd export requires the 'zstandard' package")
+
+    owns = isinstance(target, str)
+    raw = open(target, 'wb') if owns else target
+    try:
+        if compression == 'gzip':
+            with gzip.GzipFile(fileobj=raw, mode='wb') as writer:
+                yield writer
+        elif compression == 'zstd':
+            with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as writer:
+                yield writer
+        else:
+            yield raw
+    finally:
+        if owns:
+            raw.close()
+
+
+def message_record(message: Dict[str, Any], seq: int, session_id: Optional[str] = None,
+                   compact: bool = False) -> Dict[str, Any]:
+    """One export line for a chat message; compact mode keeps only small response fields"""
+    record = {'session': session_id, 'seq': seq, 'role': message['role'], 'content': message['content']}
+    if 'response_time_ms' in message:
+        record['response_time_ms'] = message['response_time_ms']
+    data = message.get('data')
+    if data:
+        if compact:
+            record.update({field: data[field] for field in COMPACT_FIELDS if field in data})
+            if data.get('products'):
+                record['product_ids'] = [p['id'] for p in data['products'] if 'id' in p]
+        else:
+            record['data'] = data
+    return record
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], writer: IO[bytes]) -> int:
+    """Encode and write records one line at a time; returns the number written"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+    written = 0
+    for record in records:
+        writer.write(encode(record).encode('utf-8'))
+        writer.write(b'\n')
+        written += 1
+    return written
+
+
+def export_sessions(sessions: Iterable[Tuple[Optional[str], Iterable[Dict[str, Any]]]],
+                    target: Union[str, IO[bytes]], compression: str = 'none', compact: bool = False) -> int:
+    """Stream many (session_id, messages) pairs into one NDJSON file; returns lines written.
+
+    Sessions and their messages may be lazy iterables: only one message is
+    encoded at a time, so memory does not grow with the size of the export.
+    """
+    def records():
+        for session_id, messages in sessions:
+            for seq, message in enumerate(messages):
+                yield message_record(message, seq, session_id, compact)
+
+    with open_output(target, compression) as writer:
+        return write_ndjson(records(), writer)
+
+
+def export_messages(messages: Iterable[Dict[str, Any]], target: Union[str, IO[bytes]],
+                    compression: str = 'none', compact: bool = False, session_id: Optional[str] = None) -> int:
+    """Stream one session's messages into an NDJSON file"""
+    return export_sessions([(session_id, messages)], target, compression, compact)
+
+
+def export_events(store, target: Union[str, IO[bytes]], start: Optional[float] = None,
+                  end: Optional[float] = None, compression: str = 'none') -> int:
+    """Stream persisted QueryEvents from an EventStore, reading them with a cursor"""
+    with open_output(target, compression) as writer:
+        return write_ndjson((event._asdict() for event in store.iter_events(start, end)), writer)
+
+
+def export_bytes(messages: Iterable[Dict[str, Any]], compression: str = 'none', compact: bool = False,
+                 session_id: Optional[str] = None) -> bytes:
+    """One session as NDJSON bytes, e.g. for a download button"""
+    buffer = io.BytesIO()
+    export_messages(messages, buffer, compression, compact, session_id)
+    return buffer.getvalue()
+
+
+def main(argv=None) -> int:
+    """Export a persisted event store: python -m utils.exporter data/events.db -o events.ndjson.gz"""
+    import argparse
+    import os
+    import sys
+    import time
+    from utils.event_store import EventStore
+
+    parser = argparse.ArgumentParser(description="Stream stored query events to NDJSON")
+    parser.add_argument('database', help="EventStore SQLite file")
+    parser.add_argument('-o', '--output', required=True, help="output file")
+    parser.add_argument('--compression', choices=available_compressions(), default=None,
+                        help="default: inferred from the output extension")
+    parser.add_argument('--since-hours', type=float, default=None, help="only events newer than this")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        parser.error(f"{args.database} does not exist")
+    compression = args.compression or next(
+        (c for c, ext in EXTENSIONS.items() if c != 'none' and args.output.endswith(ext)), 'none')
+    start = time.time() - args.since_hours * 3600 if args.since_hours else None
+    # Read-only: exporting never creates tables or contends with a live app's writer
+    store = EventStore(args.database, read_only=True)
+    written = export_events(store, args.output, start=start, compression=compression)
+    print(f"Exported {written:,} events to {args.output} ({compression})", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+"""FAQ Index - Inverted index with BM25 ranking"""
+
+import heapq
+import math
+import re
+from typing import Any, Dict, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does',
+    'for', 'from', 'have', 'how', 'i', 'in', 'is', 'it', 'me', 'my', 'of',
+    'on', 'or', 'our', 's', 'the', 'this', 'to', 'we', 'what', 'when',
+    'which', 'with', 'you', 'your'
+])
+
+
+def stem(token: str) -> str:
+    """Very light suffix stripping so 'shipping', 'ships' and 'ship' share a term"""
+    if len(token) > 5 and token.endswith('ing'):
+        token = token[:-3]
+        if len(token) > 2 and token[-1] == token[-2] and token[-1] not in 'lsz':
+            token = token[:-1]
+    elif len(token) > 4 and token.endswith('ed'):
+        token = token[:-2]
+    elif len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem"""
+    return [stem(tok) for tok in TOKEN_PATTERN.findall(text.lower()) if tok not in STOPWORDS]
+
+
+class FAQIndex:
+    """Tokenized inverted index over FAQ question, answer and keywords.
+
+    Each field contributes to a document's term frequency with its own
+    weight, and documents are scored with Okapi BM25. A query only walks the
+    postings of its own terms, so cost tracks postings touched rather than
+    the number of FAQs.
+    """
+
+    FIELD_WEIGHTS = {'question': 2.0, 'answer': 1.0, 'keywords': 3.0}
+
+    def __init__(self, faqs: Dict[str, Dict] = None, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.keys: List[str] = []
+        self.faqs: Dict[str, Dict] = {}
+        self.postings: Dict[str, List[tuple]] = {}
+        self.doc_lengths: List[float] = []
+        self.avg_doc_length = 0.0
+        self.idf: Dict[str, float] = {}
+
+        if faqs:
+            for key, faq in faqs.items():
+                self.add(key, faq)
+            self.finalize()
+
+    def finalize(self):
+        """Compute corpus statistics once all documents have been added"""
+        self.avg_doc_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+        total = len(self.keys)
+        self.idf = {
+            term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, faq: Dict):
+        """Tokenize one FAQ's fields and append its postings; call finalize() after the last one"""
+        doc_id = len(self.keys)
+        self.keys.append(key)
+        self.faqs[key] = faq
+
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        fields = {
+            'question': faq.get('question', ''),
+            'answer': faq.get('answer', ''),
+            'keywords': ' '.join(faq.get('keywords', [])),
+        }
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+
+        for term, tf in frequencies.items():
+            self.postings.setdefault(term, []).append((doc_id, tf))
+        self.doc_lengths.append(length)
+
+    def score(self, query: str) -> Dict[int, float]:
+        """Accumulate BM25 scores for every document sharing a term with query"""
+        return self._score(query)[0]
+
+    def _score(self, query: str) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """BM25 scores and the number of distinct query terms matched, per document"""
+        scores: Dict[int, float] = {}
+        hits: Dict[int, int] = {}
+        k1, b = self.k1, self.b
+        avg = self.avg_doc_length or 1.0
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf.get(term, 0.0)
+            for doc_id, tf in docs:
+                norm = k1 * (1 - b + b * self.doc_lengths[doc_id] / avg)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+                hits[doc_id] = hits.get(doc_id, 0) + 1
+        return scores, hits
+
+    def search(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """Return the top-k FAQs for query, best first; 'terms' counts the distinct query terms each matched"""
+        scores, hits = self._score(query)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        results = []
+        for doc_id, score in top:
+            key = self.keys[doc_id]
+            faq = self.faqs[key]
+            results.append({
+                'key': key,
+                'question': faq.get('question', ''),
+                'category': faq.get('category', 'general'),
+                'score': round(score, 4),
+                'terms': hits[doc_id]
+            })
+        return results
@@ -0,0 +1,296 @@
+"""Fuzzy Index - Character trigram index for typo-tolerant word lookup"""
+
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Collection, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from utils.lazy_import import optional_module
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+GRAM = 3
+
+# Vocabulary size from which candidates are counted with NumPy; smaller indexes use
+# collections.Counter, which is as fast there and keeps NumPy out of their import
+NUMPY_MIN_WORDS = 1_000
+
+# Distinct words whose correction correct() remembers before starting over
+CORRECTION_CACHE_SIZE = 10_000
+
+# Grams one edit can break: a substitution, insertion or deletion breaks up to GRAM, a swap GRAM + 1
+GRAMS_PER_EDIT = GRAM + 1
+
+# Characters of indexed words (TOKEN_PATTERN), in letter histogram column order
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+ALPHABET_COLUMNS = {char: column for column, char in enumerate(ALPHABET)}
+
+
+def grams(word: str) -> List[str]:
+    """Padded trigrams of a word; repeats are numbered so counts behave like a multiset"""
+    padded = f"  {word} "
+    seen: Dict[str, int] = {}
+    result = []
+    for i in range(len(padded) - GRAM + 1):
+        gram = padded[i:i + GRAM]
+        n = seen.get(gram, 0)
+        seen[gram] = n + 1
+        result.append(gram if not n else f"{gram}{n}")
+    return result
+
+
+def _mask(np, letters):
+    """Bitmask of the characters present in each histogram row"""
+    return ((letters > 0).astype(np.uint64) << np.arange(letters.shape[1], dtype=np.uint64)).sum(
+        axis=1, dtype=np.uint64)
+
+
+def default_max_distance(word: str) -> int:
+    """Typos allowed for a word of this length: none under 4 letters, one up to 7, then two"""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count once), or limit + 1 once it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # A common prefix and suffix never need editing; a typo usually leaves only a letter or two
+    start = 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if not a or not b:
+        return len(a) + len(b) if len(a) + len(b) <= limit else limit + 1
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        ca = a[i - 1]
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cb = b[j - 1]
+            value = previous[j - 1] if ca == cb else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class FuzzyIndex:
+    """Words indexed by character trigrams, each carrying the labels it came from.
+
+    Words are numbered in length order, so every posting list is sorted by
+    word length and the words that could be within k edits of a query
+    (length difference at most k) are one bisected slice of each list.
+    Shared grams are counted over those slices only (np.bincount when NumPy
+    is installed and the vocabulary is large). Each edit breaks at most four grams (a swap; other edits
+    three), so a word sharing s grams is at least ceil((grams - s) / 4)
+    edits away. Candidates are verified with a bounded edit distance in
+    order of that lower bound and the search stops as soon as no remaining
+    candidate can beat the matches found, so a lookup never scans the
+    whole vocabulary. A word allowed two edits is searched within one edit
+    first (a third of the length range, far fewer candidates) and only
+    searched again within two when that finds fewer than k words.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, Hashable]] = ()):
+        # Labels per word as dict keys: deduplicated in first-seen order
+        labels: Dict[str, Dict[Hashable, None]] = {}
+        for text, label in terms:
+            for word in TOKEN_PATTERN.findall(text.lower()):
+                labels.setdefault(word, {})[label] = None
+        self.words: List[str] = sorted(labels, key=lambda word: (len(word), word))
+        self._ids: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+        self._labels: List[Tuple[Hashable, ...]] = [tuple(labels[word]) for word in self.words]
+        postings: Dict[str, List[int]] = {}
+        for i, word in enumerate(self.words):
+            for gram in grams(word):
+                postings.setdefault(gram, []).append(i)
+        self._np = np = optional_module('numpy') if len(self.words) >= NUMPY_MIN_WORDS else None
+        self._postings = postings if np is None else {
+            gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._corrections: Dict[str, Optional[str]] = {}
+        self._lengths = self._letters = self._masks = None
+        if np is not None:
+            self._lengths = np.array([len(word) for word in self.words], dtype=np.int32)
+            self._letters = self._letter_counts(np, self.words)
+            if hasattr(np, 'bitwise_count'):  # NumPy 2
+                self._masks = _mask(np, self._letters)
+        # _length_starts[n] is the id of the first word of length >= n, up to one past the longest
+        self._length_starts: List[int] = [0]
+        for i, word in enumerate(self.words):
+            while len(self._length_starts) <= len(word):
+                self._length_starts.append(i)
+        self._length_starts.append(len(self.words))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._ids
+
+    def labels(self, word: str) -> Tuple[Hashable, ...]:
+        """Labels of an indexed word (empty if it isn't one)"""
+        i = self._ids.get(word)
+        return self._labels[i] if i is not None else ()
+
+    @staticmethod
+    def _letter_counts(np, words: List[str]):
+        """Per-word character histograms over ALPHABET, one row per word; other characters are not counted"""
+        counts = np.zeros((len(words), len(ALPHABET)), dtype=np.int16)
+        rows, codes = [], []
+        for row, word in enumerate(words):
+            for char in word:
+                column = ALPHABET_COLUMNS.get(char)
+                if column is not None:
+                    rows.append(row)
+                    codes.append(column)
+        np.add.at(counts, (rows, codes), 1)
+        return counts
+
+    def _id_range(self, length: int, max_distance: int) -> Tuple[int, int]:
+        """Ids of the words whose length is within max_distance of length"""
+        starts = self._length_starts
+        last = len(starts) - 1
+        return starts[min(max(length - max_distance, 0), last)], starts[min(length + max_distance + 1, last)]
+
+    def _candidates(self, word: str, query_grams: List[str], lo: int, hi: int,
+                    max_distance: int) -> List[Tuple[int, int, int]]:
+        """(edit distance lower bound, -shared grams, id) for every word in [lo, hi) that could be close enough"""
+        postings = self._postings
+        np = self._np
+        if np is not None:
+            slices = []
+            for gram in query_grams:
+                posting = postings.get(gram)
+                if posting is not None:
+                    slices.append(posting[posting.searchsorted(lo):posting.searchsorted(hi)])
+            ids = np.concatenate(slices) - lo if slices else np.zeros(0, dtype=np.int32)
+            shared = np.bincount(ids, minlength=hi - lo)
+            threshold = len(query_grams) - GRAMS_PER_EDIT * max_distance
+            close = np.flatnonzero(shared >= threshold) if threshold > 0 else np.arange(hi - lo)
+            shared = shared[close]
+            close += lo
+            bounds = (np.maximum(len(query_grams), self._lengths[close] + 1) - shared
+                      + GRAMS_PER_EDIT - 1) // GRAMS_PER_EDIT
+            # Each edit adds at most one character and removes at most one (a swap neither), so
+            # the characters one word has and the other lacks bound the distance from below:
+            # first as sets of distinct characters (cheap bitmasks), then as histograms
+            letters = np.bincount([ALPHABET_COLUMNS[char] for char in word if char in ALPHABET_COLUMNS],
+                                  minlength=len(ALPHABET)).astype(np.int16)[None, :]
+            if self._masks is not None:
+                query_mask = np.uint64(_mask(np, letters)[0])
+                masks = self._masks[close]
+                bounds = np.maximum(bounds, np.maximum(np.bitwise_count(masks & ~query_mask),
+                                                       np.bitwise_count(query_mask & ~masks)))
+                keep = bounds <= max_distance
+                close, shared, bounds = close[keep], shared[keep], bounds[keep]
+            difference = self._letters[close] - letters[0]
+            bounds = np.maximum(bounds, np.maximum(np.clip(difference, 0, None).sum(axis=1),
+                                                   np.clip(-difference, 0, None).sum(axis=1)))
+            keep = bounds <= max_distance
+            return list(zip(bounds[keep].tolist(), (-shared[keep]).tolist(), close[keep].tolist()))
+
+        counts: Counter = Counter()
+        for gram in query_grams:
+            posting = postings.get(gram)
+            if posting:
+                counts.update(posting[bisect_left(posting, lo):bisect_left(posting, hi)])
+        words = self.words
+        if len(query_grams) - GRAMS_PER_EDIT * max_distance <= 0:
+            # A short word with many allowed edits may share no gram with a match
+            counts.update(dict.fromkeys(range(lo, hi), 0))
+        candidates = []
+        for i, shared in counts.items():
+            bound = -(-(max(len(query_grams), len(words[i]) + 1) - shared) // GRAMS_PER_EDIT)
+            if bound <= max_distance:
+                candidates.append((bound, -shared, i))
+        return candidates
+
+    def search(self, word: str, max_distance: Optional[int] = None, k: int = 5) -> List[Tuple[str, int]]:
+        """Up to k indexed words within max_distance edits of word, as (word, distance), closest first"""
+        word = word.lower()
+        if max_distance is None:
+            max_distance = default_max_distance(word)
+        if not self.words or k < 1:
+            return []
+        if max_distance == 0:
+            return [(word, 0)] if word in self._ids else []
+
+        query_grams = grams(word)
+        # Most typos are one edit: a search within fewer edits covers a narrower length range
+        # and keeps fewer candidates, and when it already finds k words the wider one can't beat them
+        for distance in range(1, max_distance + 1):
+            found = self._search(word, query_grams, distance, k)
+            if len(found) >= k:
+                break
+        return found
+
+    def _search(self, word: str, query_grams: List[str], max_distance: int, k: int) -> List[Tuple[str, int]]:
+        """Up to k indexed words within max_distance edits of word, closest first"""
+        lo, hi = self._id_range(len(word), max_distance)
+        candidates = self._candidates(word, query_grams, lo, hi, max_distance)
+        candidates.sort()
+        words = self.words
+        found: List[Tuple[int, int, str]] = []
+        limit = max_distance
+        for bound, neg_shared, i in candidates:
+            if bound > limit:
+                break
+            candidate = words[i]
+            distance = edit_distance(word, candidate, limit)
+            if distance > limit:
+                continue
+            found.append((distance, neg_shared, candidate))
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                # Only strictly closer words can still make the list
+                limit = found[-1][0] - 1
+        found.sort()
+        return [(candidate, distance) for distance, _, candidate in found]
+
+    def best(self, word: str, max_distance: Optional[int] = None) -> Optional[str]:
+        """The closest indexed word, or None if nothing is within max_distance"""
+        found = self.search(word, max_distance, k=1)
+        return found[0][0] if found else None
+
+    def correct(self, text: str, skip: Collection[str] = ()) -> Tuple[str, Dict[str, str]]:
+        """text with unknown words replaced by their closest indexed word, and the replacements made.
+
+        Words in skip (e.g. stopwords) and words already indexed are kept.
+        Lookups are remembered, so repeated queries cost dict hits.
+        """
+        text = text.lower()
+        cache = self._corrections
+        corrections: Dict[str, str] = {}
+        for token in TOKEN_PATTERN.findall(text):
+            if token in self._ids or token in skip or token in corrections:
+                continue
+            fix = cache.get(token, False)
+            if fix is False:
+                if len(cache) >= CORRECTION_CACHE_SIZE:
+                    cache.clear()
+                fix = cache[token] = self.best(token)
+            if fix is not None:
+                corrections[token] = fix
+        if not corrections:
+            return text, corrections
+        return TOKEN_PATTERN.sub(lambda match: corrections.get(match.group(0), match.group(0)), text), corrections
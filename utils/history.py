@@ -0,0 +1,158 @@
+"""History - Bounded per-session conversation history"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Hashable, Iterator, List, Optional
+
+DEFAULT_SESSION = 'default'
+
+# Session of the request running in this thread or task; set by the hub and batch mode
+_current_session: ContextVar[Hashable] = ContextVar('session_id', default=DEFAULT_SESSION)
+
+
+def current_session() -> Hashable:
+    """Session id of the request being processed (DEFAULT_SESSION outside any scope)"""
+    return _current_session.get()
+
+
+@contextmanager
+def session_scope(session_id: Optional[Hashable]):
+    """Run a block as part of one session: `with session_scope(sid): agent.process_query(q)`"""
+    token = _current_session.set(DEFAULT_SESSION if session_id is None else session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+class Message:
+    """One history entry; __slots__ keeps it to a few pointers and a float"""
+    __slots__ = ('role', 'content', 'timestamp')
+
+    def __init__(self, role: str, content: str, timestamp: float):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+
+    def as_dict(self) -> Dict[str, str]:
+        """The legacy dict shape, with an ISO timestamp"""
+        return {
+            'role': self.role,
+            'content': self.content,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+    def __repr__(self) -> str:
+        return f"Message({self.role!r}, {self.content[:40]!r}, {self.timestamp:.3f})"
+
+
+class RingBuffer:
+    """Fixed-capacity buffer: O(1) append, the oldest entry is overwritten when full"""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._slots: List[Optional[Message]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, message: Message):
+        """Add a message, evicting the oldest one if the buffer is full"""
+        if self._size == self.capacity:
+            self.evicted += 1
+        else:
+            self._size += 1
+        self._slots[self._next] = message
+        self._next = (self._next + 1) % self.capacity
+
+    def __iter__(self) -> Iterator[Message]:
+        """Oldest to newest"""
+        start = (self._next - self._size) % self.capacity
+        for i in range(self._size):
+            yield self._slots[(start + i) % self.capacity]
+
+    def recent(self, n: int) -> List[Message]:
+        """The last n messages, oldest first"""
+        n = min(n, self._size)
+        return [self._slots[(self._next - n + i) % self.capacity] for i in range(n)]
+
+    def clear(self):
+        """Drop every message"""
+        self._slots = [None] * self.capacity
+        self._next = 0
+        self._size = 0
+
+
+class SessionHistory:
+    """Conversation history kept per session, bounded in both directions.
+
+    Each session holds at most `capacity` messages, and at most
+    `max_sessions` sessions are kept; the least recently used session is
+    dropped first. Memory is therefore capped no matter how long the
+    process runs or how many sessions it serves.
+    """
+
+    def __init__(self, capacity: int = 100, max_sessions: int = 1000):
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[Hashable, RingBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted_sessions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def append(self, role: str, content: str, session_id: Hashable = DEFAULT_SESSION,
+               timestamp: Optional[float] = None):
+        """Record one message for a session"""
+        message = Message(role, content, time.time() if timestamp is None else timestamp)
+        with self._lock:
+            buffer = self._sessions.get(session_id)
+            if buffer is None:
+                buffer = self._sessions[session_id] = RingBuffer(self.capacity)
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted_sessions += 1
+            else:
+                self._sessions.move_to_end(session_id)
+            buffer.append(message)
+
+    def get(self, session_id: Hashable = DEFAULT_SESSION, last: Optional[int] = None) -> List[Message]:
+        """A session's messages (or its last n), oldest first"""
+        with self._lock:
+            buffer = self._sessions.get(session_id)
+            if buffer is None:
+                return []
+            return buffer.recent(last) if last is not None else list(buffer)
+
+    def session_ids(self) -> List[Hashable]:
+        """Sessions currently held, least recently used first"""
+        with self._lock:
+            return list(self._sessions)
+
+    def clear(self, session_id: Optional[Hashable] = None):
+        """Forget one session, or every session if none is given"""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Session and message counts, including how many were evicted"""
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'messages': sum(len(b) for b in self._sessions.values()),
+                'evicted_messages': sum(b.evicted for b in self._sessions.values()),
+                'evicted_sessions': self.evicted_sessions
+            }
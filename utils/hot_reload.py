@@ -0,0 +1,107 @@
+"""Hot Reload - Watch data files and reload agents when they change"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("DataWatcher")
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DataWatcher:
+    """Background thread that reloads an agent when one of its data files changes.
+
+    Each file is polled by (mtime, size); only when that changes is the file
+    hashed, and only a new content hash triggers agent.reload(). Reloads run
+    on the watcher thread, off the request path. A reload that fails (e.g. a
+    half-written file) keeps the old data and is retried when the file
+    changes again.
+    """
+
+    def __init__(self, agents: Iterable, interval: float = 2.0):
+        self.agents: list = []
+        self.interval = interval
+        self._state: Dict[str, Tuple[Optional[tuple], Optional[str]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for agent in agents:
+            self.watch(agent)
+
+    def watch(self, agent):
+        """Start watching an agent's data files, from their current state"""
+        for path in agent.data_files:
+            self._state[path] = (self._stat(path), self._digest(path))
+        self.agents.append(agent)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    @staticmethod
+    def _digest(path: str) -> Optional[str]:
+        try:
+            return file_digest(path)
+        except OSError:
+            return None
+
+    def check_once(self) -> list:
+        """Poll every watched file once; return the names of agents reloaded"""
+        reloaded = []
+        # A copy: agents constructed later are added from other threads
+        for agent in list(self.agents):
+            changed = {}
+            for path in agent.data_files:
+                stat = self._stat(path)
+                old_stat, old_digest = self._state.get(path, (None, None))
+                if stat == old_stat:
+                    continue
+                digest = self._digest(path)
+                if digest == old_digest:
+                    self._state[path] = (stat, digest)
+                    continue
+                changed[path] = (stat, digest)
+            if not changed:
+                continue
+            # Record the new state either way: a failed file is retried once it changes again
+            self._state.update(changed)
+            try:
+                elapsed_ms = agent.reload()
+            except Exception:
+                logger.exception(f"Reload of {agent.agent_name} failed; keeping previous data")
+                continue
+            reloaded.append(agent.agent_name)
+            logger.info(f"{agent.agent_name} picked up {', '.join(changed)} in {elapsed_ms:.1f}ms")
+        return reloaded
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check_once()
+
+    def start(self) -> 'DataWatcher':
+        """Start polling in a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="DataWatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,86 @@
+"""Keyword Matcher - Aho-Corasick multi-pattern search"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Find every keyword occurrence in a single pass over the text.
+
+    Keywords are compiled once into an Aho-Corasick automaton. Each keyword
+    carries a label (e.g. the FAQ key it belongs to) so callers can tell which
+    group matched without re-scanning the text per group.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]] = ()):
+        # Trie as parallel lists; state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Hashable, ...]] = [()]
+        self._size = 0
+
+        for keyword, label in keywords:
+            self._insert(keyword.lower(), label)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _insert(self, keyword: str, label: Hashable):
+        """Add one keyword to the trie"""
+        if not keyword:
+            return
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if label not in self._output[state]:
+            self._output[state] = self._output[state] + (label,)
+        self._size += 1
+
+    def _build_failure_links(self):
+        """Breadth-first pass computing failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                inherited = self._output[self._fail[next_state]]
+                if inherited:
+                    self._output[next_state] = self._output[next_state] + tuple(
+                        label for label in inherited if label not in self._output[next_state]
+                    )
+
+    def iter_matches(self, text: str):
+        """Yield the label of every keyword occurrence in text (lowercased)"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield from output[state]
+
+    def labels(self, text: str) -> Set[Hashable]:
+        """Return the set of labels whose keywords occur in text"""
+        return set(self.iter_matches(text))
+
+    def contains_any(self, text: str) -> bool:
+        """Return True as soon as any keyword occurs in text"""
+        for _ in self.iter_matches(text):
+            return True
+        return False
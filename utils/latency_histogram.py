@@ -0,0 +1,110 @@
+"""Latency Histogram - Fixed-memory log-linear histogram (HDR style)"""
+
+import math
+from typing import Dict, Iterable, List
+
+
+class LatencyHistogram:
+    """Record latencies into log-linear buckets with bounded relative error.
+
+    Values are bucketed by powers of two, and each power of two is split into
+    `sub_buckets` linear slots, so any recorded value is reported within
+    1/sub_buckets of its true value. Memory is fixed no matter how many
+    values are recorded, and histograms from different workers can be merged.
+    """
+
+    def __init__(self, min_value: float = 0.001, max_value: float = 60_000.0, sub_buckets: int = 32):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.sub_buckets = sub_buckets
+        self.magnitudes = max(1, math.ceil(math.log2(max_value / min_value)))
+        self.counts: List[int] = [0] * (self.magnitudes * sub_buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        # frexp splits value into mantissa in [0.5, 1) and a power of two in one call
+        mantissa, exponent = math.frexp(value / self.min_value)
+        if exponent > self.magnitudes:
+            return len(self.counts) - 1
+        return (exponent - 1) * self.sub_buckets + int((mantissa * 2 - 1) * self.sub_buckets) + 1
+
+    def _value_at(self, index: int) -> float:
+        """Upper edge of a bucket, in the recorded unit"""
+        if index == 0:
+            return self.min_value
+        magnitude, sub = divmod(index - 1, self.sub_buckets)
+        base = 2.0 ** magnitude
+        return (base + base * (sub + 1) / self.sub_buckets) * self.min_value
+
+    def record(self, value: float):
+        """Add one observation"""
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Fold another histogram with the same layout into this one"""
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different layouts")
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """Value at percentile p (0-100); 0.0 if nothing was recorded"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                # The last bucket also holds every value beyond max_value, so its edge says nothing
+                return self.max if i == len(self.counts) - 1 else min(self._value_at(i), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: Iterable[float]) -> List[int]:
+        """Observations at or below each of the ascending bounds, to bucket resolution"""
+        counts = []
+        seen = 0
+        end = 0
+        for bound in bounds:
+            if bound >= self.max:
+                counts.append(self.count)
+                continue
+            # Values in the last bucket may lie anywhere beyond max_value: only counted once bound >= max
+            last = min(self._index(bound), len(self.counts) - 2)
+            while end <= last:
+                seen += self.counts[end]
+                end += 1
+            counts.append(seen)
+        return counts
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, min/max and p50/p95/p99"""
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 3),
+            'min': round(self.min, 3) if self.count else 0.0,
+            'max': round(self.max, 3),
+            'p50': round(self.percentile(50), 3),
+            'p95': round(self.percentile(95), 3),
+            'p99': round(self.percentile(99), 3)
+        }
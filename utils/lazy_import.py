@@ -0,0 +1,17 @@
+"""Lazy Import - Defer heavy optional modules until they are first used"""
+
+import importlib
+from types import ModuleType
+from typing import Dict, Optional
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+
+
+def optional_module(name: str) -> Optional[ModuleType]:
+    """The named module, imported on the first call, or None if it is not installed"""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
@@ -0,0 +1,148 @@
+"""Metrics - Per-agent call counters and per-stage latency histograms"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List
+
+from utils.latency_histogram import LatencyHistogram
+
+TOTAL_STAGE = 'total'
+
+# Upper bounds (ms) of the cumulative latency buckets in snapshots and the Prometheus export
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _StageTimer:
+    """Context manager that records its elapsed time into one stage"""
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics: 'AgentMetrics', stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.stage, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class AtomicCounter:
+    """An integer counter that is safe to bump from many threads"""
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self, value: int = 0):
+        self._value = value
+        self._lock = threading.Lock()
+
+    def increment(self, amount: int = 1) -> int:
+        """Add amount and return the new value"""
+        with self._lock:
+            self._value += amount
+            return self._value
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def reset(self):
+        with self._lock:
+            self._value = 0
+
+
+class AgentMetrics:
+    """Call and error counts plus one latency histogram (ms) per stage.
+
+    Recording costs one perf_counter pair and a bucket increment under an
+    uncontended lock. Memory stays fixed however many calls are recorded,
+    so the metrics can stay on in production.
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self.calls = 0
+        self.errors = 0
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def timed(self, stage: str) -> _StageTimer:
+        """Time a block: `with metrics.timed('matching'): ...`"""
+        return _StageTimer(self, stage)
+
+    def record(self, stage: str, elapsed_ms: float):
+        """Add one stage timing in milliseconds"""
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.record(elapsed_ms)
+
+    def record_call(self, elapsed_ms: float, failed: bool = False):
+        """Count one process_query call and record its total latency"""
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.errors += 1
+            histogram = self.stages.get(TOTAL_STAGE)
+            if histogram is None:
+                histogram = self.stages[TOTAL_STAGE] = LatencyHistogram()
+            histogram.record(elapsed_ms)
+
+    def reset(self):
+        """Drop all counts and histograms"""
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.stages = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-ready counts and per-stage latency summaries"""
+        with self._lock:
+            return {
+                'agent': self.agent_name,
+                'calls': self.calls,
+                'errors': self.errors,
+                'stages': {
+                    stage: dict(histogram.summary(), sum=round(histogram.total, 3),
+                                buckets=histogram.cumulative_counts(BUCKET_BOUNDS_MS))
+                    for stage, histogram in self.stages.items()
+                }
+            }
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(snapshots: Iterable[Dict[str, Any]], prefix: str = 'agent') -> str:
+    """Render AgentMetrics snapshots in the Prometheus text exposition format.
+
+    Stage latencies are exported as histograms in seconds, with cumulative
+    buckets at BUCKET_BOUNDS_MS, and call and error counts as counters.
+    """
+    calls: List[str] = [
+        f"# HELP {prefix}_calls_total process_query calls per agent",
+        f"# TYPE {prefix}_calls_total counter",
+    ]
+    errors: List[str] = [
+        f"# HELP {prefix}_errors_total process_query calls that raised, per agent",
+        f"# TYPE {prefix}_errors_total counter",
+    ]
+    latency: List[str] = [
+        f"# HELP {prefix}_stage_duration_seconds Latency of each process_query stage",
+        f"# TYPE {prefix}_stage_duration_seconds histogram",
+    ]
+    for snapshot in snapshots:
+        agent = _escape(snapshot['agent'])
+        calls.append(f'{prefix}_calls_total{{agent="{agent}"}} {snapshot["calls"]}')
+        errors.append(f'{prefix}_errors_total{{agent="{agent}"}} {snapshot["errors"]}')
+        for stage, summary in sorted(snapshot['stages'].items()):
+            labels = f'agent="{agent}",stage="{_escape(stage)}"'
+            for bound, count in zip(BUCKET_BOUNDS_MS, summary['buckets']):
+                latency.append(f'{prefix}_stage_duration_seconds_bucket{{{labels},le="{bound / 1000:.6g}"}} {count}')
+            latency.append(f'{prefix}_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {summary["count"]}')
+            latency.append(f'{prefix}_stage_duration_seconds_sum{{{labels}}} {summary["sum"] / 1000:.6g}')
+            latency.append(f'{prefix}_stage_duration_seconds_count{{{labels}}} {summary["count"]}')
+    return '\n'.join(calls + errors + latency) + '\n'
@@ -0,0 +1,432 @@
+"""Reviews - Streaming, resumable sentiment aggregation over review and transcript corpora
+
+A corpus is read line by line from byte offsets, in chunks that worker
+processes parse and score with SentimentAnalyzer.score_batch. Each worker
+returns only small per-product tallies, which the parent folds into running
+per-product and per-category distributions. Every few chunks the state is
+checkpointed atomically together with the byte offset it covers, so an
+interrupted run resumes where it stopped, and re-running after the archive
+has grown only scores the new lines.
+
+Two line formats are accepted and may be mixed:
+
+* JSONL: ``{"product_id": "elec_001", "text": "Love it", "category": "electronics"}``.
+  The text may be under text/review/body/transcript/content (a list of
+  turns is joined), the id under product_id/item_id/sku. category is only
+  used when the id is not in the catalog.
+* Plain text: the whole line is the text, or ``product_id<TAB>text``.
+
+The summary file is compact JSON: one row per product and per category in
+the FIELDS order. ReviewSummary loads it for the product and analytics
+agents.
+
+    python -m utils.reviews reviews.jsonl -o data/review_summary.json --catalog data/products.json
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from utils.lazy_import import optional_module
+from utils.sentiment_analyzer import SentimentAnalyzer, tokenize
+
+TEXT_FIELDS = ('text', 'review', 'body', 'transcript', 'content')
+ID_FIELDS = ('product_id', 'item_id', 'sku')
+
+# Tally layout while aggregating: label counts in LABELS order, then the polarity sum
+LABELS = ('Positive', 'Negative', 'Neutral', 'Mixed')
+POLARITY = len(LABELS)
+
+# Row layout in the summary file
+FIELDS = ('reviews', 'positive', 'negative', 'neutral', 'mixed', 'avg_polarity')
+
+CHECKPOINT_VERSION = 1
+
+
+def _new_tally() -> List[float]:
+    return [0, 0, 0, 0, 0.0]
+
+
+def _merge(into: List[float], tally: List[float]):
+    for i, value in enumerate(tally):
+        into[i] += value
+
+
+def _row(tally: List[float]) -> List[Any]:
+    """Summary row for a tally: FIELDS order, counts as ints"""
+    reviews = int(sum(tally[:POLARITY]))
+    counts = [int(count) for count in tally[:POLARITY]]
+    return [reviews] + counts + [round(tally[POLARITY] / reviews, 4) if reviews else 0.0]
+
+
+def row_summary(row: List[Any]) -> Dict[str, Any]:
+    """Readable dict for one summary row, with rates in percent"""
+    summary = dict(zip(FIELDS, row))
+    reviews = summary['reviews']
+    summary['positive_rate'] = round(100 * summary['positive'] / reviews, 1) if reviews else 0.0
+    summary['negative_rate'] = round(100 * summary['negative'] / reviews, 1) if reviews else 0.0
+    return summary
+
+
+def review_score(row: List[Any]) -> float:
+    """Positive share smoothed toward one half, so three glowing reviews don't outrank three hundred good ones"""
+    return (row[1] + 1) / (row[0] + 2)
+
+
+def _first(record: Dict[str, Any], fields: Tuple[str, ...]) -> Any:
+    """Value of the first field present with a non-empty value"""
+    for field in fields:
+        value = record.get(field)
+        if value is not None and value != '':
+            return value
+    return None
+
+
+def parse_line(line: bytes) -> Optional[Tuple[Optional[str], Optional[str], str]]:
+    """(product id, category, text) for one corpus line, or None if it has no text"""
+    if line[:1] == b'{':
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        text = _first(record, TEXT_FIELDS)
+        if isinstance(text, list):
+            text = ' '.join(turn.get('content', '') if isinstance(turn, dict) else str(turn) for turn in text)
+        if not text or not isinstance(text, str):
+            return None
+        product_id = _first(record, ID_FIELDS)
+        category = record.get('category')
+        return (str(product_id) if product_id is not None else None,
+                category if isinstance(category, str) else None, text)
+    line = line.strip()
+    if not line:
+        return None
+    text = line.decode('utf-8', errors='replace')
+    product_id, tab, rest = text.partition('\t')
+    return (product_id, None, rest) if tab else (None, None, text)
+
+
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+
+def _init_worker():
+    """Build the analyzer once per worker process"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer()
+
+
+def _score_chunk(lines: List[bytes]) -> Tuple[Dict[Tuple[Optional[str], Optional[str]], List[float]], int]:
+    """Tallies keyed by (product id, record category) for a chunk of raw lines, plus the skipped count"""
+    analyzer = _worker_analyzer or SentimentAnalyzer()
+    parsed = [record for record in map(parse_line, lines) if record is not None]
+    if not parsed:
+        return {}, len(lines)
+    texts = [text for _, _, text in parsed]
+    np = optional_module('numpy')
+    if np is not None:
+        positive, negative, _, _ = analyzer.score_batch(texts)
+        total = positive + negative
+        # Same decision order as sentiment_analyzer._verdict
+        labels = np.where(total == 0, 2, np.where(positive > negative, 0, np.where(negative > positive, 1, 3)))
+        polarity = np.divide(positive - negative, total, out=np.zeros_like(total), where=total > 0)
+        labels, polarity = labels.tolist(), polarity.tolist()
+    else:
+        labels, polarity = [], []
+        for pos, neg, _, _ in (analyzer.score_tokens(tokenize(text)) for text in texts):
+            total = pos + neg
+            labels.append(2 if total == 0 else 0 if pos > neg else 1 if neg > pos else 3)
+            polarity.append((pos - neg) / total if total else 0.0)
+
+    tallies: Dict[Tuple[Optional[str], Optional[str]], List[float]] = {}
+    for (product_id, category, _), label, value in zip(parsed, labels, polarity):
+        tally = tallies.get((product_id, category))
+        if tally is None:
+            tally = tallies[(product_id, category)] = _new_tally()
+        tally[label] += 1
+        tally[POLARITY] += value
+    return tallies, len(lines) - len(parsed)
+
+
+def iter_chunks(path: str, offset: int = 0, chunk_size: int = 5000) -> Iterator[Tuple[List[bytes], int]]:
+    """(raw lines, byte offset after the last one) chunks of a corpus from a byte offset on.
+
+    A trailing line without a newline is left for the next run, since it may
+    still be being written.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        chunk: List[bytes] = []
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            chunk.append(line)
+            offset += len(line)
+            if len(chunk) == chunk_size:
+                yield chunk, offset
+                chunk = []
+        if chunk:
+            yield chunk, offset
+
+
+def write_json_atomic(data: Any, path: str):
+    """Write compact JSON next to path and rename it into place, so readers never see a partial file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def catalog_categories(catalog_path: str) -> Dict[str, str]:
+    """Product id -> category for a catalog file, streamed"""
+    from utils.data_loader import iter_records
+    return {str(item['id']): category for category, item in iter_records(catalog_path, nested=True)
+            if isinstance(item, dict) and 'id' in item}
+
+
+class ReviewPipeline:
+    """Incremental sentiment distributions per product and per category over a corpus.
+
+    Memory is bounded by max_pending chunks in flight plus one tally per
+    distinct product and category. Chunks are merged in file order, so the
+    checkpointed offset always covers exactly the tallies saved with it.
+    """
+
+    def __init__(self, categories: Optional[Mapping[str, str]] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 20):
+        self.categories = categories or {}
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.source: Optional[str] = None
+        self.offset = 0
+        self.records = 0
+        self.skipped = 0
+        self.products: Dict[str, List[float]] = {}
+        self.product_categories: Dict[str, str] = {}
+        self.by_category: Dict[str, List[float]] = {}
+        self.overall = _new_tally()
+
+    def _merge_chunk(self, tallies: Dict[Tuple[Optional[str], Optional[str]], List[float]], skipped: int):
+        """Fold one chunk's tallies into the running totals, joining products to catalog categories"""
+        for (product_id, record_category), tally in tallies.items():
+            _merge(self.overall, tally)
+            self.records += int(sum(tally[:POLARITY]))
+            category = record_category
+            if product_id is not None:
+                product = self.products.get(product_id)
+                if product is None:
+                    product = self.products[product_id] = _new_tally()
+                _merge(product, tally)
+                category = self.categories.get(product_id) or self.product_categories.get(product_id) or category
+                if category is not None:
+                    self.product_categories[product_id] = category
+            if category is not None:
+                totals = self.by_category.get(category)
+                if totals is None:
+                    totals = self.by_category[category] = _new_tally()
+                _merge(totals, tally)
+        self.skipped += skipped
+
+    def load_checkpoint(self, source: str) -> bool:
+        """Restore state saved for the same corpus; False if there is none or it doesn't apply"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != CHECKPOINT_VERSION or state.get('source') != os.path.abspath(source):
+            return False
+        if os.path.getsize(source) < state['offset']:
+            return False  # the corpus was replaced or truncated
+        self.source = state['source']
+        self.offset = state['offset']
+        self.records = state['records']
+        self.skipped = state['skipped']
+        self.products = state['products']
+        self.product_categories = state['product_categories']
+        self.by_category = state['categories']
+        self.overall = state['overall']
+        return True
+
+    def save_checkpoint(self):
+        """Atomically persist the running tallies and the offset they cover"""
+        if not self.checkpoint_path:
+            return
+        write_json_atomic({
+            'version': CHECKPOINT_VERSION, 'source': self.source, 'offset': self.offset,
+            'records': self.records, 'skipped': self.skipped, 'products': self.products,
+            'product_categories': self.product_categories, 'categories': self.by_category, 'overall': self.overall,
+        }, self.checkpoint_path)
+
+    def run(self, path: str, workers: Optional[int] = None, chunk_size: int = 5000,
+            max_pending: Optional[int] = None, resume: bool = True) -> Dict[str, Any]:
+        """Score everything in the corpus past the checkpoint; returns run statistics.
+
+        workers=1 scores in this process.
+        """
+        resumed = resume and self.load_checkpoint(path)
+        self.source = os.path.abspath(path)
+        start_offset, start_records = self.offset, self.records
+        start = time.perf_counter()
+        chunks = iter_chunks(path, self.offset, chunk_size)
+        merged = 0
+
+        def merge(result, end_offset):
+            nonlocal merged
+            self._merge_chunk(*result)
+            self.offset = end_offset
+            merged += 1
+            if merged % self.checkpoint_every == 0:
+                self.save_checkpoint()
+
+        if workers == 1:
+            _init_worker()
+            for lines, end_offset in chunks:
+                merge(_score_chunk(lines), end_offset)
+        else:
+            workers = workers or os.cpu_count() or 1
+            max_pending = max_pending or workers * 2
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                pending: deque = deque()
+                while True:
+                    for lines, end_offset in chunks:
+                        pending.append((pool.submit(_score_chunk, lines), end_offset))
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        break
+                    future, end_offset = pending.popleft()
+                    merge(future.result(), end_offset)
+        self.save_checkpoint()
+        elapsed = time.perf_counter() - start
+        scored = self.records - start_records
+        return {
+            'resumed': resumed,
+            'records': scored,
+            'bytes': self.offset - start_offset,
+            'seconds': round(elapsed, 3),
+            'records_per_second': round(scored / elapsed) if elapsed else 0,
+            'total_records': self.records,
+            'products': len(self.products),
+            'categories': len(self.by_category),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact summary: one FIELDS row per product and per category, plus each category's product ids"""
+        members: Dict[str, List[str]] = {}
+        for product_id, category in self.product_categories.items():
+            members.setdefault(category, []).append(product_id)
+        return {
+            'fields': list(FIELDS),
+            'source': self.source,
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'records': self.records,
+            'skipped': self.skipped,
+            'overall': _row(self.overall),
+            'categories': {category: _row(tally) for category, tally in self.by_category.items()},
+            'products': {product_id: _row(tally) for product_id, tally in self.products.items()},
+            'category_products': members,
+        }
+
+    def write_summary(self, path: str):
+        write_json_atomic(self.summary(), path)
+
+
+class ReviewSummary:
+    """Read-only view of a summary file for the agents.
+
+    Products are ranked once at load time by review_score, overall and
+    within each category, so "best reviewed" queries walk a precomputed
+    ordering.
+    """
+
+    def __init__(self, data: Mapping[str, Any]):
+        if list(data.get('fields', FIELDS)) != list(FIELDS):
+            raise ValueError(f"Unsupported review summary fields: {data.get('fields')}")
+        self.records = data.get('records', 0)
+        self.generated_at = data.get('generated_at')
+        self.overall = data.get('overall') or _row(_new_tally())
+        self.products: Dict[str, List[Any]] = data.get('products', {})
+        self.categories: Dict[str, List[Any]] = data.get('categories', {})
+        scores = {product_id: review_score(row) for product_id, row in self.products.items()}
+        self.ranked = sorted(scores, key=scores.get, reverse=True)
+        self.ranked_by_category: Dict[str, List[str]] = {
+            category: sorted((product_id for product_id in members if product_id in scores),
+                             key=scores.get, reverse=True)
+            for category, members in data.get('category_products', {}).items()
+        }
+
+    @classmethod
+    def load(cls, path: str) -> 'ReviewSummary':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def load_if_exists(cls, path: Optional[str]) -> Optional['ReviewSummary']:
+        """The summary at path, or None if no corpus has been scored yet"""
+        if not path or not os.path.exists(path):
+            return None
+        return cls.load(path)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def product(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Summary for one product, or None if it has no reviews"""
+        row = self.products.get(product_id)
+        return row_summary(row) if row is not None else None
+
+    def category(self, category: str) -> Optional[Dict[str, Any]]:
+        row = self.categories.get(category)
+        return row_summary(row) if row is not None else None
+
+    def best_reviewed(self, category: Optional[str] = None, min_reviews: int = 1) -> Iterator[str]:
+        """Product ids from best to worst review score, optionally within one category"""
+        products = self.products
+        ranked = self.ranked if category is None else self.ranked_by_category.get(category, ())
+        return (product_id for product_id in ranked if products[product_id][0] >= min_reviews)
+
+    def category_extremes(self, min_reviews: int = 1) -> Tuple[Optional[str], Optional[str]]:
+        """(best, worst) category by review score"""
+        rows = [(review_score(row), category) for category, row in self.categories.items() if row[0] >= min_reviews]
+        if not rows:
+            return None, None
+        return max(rows)[1], min(rows)[1]
+
+
+def main(argv=None) -> int:
+    """Score a corpus: python -m utils.reviews reviews.jsonl -o data/review_summary.json"""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Aggregate review and transcript sentiment per product and category")
+    parser.add_argument('corpus', help="JSONL or plain-text corpus")
+    parser.add_argument('-o', '--output', default='data/review_summary.json', help="summary file")
+    parser.add_argument('--catalog', default='data/products.json', help="catalog used to join product ids to categories")
+    parser.add_argument('--checkpoint', default=None, help="default: <output>.checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=20, help="chunks between checkpoints")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--restart', action='store_true', help="ignore any checkpoint and score from the start")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.corpus):
+        parser.error(f"{args.corpus} does not exist")
+    categories = catalog_categories(args.catalog) if os.path.exists(args.catalog) else {}
+    pipeline = ReviewPipeline(categories, args.checkpoint or f"{args.output}.checkpoint", args.checkpoint_every)
+    stats = pipeline.run(args.corpus, workers=args.workers, chunk_size=args.chunk_size, resume=not args.restart)
+    pipeline.write_summary(args.output)
+    print(f"{'Resumed' if stats['resumed'] else 'Scored'} {stats['records']:,} records in {stats['seconds']}s "
+          f"({stats['records_per_second']:,}/s); {stats['total_records']:,} total over {stats['products']:,} "
+          f"products and {stats['categories']:,} categories -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
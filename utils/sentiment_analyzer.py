@@ -1,51 +1,183 @@
 """Simple Sentiment Analysis - No API Required"""
 
+import re
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from utils.lazy_import import optional_module
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+# Word -> polarity weight; shared read-only by every analyzer
+_LEXICON = {
+    'good': 1.0, 'great': 1.5, 'excellent': 2.0, 'amazing': 2.0, 'love': 2.0, 'loved': 2.0, 'loves': 2.0,
+    'best': 1.5, 'fantastic': 2.0, 'wonderful': 2.0, 'awesome': 2.0, 'perfect': 2.0, 'happy': 1.5,
+    'satisfied': 1.5, 'impressed': 1.5, 'recommend': 1.0, 'recommended': 1.0, 'helpful': 1.0,
+    'thank': 1.0, 'thanks': 1.0, 'nice': 1.0, 'pleased': 1.5, 'glad': 1.0,
+    'bad': -1.0, 'terrible': -2.0, 'worst': -2.0, 'hate': -2.0, 'hated': -2.0, 'awful': -2.0,
+    'horrible': -2.0, 'disappointed': -1.5, 'disappointing': -1.5, 'angry': -1.5, 'frustrated': -1.5,
+    'frustrating': -1.5, 'broken': -1.5, 'broke': -1.0, 'defective': -1.5, 'useless': -1.5,
+    'damaged': -1.5, 'poor': -1.0, 'complaint': -1.0, 'refund': -1.0, 'unhappy': -1.5, 'annoyed': -1.0,
+}
+LEXICON = MappingProxyType(_LEXICON)
+
+# A negator flips lexicon words up to NEGATION_WINDOW tokens after it ("not good", "never really happy")
+NEGATORS = frozenset([
+    'not', 'no', 'never', 'nothing', 'hardly', 'without', 'neither', 'nor',
+    "isn't", "aren't", "wasn't", "weren't", "don't", "doesn't", "didn't", "can't", "couldn't",
+    "won't", "wouldn't", "shouldn't", "hasn't", "haven't", "hadn't", "ain't",
+    'isnt', 'arent', 'wasnt', 'dont', 'doesnt', 'didnt', 'cant', 'couldnt', 'wont', 'wouldnt',
+])
+NEGATION_WINDOW = 3
+NEGATION_SCALE = -0.75
+
+# Intensifiers add and diminishers subtract from the weight of a lexicon word within BOOSTER_WINDOW tokens
+BOOSTERS = MappingProxyType({
+    'very': 0.5, 'really': 0.5, 'extremely': 0.5, 'so': 0.5, 'super': 0.5, 'absolutely': 0.5,
+    'incredibly': 0.5, 'totally': 0.5, 'completely': 0.5, 'most': 0.5,
+    'slightly': -0.5, 'somewhat': -0.5, 'kinda': -0.5, 'barely': -0.5, 'little': -0.5,
+})
+BOOSTER_WINDOW = 2  # score_tokens unrolls this window
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, keeping contractions such as "don't" whole"""
+    return TOKEN_PATTERN.findall(text.lower().replace('’', "'"))
+
+
+def _verdict(positive: float, negative: float, positive_count: int, negative_count: int) -> dict:
+    """The result dict for weighted positive and negative totals"""
+    total = positive + negative
+
+    if total == 0:
+        sentiment = 'Neutral'
+        score = 0.5
+        emoji = '😐'
+    elif positive > negative:
+        sentiment = 'Positive'
+        score = round(positive / total, 2)
+        emoji = '😊' if score > 0.7 else '🙂'
+    elif negative > positive:
+        sentiment = 'Negative'
+        score = round(negative / total, 2)
+        emoji = '😞' if score > 0.7 else '😕'
+    else:
+        sentiment = 'Mixed'
+        score = 0.5
+        emoji = '🤔'
+
+    return {
+        'sentiment': sentiment,
+        'score': score,
+        'emoji': emoji,
+        'positive_words': positive_count,
+        'negative_words': negative_count
+    }
+
+
 class SentimentAnalyzer:
-    """Analyze sentiment without external APIs"""
-    
-    def __init__(self):
-        self.positive_words = [
-            'good', 'great', 'excellent', 'amazing', 'love', 'best', 
-            'fantastic', 'wonderful', 'awesome', 'perfect', 'happy',
-            'satisfied', 'impressed', 'recommend', 'helpful', 'thank'
-        ]
-        
-        self.negative_words = [
-            'bad', 'terrible', 'worst', 'hate', 'awful', 'horrible',
-            'disappointed', 'angry', 'frustrated', 'broken', 'defective',
-            'useless', 'damaged', 'poor', 'complaint', 'refund'
-        ]
-    
+    """Analyze sentiment without external APIs.
+
+    Text is tokenized once and each token is a single dict lookup. A
+    lexicon word's weight is scaled by boosters just before it and flipped
+    (and damped) by a negator up to three tokens before it, so "not good"
+    is negative and "goodbye" is not a match at all.
+    """
+
+    def __init__(self, lexicon: Optional[Mapping[str, float]] = None):
+        # Negators only ever modify other words, so they are never scored themselves
+        self.lexicon = LEXICON if lexicon is None else MappingProxyType(
+            {word: weight for word, weight in lexicon.items() if word not in NEGATORS})
+        self._weights = _LEXICON if lexicon is None else dict(self.lexicon)
+        self._tables = None
+
+    def score_tokens(self, tokens: Sequence[str]) -> Tuple[float, float, int, int]:
+        """(positive weight, negative weight, positive words, negative words) for one token list"""
+        positive = negative = 0.0
+        positive_count = negative_count = 0
+        if self._weights.keys().isdisjoint(tokens):
+            return positive, negative, positive_count, negative_count
+        get = self._weights.get
+        boost = BOOSTERS.get
+        last_negator = -NEGATION_WINDOW - 1
+        for i, token in enumerate(tokens):
+            weight = get(token)
+            if weight is None:
+                if token in NEGATORS:
+                    last_negator = i
+                continue
+            scale = 1.0
+            if i:
+                scale += boost(tokens[i - 1], 0.0)
+                if i > 1:
+                    scale += boost(tokens[i - 2], 0.0)
+            weight = weight * scale * (NEGATION_SCALE if i - last_negator <= NEGATION_WINDOW else 1.0)
+            if weight > 0:
+                positive += weight
+                positive_count += 1
+            elif weight < 0:
+                negative -= weight
+                negative_count += 1
+        return positive, negative, positive_count, negative_count
+
     def analyze(self, text: str) -> dict:
         """Analyze sentiment of text"""
-        text_lower = text.lower()
-        
-        positive_count = sum(1 for word in self.positive_words if word in text_lower)
-        negative_count = sum(1 for word in self.negative_words if word in text_lower)
-        
-        total = positive_count + negative_count
-        
-        if total == 0:
-            sentiment = 'Neutral'
-            score = 0.5
-            emoji = '😐'
-        elif positive_count > negative_count:
-            sentiment = 'Positive'
-            score = round(positive_count / total, 2)
-            emoji = '😊' if score > 0.7 else '🙂'
-        elif negative_count > positive_count:
-            sentiment = 'Negative'
-            score = round(negative_count / total, 2)
-            emoji = '😞' if score > 0.7 else '😕'
-        else:
-            sentiment = 'Mixed'
-            score = 0.5
-            emoji = '🤔'
-        
-        return {
-            'sentiment': sentiment,
-            'score': score,
-            'emoji': emoji,
-            'positive_words': positive_count,
-            'negative_words': negative_count
-        }
\ No newline at end of file
+        return _verdict(*self.score_tokens(tokenize(text)))
+
+    def _compiled(self):
+        """Token -> code dict plus weight, negator and booster columns indexed by code (0 = no effect)"""
+        if self._tables is None:
+            np = optional_module('numpy')
+            words = sorted(set(self.lexicon) | NEGATORS | set(BOOSTERS))
+            codes = {word: code for code, word in enumerate(words, 1)}
+            weights = np.zeros(len(words) + 1)
+            negators = np.zeros(len(words) + 1)
+            boosters = np.zeros(len(words) + 1)
+            for word, code in codes.items():
+                weights[code] = self.lexicon.get(word, 0.0)
+                negators[code] = word in NEGATORS
+                boosters[code] = BOOSTERS.get(word, 0.0)
+            self._tables = (codes, weights, negators, boosters)
+        return self._tables
+
+    def score_batch(self, texts: Sequence[str]):
+        """Positive weights, negative weights, positive and negative word counts for many texts, as arrays.
+
+        All tokens are laid out in one code vector. The negation and booster
+        windows become prefix-sum differences, and per-text totals come from
+        np.bincount, so Python only tokenizes and does one dict lookup per
+        token. Requires NumPy.
+        """
+        np = optional_module('numpy')
+        codes, weights, negators, boosters = self._compiled()
+        tokenized = [tokenize(text) for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in tokenized), dtype=np.int64, count=len(tokenized))
+        get = codes.get
+        flat = np.array([get(token, 0) for tokens in tokenized for token in tokens], dtype=np.int64)
+        doc = np.repeat(np.arange(len(texts)), lengths)
+        doc_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        position = np.arange(len(flat))
+
+        # Exclusive prefix sums: sums[i] covers tokens [0, i)
+        negation_sums = np.concatenate(([0.0], np.cumsum(negators[flat])))
+        booster_sums = np.concatenate(([0.0], np.cumsum(boosters[flat])))
+        negated = (negation_sums[position] - negation_sums[np.maximum(position - NEGATION_WINDOW, doc_start)]) > 0
+        scale = 1.0 + booster_sums[position] - booster_sums[np.maximum(position - BOOSTER_WINDOW, doc_start)]
+        contribution = weights[flat] * scale * np.where(negated, NEGATION_SCALE, 1.0)
+
+        is_positive = contribution > 0
+        is_negative = contribution < 0
+        n = len(texts)
+        return (np.bincount(doc, weights=np.where(is_positive, contribution, 0.0), minlength=n),
+                np.bincount(doc, weights=np.where(is_negative, -contribution, 0.0), minlength=n),
+                np.bincount(doc[is_positive], minlength=n),
+                np.bincount(doc[is_negative], minlength=n))
+
+    def analyze_batch(self, texts: Sequence[str]) -> List[dict]:
+        """Analyze many texts at once; same results as analyze() on each (vectorized with NumPy if installed)"""
+        # NumPy is imported on the first batch, so single-text users never pay for it
+        if optional_module('numpy') is None:
+            return [self.analyze(text) for text in texts]
+        if not texts:
+            return []
+        return [_verdict(*totals) for totals in zip(*(column.tolist() for column in self.score_batch(texts)))]
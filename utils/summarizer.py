@@ -1,5 +1,16 @@
 """Conversation Summarizer - No API Required"""
 
+TOPIC_WORDS = ['shipping', 'return', 'product', 'order', 'payment',
+               'track', 'refund', 'warranty', 'electronics', 'fashion']
+
+def _sentiment_overview(positive_count: int, negative_count: int) -> str:
+    """Overall mood from counts of positive and negative bot replies"""
+    if positive_count > negative_count:
+        return '😊 Mostly Positive'
+    if negative_count > positive_count:
+        return '😞 Some Concerns'
+    return '😐 Neutral'
+
 class ConversationSummarizer:
     """Summarize conversations using keyword extraction"""
     
@@ -21,10 +32,7 @@ class ConversationSummarizer:
         # Extract common words (simple keyword extraction)
         all_text = ' '.join([m['content'].lower() for m in user_messages])
         
-        common_words = ['shipping', 'return', 'product', 'order', 'payment', 
-                       'track', 'refund', 'warranty', 'electronics', 'fashion']
-        
-        topics = [word for word in common_words if word in all_text]
+        topics = [word for word in TOPIC_WORDS if word in all_text]
         
         # Sentiment overview
         sentiments = []
@@ -32,17 +40,7 @@ class ConversationSummarizer:
             if 'data' in msg and 'sentiment' in msg['data']:
                 sentiments.append(msg['data']['sentiment']['sentiment'])
         
-        if sentiments:
-            positive_count = sentiments.count('Positive')
-            negative_count = sentiments.count('Negative')
-            if positive_count > negative_count:
-                sentiment_overview = '😊 Mostly Positive'
-            elif negative_count > positive_count:
-                sentiment_overview = '😞 Some Concerns'
-            else:
-                sentiment_overview = '😐 Neutral'
-        else:
-            sentiment_overview = '😐 Neutral'
+        sentiment_overview = _sentiment_overview(sentiments.count('Positive'), sentiments.count('Negative'))
         
         return {
             'total_messages': len(messages),
@@ -50,4 +48,67 @@ class ConversationSummarizer:
             'bot_messages': len(bot_messages),
             'topics': topics[:5],  # Top 5 topics
             'sentiment_overview': sentiment_overview
-        }
\ No newline at end of file
+        }
+
+class IncrementalSummarizer:
+    """Running summary that is updated one message at a time.
+    
+    Keeps counts of roles, topics seen and bot sentiments, so adding a
+    message and reading the summary cost the same however long the
+    conversation is. summary() matches ConversationSummarizer.summarize
+    over the same messages.
+    """
+    
+    def __init__(self, messages: list = None):
+        self.reset()
+        if messages:
+            self.sync(messages)
+    
+    def reset(self):
+        """Forget every message seen so far"""
+        self.total_messages = 0
+        self.user_messages = 0
+        self.bot_messages = 0
+        self.topics_seen = set()
+        self.sentiment_counts = {}
+        self.last_message = None
+    
+    def add(self, message: dict):
+        """Fold one message into the running counts"""
+        self.total_messages += 1
+        self.last_message = message
+        role = message['role']
+        if role == 'user':
+            self.user_messages += 1
+            if len(self.topics_seen) < len(TOPIC_WORDS):
+                text = message['content'].lower()
+                self.topics_seen.update(word for word in TOPIC_WORDS if word in text)
+        elif role == 'assistant':
+            self.bot_messages += 1
+            data = message.get('data')
+            if data and 'sentiment' in data:
+                label = data['sentiment']['sentiment']
+                self.sentiment_counts[label] = self.sentiment_counts.get(label, 0) + 1
+    
+    def sync(self, messages: list) -> dict:
+        """Catch up with a message list that grows, is cleared or is replaced; returns the summary"""
+        # The last message folded in must still be in place, else the list was replaced
+        if self.total_messages and (len(messages) < self.total_messages
+                                    or messages[self.total_messages - 1] is not self.last_message):
+            self.reset()
+        for message in messages[self.total_messages:]:
+            self.add(message)
+        return self.summary()
+    
+    def summary(self) -> dict:
+        """Same shape and values as ConversationSummarizer.summarize"""
+        if not self.total_messages:
+            return ConversationSummarizer.summarize([])
+        return {
+            'total_messages': self.total_messages,
+            'user_messages': self.user_messages,
+            'bot_messages': self.bot_messages,
+            'topics': [word for word in TOPIC_WORDS if word in self.topics_seen][:5],
+            'sentiment_overview': _sentiment_overview(self.sentiment_counts.get('Positive', 0),
+                                                      self.sentiment_counts.get('Negative', 0))
+        }
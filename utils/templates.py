@@ -0,0 +1,217 @@
+"""Templates - Pre-compiled social post templates and bulk generation over a catalog"""
+
+import functools
+import operator
+import os
+import string
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+PLATFORMS = ('Instagram', 'Twitter', 'Facebook')
+
+# Per-platform character limits applied after rendering
+PLATFORM_LIMITS = MappingProxyType({'Twitter': 280})
+
+# Keys used in data/social_templates.json mapped to SocialAgent content types
+KEY_ALIASES = MappingProxyType({'product_launch': 'launch', 'promotional': 'promotion'})
+
+TYPE_LABELS = MappingProxyType({
+    'launch': 'Product Launch',
+    'engagement': 'Engagement',
+    'promotion': 'Promotion',
+    'contest': 'Contest',
+    'general': 'General',
+})
+
+FIELDS = frozenset(['product', 'feature', 'category', 'discount', 'code', 'brand', 'price', 'rating'])
+
+DISCOUNTS = (10, 15, 20, 25, 30, 40)
+
+DEFAULT_BRAND = 'AIAgentHub'
+
+
+class CompiledTemplate:
+    """A template parsed once into a %-format string and an ordered field list.
+
+    Known placeholders become %s slots; unknown ones, format specs and
+    literal '%' signs are kept as text, so rendering is one itemgetter call
+    and one C-level string format with no parsing.
+    """
+    __slots__ = ('source', 'fields', '_format', '_values')
+
+    def __init__(self, source: str, known_fields: frozenset = FIELDS):
+        self.source = source
+        parts: List[str] = []
+        fields: List[str] = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            parts.append(literal.replace('%', '%%'))
+            if field is None:
+                continue
+            if field in known_fields and not spec and not conversion:
+                parts.append('%s')
+                fields.append(field)
+            else:
+                raw = '{' + field + ('!' + conversion if conversion else '') + (':' + spec if spec else '') + '}'
+                parts.append(raw.replace('%', '%%'))
+        self._format = ''.join(parts)
+        self.fields = tuple(fields)
+        if len(fields) > 1:
+            self._values = operator.itemgetter(*fields)
+        elif fields:
+            field = fields[0]
+            self._values = lambda values: (values[field],)
+        else:
+            self._values = lambda values: ()
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Fill the template; values must contain every field in self.fields"""
+        return self._format % self._values(values)
+
+
+def _truncate(content: str, platform: str) -> str:
+    limit = PLATFORM_LIMITS.get(platform)
+    if limit and len(content) > limit:
+        return content[:limit - 1] + '…'
+    return content
+
+
+@functools.lru_cache(maxsize=1024)
+def _code_prefix(category: str) -> str:
+    return ''.join(ch for ch in category if ch.isalnum())[:4].upper()
+
+
+def product_context(category: Optional[str], item: Optional[Mapping[str, Any]],
+                    brand: str = DEFAULT_BRAND) -> Dict[str, Any]:
+    """Template values for one catalog record, or generic values without one"""
+    if not item:
+        return {'product': 'our latest product', 'feature': 'amazing features', 'category': category or 'products',
+                'discount': 20, 'code': 'SAVE20', 'brand': brand, 'price': '', 'rating': ''}
+    features = item.get('features') or ()
+    discount = DISCOUNTS[zlib.crc32(str(item.get('id', item.get('name', ''))).encode()) % len(DISCOUNTS)]
+    category = category or item.get('category') or 'products'
+    return {
+        'product': item.get('name', 'our latest product'),
+        'feature': features[0] if features else 'amazing features',
+        'category': category,
+        'discount': discount,
+        'code': f"{_code_prefix(category)}{discount}",
+        'brand': brand,
+        'price': f"${item['price']:,.2f}" if isinstance(item.get('price'), (int, float)) else '',
+        'rating': item.get('rating', ''),
+    }
+
+
+class TemplateEngine:
+    """Compiled templates grouped by content type.
+
+    Accepts both layouts found in data: plain strings (as in
+    social_templates.json) and idea dicts with platform/type/content (the
+    built-in defaults). File keys are mapped to content types with
+    KEY_ALIASES.
+    """
+
+    def __init__(self, templates: Mapping[str, Iterable[Any]], brand: str = DEFAULT_BRAND):
+        self.brand = brand
+        self.source = {key: list(entries) for key, entries in templates.items()}
+        self.compiled: Dict[str, List[Tuple[Optional[str], str, CompiledTemplate]]] = {}
+        for key, entries in self.source.items():
+            content_type = KEY_ALIASES.get(key, key)
+            label = TYPE_LABELS.get(content_type, content_type.replace('_', ' ').title())
+            compiled = self.compiled.setdefault(content_type, [])
+            for entry in entries:
+                if isinstance(entry, str):
+                    compiled.append((None, label, CompiledTemplate(entry)))
+                elif isinstance(entry, dict) and isinstance(entry.get('content'), str):
+                    compiled.append((entry.get('platform'), entry.get('type', label), CompiledTemplate(entry['content'])))
+
+    def __contains__(self, content_type: str) -> bool:
+        return bool(self.compiled.get(content_type))
+
+    @property
+    def content_types(self) -> List[str]:
+        return [content_type for content_type, entries in self.compiled.items() if entries]
+
+    def ideas(self, content_type: str, context: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """Every template of a content type rendered with one context, as idea dicts"""
+        ideas = []
+        for i, (platform, label, template) in enumerate(self.compiled.get(content_type, ())):
+            platform = platform or PLATFORMS[i % len(PLATFORMS)]
+            ideas.append({'id': i + 1, 'platform': platform, 'type': label,
+                          'content': _truncate(template.render(context), platform)})
+        return ideas
+
+    def posts(self, category: Optional[str], item: Mapping[str, Any], content_type: str,
+              platforms: Iterable[str] = PLATFORMS, index: int = 0) -> List[Dict[str, Any]]:
+        """One post per platform for a product, rotating through the content type's templates"""
+        entries = self.compiled.get(content_type)
+        if not entries:
+            return []
+        context = product_context(category, item, self.brand)
+        posts = []
+        for p, platform in enumerate(platforms):
+            _, label, template = entries[(index + p) % len(entries)]
+            posts.append({'product_id': item.get('id'), 'platform': platform, 'type': label,
+                          'content': _truncate(template.render(context), platform)})
+        return posts
+
+    def generate(self, records: Iterable[Tuple[str, Mapping[str, Any]]], content_type: str,
+                 platforms: Iterable[str] = PLATFORMS, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Stream posts for (category, item) records in this process"""
+        platforms = list(platforms)
+        for i, (category, item) in enumerate(records, start):
+            yield from self.posts(category, item, content_type, platforms, i)
+
+
+_worker_engine: Optional[TemplateEngine] = None
+
+
+def _init_worker(templates: Dict[str, list], brand: str):
+    """Compile the templates once per worker process"""
+    global _worker_engine
+    _worker_engine = TemplateEngine(templates, brand)
+
+
+def _render_chunk(chunk: List[Tuple[str, Dict]], content_type: str, platforms: List[str],
+                  start: int) -> List[Dict[str, Any]]:
+    return list(_worker_engine.generate(chunk, content_type, platforms, start))
+
+
+def bulk_generate(engine: TemplateEngine, records: Iterable[Tuple[str, Mapping[str, Any]]],
+                  content_type: str = 'launch', platforms: Iterable[str] = PLATFORMS,
+                  workers: Optional[int] = None, chunk_size: int = 2000,
+                  max_pending: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Stream a post for every record x platform, rendered on a process pool.
+
+    Records are read lazily in chunks and at most max_pending chunks are in
+    flight, so memory is bounded however large the catalog is. Posts come
+    out in record order. workers=1 renders in this process.
+    """
+    platforms = list(platforms)
+    if workers == 1:
+        yield from engine.generate(records, content_type, platforms)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine.source, engine.brand)) as pool:
+        pending: deque = deque()
+        iterator = iter(records)
+        start = 0
+        while True:
+            while len(pending) < max_pending:
+                chunk = []
+                for record in iterator:
+                    chunk.append(record)
+                    if len(chunk) == chunk_size:
+                        break
+                if not chunk:
+                    break
+                pending.append(pool.submit(_render_chunk, chunk, content_type, platforms, start))
+                start += len(chunk)
+            if not pending:
+                return
+            yield from pending.popleft().result()
@@ -0,0 +1,197 @@
+"""Vector Index - TF-IDF product vectors with cosine top-k search"""
+
+import math
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_index import estimate_dict_bytes
+from utils.faq_index import stem, tokenize
+
+# Term weight of each product field; names say the most about what a product is
+FIELD_WEIGHTS = (('name', 2.0), ('category', 1.0), ('features', 1.0))
+
+# Postings kept per term in approximate mode (the highest-weighted ones)
+APPROXIMATE_POSTINGS = 20_000
+
+# Distinct query words knows() remembers before starting over
+KNOWN_CACHE_SIZE = 10_000
+
+
+def product_terms(category: str, item: Dict, cache: Optional[Dict[str, List[str]]] = None) -> Dict[str, float]:
+    """Weighted term counts of one product: name, catalog category, subcategory and features.
+
+    cache maps repeated texts (categories, features) to their tokens across calls.
+    """
+    counts: Dict[str, float] = {}
+    texts = [('name', item.get('name', '')), ('category', category), ('category', item.get('category', ''))]
+    texts += [('features', feature) for feature in item.get('features', [])]
+    weights = dict(FIELD_WEIGHTS)
+    for field, text in texts:
+        tokens = cache.get(text) if cache is not None else None
+        if tokens is None:
+            # Bare numbers (model and SKU numbers) say nothing about what a product is like
+            tokens = [token for token in tokenize(text) if not token.isdigit()]
+            if cache is not None and field != 'name':  # categories and features repeat across products
+                cache[text] = tokens
+        for token in tokens:
+            counts[token] = counts.get(token, 0.0) + weights[field]
+    return counts
+
+
+class ProductVectors:
+    """L2-normalized TF-IDF vectors of every product, stored term-major.
+
+    The matrix is kept in compressed sparse column form: for each term, the
+    rows containing it and their weights, ordered by weight. A query's cosine
+    similarity to every product is then one np.bincount over the postings of
+    its few terms, and the top k come from np.argpartition. In approximate
+    mode each term only contributes its highest-weighted postings, which
+    bounds the work per query on very large catalogs at the cost of missing
+    products that match only through very common terms.
+    """
+
+    def __init__(self, ids: List[Hashable], categories: List[str], category_codes: np.ndarray,
+                 vocabulary: Dict[str, int], rows: np.ndarray, terms: np.ndarray, counts: np.ndarray):
+        self.ids = np.array(ids) if ids else np.array([], dtype='<U1')
+        self.categories = categories
+        self.category_codes = category_codes.astype(np.int16 if len(categories) < 2 ** 15 else np.int32)
+        # Category of each id (its first row, should an id repeat) for category_of()
+        self._category_by_id: Dict[Hashable, str] = {}
+        for item_id, code in zip(ids, category_codes.tolist()):
+            self._category_by_id.setdefault(item_id, categories[code])
+        self.vocabulary = vocabulary
+        size = len(ids)
+        document_frequency = np.bincount(terms, minlength=len(vocabulary))
+        self.idf = (np.log((1 + size) / (1 + document_frequency)) + 1).astype(np.float32)
+        weights = ((1 + np.log(counts)) * self.idf[terms]).astype(np.float32)
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=size))
+        weights /= norms[rows].astype(np.float32)
+
+        order = np.lexsort((-weights, terms))
+        self.rows = rows[order]
+        self.weights = weights[order]
+        self.term_starts = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(document_frequency, out=self.term_starts[1:])
+        self._known: Dict[str, bool] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Dict]]) -> 'ProductVectors':
+        """Build from a stream of (category, item) pairs"""
+        ids: List[Hashable] = []
+        categories: Dict[str, int] = {}
+        # Typed buffers hold a million-product catalog's postings in a few bytes each
+        category_codes = array('i')
+        vocabulary: Dict[str, int] = {}
+        rows, terms, counts = array('i'), array('i'), array('f')
+        cache: Dict[str, List[str]] = {}
+        for row, (category, item) in enumerate(records):
+            ids.append(item.get('id', ''))
+            category_codes.append(categories.setdefault(category, len(categories)))
+            for token, count in product_terms(category, item, cache).items():
+                rows.append(row)
+                terms.append(vocabulary.setdefault(token, len(vocabulary)))
+                counts.append(count)
+        return cls(ids, list(categories), np.frombuffer(category_codes, dtype=np.int32), vocabulary,
+                   np.frombuffer(rows, dtype=np.int32), np.frombuffer(terms, dtype=np.int32),
+                   np.frombuffer(counts, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def knows(self, word: str) -> bool:
+        """Whether a lowercase query word stems to an indexed term"""
+        known = self._known.get(word)
+        if known is None:
+            if len(self._known) >= KNOWN_CACHE_SIZE:
+                self._known.clear()
+            known = self._known[word] = stem(word) in self.vocabulary
+        return known
+
+    def vectorize(self, counts: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """(term ids, unit-length weights) of weighted term counts; unknown terms are dropped"""
+        known = [(self.vocabulary[token], count) for token, count in counts.items() if token in self.vocabulary]
+        if not known:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        terms = np.array([term for term, _ in known], dtype=np.int32)
+        weights = np.array([1 + math.log(count) for _, count in known], dtype=np.float32) * self.idf[terms]
+        return terms, weights / np.sqrt(np.dot(weights, weights))
+
+    def search_vector(self, terms: np.ndarray, weights: np.ndarray, k: int = 3, category: Optional[str] = None,
+                      approximate: bool = False) -> List[Tuple[int, float]]:
+        """Top-k (row, cosine similarity) for a query vector, best first; rows scoring 0 are left out.
+
+        An approximate search filtered to a category that finds fewer than k
+        rows is redone exactly: the postings it kept may hold few of that
+        category's products.
+        """
+        if not len(terms) or not len(self) or k < 1 or (category is not None and category not in self.categories):
+            return []
+        rows, contributions = [], []
+        for term, weight in zip(terms.tolist(), weights.tolist()):
+            start, end = self.term_starts[term], self.term_starts[term + 1]
+            if approximate:
+                end = min(end, start + APPROXIMATE_POSTINGS)
+            rows.append(self.rows[start:end])
+            contributions.append(self.weights[start:end] * weight)
+        rows = np.concatenate(rows)
+        contributions = np.concatenate(contributions)
+        if len(rows) * 4 < len(self):
+            # Few postings: accumulate over the rows they touch instead of the whole catalog
+            candidates, positions = np.unique(rows, return_inverse=True)
+            scores = np.bincount(positions, weights=contributions)
+            if category is not None:
+                scores[self.category_codes[candidates] != self.categories.index(category)] = 0.0
+        else:
+            candidates = None
+            scores = np.bincount(rows, weights=contributions, minlength=len(self))
+            if category is not None:
+                scores[self.category_codes != self.categories.index(category)] = 0.0
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((top, -scores[top]))]
+        found = top if candidates is None else candidates[top]
+        results = [(row, score) for row, score in zip(found.tolist(), scores[top].tolist()) if score > 0]
+        if approximate and category is not None and len(results) < k:
+            return self.search_vector(terms, weights, k, category)
+        return results
+
+    def search(self, text: str, k: int = 3, category: Optional[str] = None,
+               approximate: bool = False) -> List[Tuple[Hashable, float]]:
+        """Top-k (product id, similarity) for free text such as "waterproof with long battery" """
+        counts: Dict[str, float] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0.0) + 1
+        terms, weights = self.vectorize(counts)
+        return [(self.ids[row].item(), score)
+                for row, score in self.search_vector(terms, weights, k, category, approximate)]
+
+    def category_of(self, item_id: Hashable) -> Optional[str]:
+        """Catalog category of an indexed product"""
+        return self._category_by_id.get(item_id)
+
+    def similar(self, category: str, item: Dict, k: int = 3,
+                approximate: bool = False) -> List[Tuple[Hashable, float]]:
+        """Top-k (product id, similarity) of the products most like item (filed under category), never item itself"""
+        terms, weights = self.vectorize(product_terms(category, item))
+        # The item is its own best match, so one extra result makes room for dropping it
+        found = [(self.ids[row].item(), score)
+                 for row, score in self.search_vector(terms, weights, k + 1, approximate=approximate)]
+        return [(item_id, score) for item_id, score in found if item_id != item.get('id')][:k]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by the matrix, the ids, the id lookup and the vocabulary"""
+        matrix_bytes = self.rows.nbytes + self.weights.nbytes + self.term_starts.nbytes + self.idf.nbytes
+        matrix_bytes += self.category_codes.nbytes
+        table_bytes = self.ids.nbytes + estimate_dict_bytes(self.vocabulary) + estimate_dict_bytes(self._category_by_id)
+        return {
+            'items': len(self),
+            'terms': len(self.vocabulary),
+            'postings': len(self.rows),
+            'matrix_bytes': matrix_bytes,
+            'table_bytes': table_bytes,
+            'total_bytes': matrix_bytes + table_bytes
+        }